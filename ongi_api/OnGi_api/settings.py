@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -45,20 +46,27 @@ INSTALLED_APPS = [
     'feeds',
     'artifacts',
     'model3d',
+    'core',
 ]
 
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# 요청 메트릭 수집 (METRICS_SAMPLE_RATE 비율의 요청만 계측)
+METRICS_ENABLED = True
+METRICS_SAMPLE_RATE = 1.0 if DEBUG else 0.05
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -89,23 +97,124 @@ DEFAULT_CHARSET = 'utf-8'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'ongi_db',
-        'USER': 'ongi_owner',
-        'PASSWORD': 'ongi123',
-        'HOST': 'localhost',
-        'PORT': '5432',
-        'OPTIONS': {
-            'client_encoding': 'UTF8',
-        },
+# ONGI_DB_ENGINE=sqlite3 으로 로컬 SQLite 사용 가능 (벤치마크/테스트용)
+DB_ENGINE = os.environ.get('ONGI_DB_ENGINE', 'postgresql')
+
+# 커넥션 풀링 방식
+#   persistent: 워커별 지속 연결 (CONN_MAX_AGE) + 헬스 체크
+#   pgbouncer: 서버 측 풀러(트랜잭션 모드) 사용 - 서버 측 커서 비활성화
+DB_POOL_MODE = os.environ.get('ONGI_DB_POOL', 'persistent')
+DB_CONN_MAX_AGE = int(os.environ.get('ONGI_DB_CONN_MAX_AGE', 600))
+
+if DB_ENGINE == 'sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('ONGI_DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        }
     }
-}
+    # 읽기 복제본 대용 SQLite 별칭 (같은 파일을 가리킴). 기본 1개로 테스트에서도 복제본 라우팅을 거친다
+    DB_REPLICA_HOSTS = [None] * int(os.environ.get('ONGI_DB_REPLICAS', 1))
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('ONGI_DB_NAME', 'ongi_db'),
+            'USER': os.environ.get('ONGI_DB_USER', 'ongi_owner'),
+            'PASSWORD': os.environ.get('ONGI_DB_PASSWORD', 'ongi123'),
+            'HOST': os.environ.get('ONGI_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('ONGI_DB_PORT', '5432'),
+            'OPTIONS': {
+                'client_encoding': 'UTF8',
+            },
+        }
+    }
+    # 읽기 복제본 호스트 목록 (쉼표 구분, 계정 정보는 primary 와 동일)
+    DB_REPLICA_HOSTS = [host for host in os.environ.get('ONGI_DB_REPLICA_HOSTS', '').split(',') if host]
+
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    if DB_POOL_MODE == 'pgbouncer':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+    # 재사용 전 연결 상태 확인 (끊어진 연결로 인한 요청 실패 방지)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+for index, host in enumerate(DB_REPLICA_HOSTS):
+    replica = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    replica['OPTIONS'] = {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in DATABASES['default'].get('OPTIONS', {}).items()
+    }
+    if host:
+        replica['HOST'] = host
+    DATABASES[f'replica_{index}'] = replica
+
+DATABASE_ROUTERS = ['core.db_routers.ReadReplicaRouter']
 
 
 AUTH_USER_MODEL = 'users.User'
 
+# 리더보드: Redis URL 이 있으면 sorted set, 없으면 워커 내 스킵 리스트 (주기적으로 DB 에서 재적재)
+LEADERBOARD_REDIS_URL = os.environ.get('ONGI_LEADERBOARD_REDIS_URL')
+LEADERBOARD_REBUILD_SECONDS = 300
+
+# 인기 유물: 이벤트 가중치와 반감기로 시간 감쇠 점수 계산, 상위 TRENDING_TOP_K 개 유지
+# Redis URL 이 있으면 sorted set (조회 수도 워커 간 공유), 없으면 워커 내 점수를 주기적으로 DB 에서 재계산
+TRENDING_REDIS_URL = os.environ.get('ONGI_TRENDING_REDIS_URL')
+TRENDING_WEIGHTS = {'feed': 3.0, 'view': 1.0, 'model': 10.0}
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_TOP_K = 100
+TRENDING_REBUILD_SECONDS = 600
+
+# 실시간 이벤트 (SSE). 워커가 여러 개면 EVENTS_REDIS_URL 로 워커 간 전달
+EVENTS_REDIS_URL = os.environ.get('ONGI_EVENTS_REDIS_URL')
+EVENTS_HEARTBEAT_SECONDS = 15
+EVENTS_STREAM_MAX_SECONDS = 300
+
+# 홈 화면 묶음 API: 섹션 동시 조회 스레드 수 (0 이면 순차 조회), 섹션별 제한 시간(초)
+HOME_WORKERS = 8
+HOME_SECTION_TIMEOUT = 2.0
+HOME_SECTION_TIMEOUTS = {'user': 1.0}
+# 제한 시간을 넘긴 섹션도 끝날 때까지 스레드를 차지하므로, 대기 + 실행 중 섹션이 이 수에 이르면 새 섹션은 바로 'busy' 로 응답
+HOME_MAX_IN_FLIGHT = 32
+
+# 일괄 조회 API (?ids=) 한 번에 받을 수 있는 최대 id 수
+BATCH_MAX_IDS = 100
+
+# 델타 동기화 변경 기록 보관 기간 (prune_changelog 명령)
+SYNC_RETENTION_DAYS = 90
+# 이 시간(초)보다 최근 변경 기록은 아직 커밋되지 않은 앞 seq 가 있을 수 있어 다음 동기화에서 전달
+# (가장 긴 쓰기 트랜잭션보다 길게 설정)
+SYNC_COMMIT_LAG_SECONDS = 10
+
+# 직렬화 조각 캐시 (core.fragments). 무효화가 워커 간에 공유되어야 하므로
+# 워커가 여러 개면 Redis 를 설정해야 하며, 설정이 없으면 DEBUG 에서만 프로세스 내 캐시로 켠다
+FRAGMENT_CACHE_REDIS_URL = os.environ.get('ONGI_FRAGMENT_CACHE_REDIS_URL')
+FRAGMENT_CACHE_ENABLED = bool(FRAGMENT_CACHE_REDIS_URL) or DEBUG
+FRAGMENT_CACHE_ALIAS = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = 6 * 3600
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': FRAGMENT_CACHE_REDIS_URL,
+    } if FRAGMENT_CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# 바이너리 요청/응답 형식 (Accept/Content-Type: application/msgpack, application/cbor), 패키지가 있을 때만 사용
+_BINARY_FORMATS = [
+    (f'core.parsers.{name}Parser', f'core.renderers.{name}Renderer')
+    for name, package in (('MessagePack', 'msgpack'), ('CBOR', 'cbor2'))
+    if importlib.util.find_spec(package)
+]
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         # 'rest_framework.authentication.TokenAuthentication',
@@ -117,10 +226,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.FormParser',
-        'rest_framework.parsers.MultiPartParser'
+        'rest_framework.parsers.MultiPartParser',
+        *[parser for parser, _ in _BINARY_FORMATS],
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
+        *[renderer for _, renderer in _BINARY_FORMATS],
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'UNICODE_JSON': True,
@@ -171,6 +282,30 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# 미디어 파일 이름에 내용 해시를 붙여 저장 (URL 이 내용별로 달라지므로 만료 없이 캐시 가능)
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.VersionedFileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# 미참조 미디어 정리 (gc_media 명령)
+MEDIA_GC_GRACE_SECONDS = 3600  # 최근 수정된 파일은 업로드 중일 수 있으므로 제외
+MEDIA_GC_QUARANTINE_DAYS = 7  # 격리 후 실제 삭제까지 보관 기간
+MEDIA_GC_EXCLUDE_DIRS = ()  # GC 대상에서 제외할 MEDIA_ROOT 최상위 폴더
+
+# 사진측량 단계별 중간 결과 캐시 (이미지 내용 + 설정 해시 기준, 예산 초과 시 LRU 삭제)
+PHOTOGRAMMETRY_CACHE_ROOT = os.environ.get('ONGI_PHOTOGRAMMETRY_CACHE', os.path.join(BASE_DIR, 'cache', 'photogrammetry'))
+PHOTOGRAMMETRY_CACHE_BUDGET_GB = float(os.environ.get('ONGI_PHOTOGRAMMETRY_CACHE_GB', 20))
+PHOTOGRAMMETRY_TOOL_VERSION = os.environ.get('ONGI_MESHROOM_VERSION', '')  # 도구 버전이 바뀌면 캐시 무효화
+
+# 재구성 파이프라인 (reconstruct_model 명령, 단계별 체크포인트)
+PHOTOGRAMMETRY_WORK_ROOT = os.environ.get('ONGI_PHOTOGRAMMETRY_WORK', os.path.join(BASE_DIR, 'cache', 'reconstruction'))
+PHOTOGRAMMETRY_WORKERS = int(os.environ.get('ONGI_PHOTOGRAMMETRY_WORKERS', 2))  # 동시에 실행할 독립 단계 수
+PHOTOGRAMMETRY_STAGE_TIMEOUT = int(os.environ.get('ONGI_PHOTOGRAMMETRY_STAGE_TIMEOUT', 6 * 3600))
+ALICEVISION_BIN_DIR = os.environ.get('ALICEVISION_BIN_DIR', '')  # 비어 있으면 PATH 에서 찾음
+ALICEVISION_SENSOR_DB = os.environ.get('ALICEVISION_SENSOR_DB', '')
+ALICEVISION_VOCTREE = os.environ.get('ALICEVISION_VOCTREE', '')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -5,10 +5,14 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.static import serve
 from django.http import HttpResponse
+from core.media_layout import IMMUTABLE_CACHE_CONTROL, is_versioned
 
 # CORS 헤더를 추가하는 미디어 파일 서빙 함수
 def serve_with_cors(request, path, document_root=None, show_indexes=False):
     response = serve(request, path, document_root, show_indexes)
+    if is_versioned(path):
+        # 내용 해시가 붙은 파일은 경로가 같으면 내용도 같으므로 만료 없이 캐시
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
     response['Access-Control-Allow-Origin'] = '*'
     response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
     response['Access-Control-Allow-Headers'] = 'Origin, Content-Type, Accept'
@@ -22,6 +26,7 @@ urlpatterns = [
     path('api/feeds/', include('feeds.urls')),
     path('api/artifacts/', include('artifacts.urls')),
     path('api/models/', include('model3d.urls')),
+    path('api/', include('core.urls')),  # 메트릭, 실시간 이벤트
 ]
 
 # DEBUG=True일 때 미디어 파일 서빙 (CORS 헤더 추가)
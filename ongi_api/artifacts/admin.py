@@ -1,67 +1,93 @@
 from django.contrib import admin
-from django.utils.safestring import mark_safe
+from django.core.paginator import Paginator
+from django.db.models import Prefetch
+from django.forms.models import BaseInlineFormSet
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 from .models import Artifact, ArtifactFeed
 from feeds.models import Feed, FeedImage
+from feeds.thumbnails import thumbnail_url
 
 
-class RelatedImagesInline(admin.StackedInline):
-    model = FeedImage
-    extra = 0
-    max_num = 0
-    can_delete = False
-    readonly_fields = ['image_preview']
-    fields = ['image_preview']
-    verbose_name = "관련 이미지"
-    verbose_name_plural = "관련 이미지들"
-    
-    def get_queryset(self, request):
-        # 현재 아티팩트 연결된 피드 이미지만 조회
-        qs = super().get_queryset(request)
-        artifact_id = request.resolver_match.kwargs.get('object_id')
-        if artifact_id:
-            feed_ids = ArtifactFeed.objects.filter(artifact_id=artifact_id).values_list('feed_id', flat=True)
-            return qs.filter(feed_id__in=feed_ids)
-        return qs.none()
-    
-    def image_preview(self, obj):
-        if obj.image_url:
-            return mark_safe(f'<img src="{obj.image_url}" style="max-width:400px; max-height:300px" />')
-        return "이미지 없음"
-    
-    image_preview.short_description = "이미지 미리보기"
-    
-    def has_add_permission(self, request, obj=None):
-        return False
+GALLERY_PAGE_SIZE = 48  # 갤러리 한 페이지 이미지 수
+INLINE_IMAGE_LIMIT = 6  # 인라인 행당 미리보기 이미지 수
+INLINE_FEED_LIMIT = 20  # 유물 수정 화면에 표시할 최근 피드 연결 수 (나머지는 피드 연결 목록에서)
+
+
+def artifact_images(artifact):
+    """유물에 연결된 피드 이미지 쿼리셋 (갤러리 표시용 최소 컬럼)"""
+    return (
+        FeedImage.objects
+        .filter(feed__feed_artifacts__artifact=artifact)
+        .only('id', 'image_url', 'order', 'feed_id')
+        .order_by('feed__created_at', 'feed_id', 'order')
+    )
+
+
+def image_thumbnails(images, size=150):
+    """썸네일 이미지 태그 목록 (브라우저 지연 로딩, 클릭 시 원본)"""
+    return format_html_join(
+        '',
+        '<a href="{}" target="_blank"><img src="{}" loading="lazy" '
+        'style="width:{}px; height:{}px; object-fit:cover; margin:3px" /></a>',
+        ((image.image_url, thumbnail_url(image.image_url, size), size, size) for image in images),
+    )
+
+
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """유물별로 걸러진 뒤 최근 INLINE_FEED_LIMIT 개만 폼으로 만드는 인라인 폼셋"""
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            self._queryset = super().get_queryset()[:INLINE_FEED_LIMIT]
+        return self._queryset
 
 
 class ArtifactFeedInline(admin.TabularInline):
     model = ArtifactFeed
+    formset = LimitedInlineFormSet
+    ordering = ['-created_at']
+    verbose_name_plural = f'피드 연결 (최근 {INLINE_FEED_LIMIT}개)'
     extra = 0
     can_delete = True
     fields = ['feed', 'feed_images']
-    readonly_fields = ['feed_images']
-    
+    # 피드 연결은 자동 생성되므로 읽기 전용 (행마다 전체 피드 select 위젯을 렌더링하지 않음)
+    readonly_fields = ['feed', 'feed_images']
+
+    def get_queryset(self, request):
+        # 피드, 작성자, 이미지를 한 번에 가져와 행마다 쿼리하지 않음
+        return super().get_queryset(request).select_related('artifact', 'feed__user').prefetch_related(
+            Prefetch('feed__images', queryset=FeedImage.objects.only('id', 'image_url', 'order', 'feed_id'))
+        )
+
     def feed_images(self, obj):
-        images = FeedImage.objects.filter(feed=obj.feed)
-        html = ""
-        for image in images:
-            html += f'<img src="{image.image_url}" style="max-width:200px; max-height:150px; margin:5px" />'
-        return mark_safe(html) if html else "이미지 없음"
-    
+        images = obj.feed.images.all()
+        if not images:
+            return "이미지 없음"
+        html = image_thumbnails(images[:INLINE_IMAGE_LIMIT], size=150)
+        if len(images) > INLINE_IMAGE_LIMIT:
+            html = format_html('{} <span>외 {}장</span>', html, len(images) - INLINE_IMAGE_LIMIT)
+        return html
+
     feed_images.short_description = "피드 이미지"
 
+    def has_add_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(Artifact)
 class ArtifactAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'status', 'image_count', 'time_period', 'origin_location', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('name', 'description')
-    readonly_fields = ['all_images']
+    readonly_fields = ['all_images', 'feed_links']
     inlines = [ArtifactFeedInline]
-    
+
     fieldsets = (
         ('기본 정보', {
-            'fields': ('name', 'description', 'status', 'image_count')
+            'fields': ('name', 'description', 'status', 'image_count', 'feed_links')
         }),
         ('출처 정보', {
             'fields': ('time_period', 'estimated_year', 'origin_location')
@@ -70,59 +96,80 @@ class ArtifactAdmin(admin.ModelAdmin):
             'fields': ('all_images',),
         }),
     )
-    
+
+    def get_urls(self):
+        urls = [
+            path(
+                '<path:object_id>/gallery/',
+                self.admin_site.admin_view(self.gallery_view),
+                name='artifacts_artifact_gallery',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def gallery_view(self, request, object_id):
+        """유물 이미지 갤러리 (페이지 단위 썸네일, 페이지당 쿼리 수 고정)"""
+        artifact = get_object_or_404(Artifact, pk=object_id)
+        page = Paginator(artifact_images(artifact), GALLERY_PAGE_SIZE).get_page(request.GET.get('page'))
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'{artifact.name} 이미지 갤러리',
+            'opts': self.model._meta,
+            'original': artifact,
+            'page_obj': page,
+            'thumbnails': image_thumbnails(page.object_list, size=300),
+        }
+        return TemplateResponse(request, 'admin/artifacts/artifact/gallery.html', context)
+
     def all_images(self, obj):
-        artifact_feeds = ArtifactFeed.objects.filter(artifact=obj)
-        feed_ids = artifact_feeds.values_list('feed_id', flat=True)
-        images = FeedImage.objects.filter(feed_id__in=feed_ids)
-        
-        html = "<div style='display:flex; flex-wrap:wrap;'>"
-        for image in images:
-            html += f"""
-            <div style='margin:10px; text-align:center;'>
-                <img src="{image.image_url}" style="max-width:300px; max-height:300px; object-fit:contain;" />
-                <p>Feed ID: {image.feed.id}</p>
-            </div>
-            """
-        html += "</div>"
-        
-        return mark_safe(html) if images.exists() else "이미지 없음"
-    
+        # 첫 페이지 미리보기만 렌더링하고 나머지는 갤러리 페이지로 안내
+        images = list(artifact_images(obj)[:GALLERY_PAGE_SIZE + 1])
+        if not images:
+            return "이미지 없음"
+
+        html = format_html("<div style='display:flex; flex-wrap:wrap;'>{}</div>", image_thumbnails(images[:GALLERY_PAGE_SIZE]))
+        gallery_url = reverse('admin:artifacts_artifact_gallery', args=[obj.pk])
+        if len(images) > GALLERY_PAGE_SIZE:
+            return format_html('{}<p><a href="{}">전체 이미지 갤러리 보기</a></p>', html, gallery_url)
+        return html
+
     all_images.short_description = "모든 관련 이미지"
 
+    def feed_links(self, obj):
+        # 인라인은 최근 연결만 보여주므로 전체 목록으로 가는 링크 제공
+        count = obj.artifact_feeds.count()
+        url = reverse('admin:artifacts_artifactfeed_changelist') + f'?artifact__id__exact={obj.pk}'
+        return format_html('<a href="{}">{}개 전체 보기</a>', url, count)
+
+    feed_links.short_description = "피드 연결"
+
 
 @admin.register(ArtifactFeed)
 class ArtifactFeedAdmin(admin.ModelAdmin):
     list_display = ('id', 'artifact_display', 'feed_display', 'created_at')
     list_filter = ('created_at',)
+    list_select_related = ('artifact', 'feed')
     search_fields = ('artifact__name',)
+    raw_id_fields = ('artifact', 'feed')
     readonly_fields = ['feed_images']
-    
+
     def artifact_display(self, obj):
         return obj.artifact.name if obj.artifact else "N/A"
-    
+
     artifact_display.short_description = "Artifact"
-    
+
     def feed_display(self, obj):
         return f"Feed #{obj.feed.id} - {obj.feed.artifact_name}" if obj.feed else "N/A"
-    
+
     feed_display.short_description = "Feed"
-    
+
     def feed_images(self, obj):
-        images = FeedImage.objects.filter(feed=obj.feed)
-        html = "<div style='display:flex; flex-wrap:wrap;'>"
-        for image in images:
-            html += f"""
-            <div style='margin:10px; text-align:center;'>
-                <img src="{image.image_url}" style="max-width:300px; max-height:300px; object-fit:contain;" />
-            </div>
-            """
-        html += "</div>"
-        
-        return mark_safe(html) if images.exists() else "이미지 없음"
-    
+        images = FeedImage.objects.filter(feed=obj.feed).only('id', 'image_url', 'order', 'feed_id')
+        html = image_thumbnails(images, size=300)
+        return format_html("<div style='display:flex; flex-wrap:wrap;'>{}</div>", html) if html else "이미지 없음"
+
     feed_images.short_description = "피드 이미지"
-    
+
     fieldsets = (
         (None, {
             'fields': ('artifact', 'feed')
@@ -130,4 +177,4 @@ class ArtifactFeedAdmin(admin.ModelAdmin):
         ('피드 이미지', {
             'fields': ('feed_images',),
         }),
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,91 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+from core.zipstream import ZipEntry, ZipStream
+from feeds.models import FeedImage
+from feeds.thumbnails import media_relative_path
+from model3d.models import Model3D, Model3DVariant, SourceImage
+
+
+# 내보내기 구성 요소 (?include= 로 선택)
+EXPORT_PARTS = ('feeds', 'sources', 'models')
+
+
+def _safe_name(value):
+    return ''.join('_' if char in '/\\:*?"<>|' else char for char in str(value)).strip() or 'artifact'
+
+
+def _local_path(name):
+    """MEDIA_ROOT 기준 경로 -> 로컬 파일 경로 (없으면 None)"""
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        return None
+    return path if os.path.isfile(path) else None
+
+
+def export_entries(artifact, include=EXPORT_PARTS, include_unpublished=False):
+    """
+    유물 내보내기 항목 목록 (파일이 없는 레코드는 건너뜀)
+    <유물 이름>/feeds/<피드 ID>/<파일>, <유물 이름>/models/<모델 ID>/... 구조
+    """
+    root = _safe_name(artifact.name)
+    entries = []
+
+    if 'feeds' in include:
+        images = FeedImage.objects.filter(feed__feed_artifacts__artifact=artifact)
+        if not include_unpublished:
+            images = images.filter(feed__status='published')
+        for image in images.order_by('feed__created_at', 'feed_id', 'order').values('feed_id', 'image_url').iterator():
+            relative_path = media_relative_path(image['image_url'])
+            path = relative_path and _local_path(relative_path)
+            if path:
+                entries.append(ZipEntry(f'{root}/feeds/{image["feed_id"]}/{os.path.basename(path)}', path))
+
+    models = Model3D.objects.filter(artifact=artifact)
+    if not include_unpublished:
+        models = models.filter(status='completed')
+    model_ids = list(models.values_list('id', flat=True))
+
+    if 'sources' in include:
+        sources = SourceImage.objects.filter(model_id__in=model_ids).order_by('model_id', 'order')
+        for source in sources.values('model_id', 'image_url').iterator():
+            path = source['image_url'] and _local_path(source['image_url'])
+            if path:
+                entries.append(ZipEntry(f'{root}/models/{source["model_id"]}/sources/{os.path.basename(path)}', path))
+
+    if 'models' in include:
+        for model in models.order_by('created_at').values('id', 'model_url', 'thumbnail_url'):
+            for name in (model['model_url'], model['thumbnail_url']):
+                path = name and _local_path(name)
+                if path:
+                    entries.append(ZipEntry(f'{root}/models/{model["id"]}/{os.path.basename(path)}', path))
+        variants = Model3DVariant.objects.filter(model_id__in=model_ids).values('model_id', 'file')
+        for variant in variants:
+            path = variant['file'] and _local_path(variant['file'])
+            if path:
+                entries.append(ZipEntry(f'{root}/models/{variant["model_id"]}/{os.path.basename(path)}', path))
+
+    return entries
+
+
+def export_stream(artifact, include=EXPORT_PARTS, include_unpublished=False):
+    return ZipStream(export_entries(artifact, include, include_unpublished))
+
+
+def export_filename(artifact):
+    return f'{_safe_name(artifact.name)}.zip'
+
+
+def parse_include(value):
+    """'feeds,models' -> ('feeds', 'models'), 알 수 없는 값이 있으면 ValueError"""
+    if not value:
+        return EXPORT_PARTS
+    parts = tuple(part.strip() for part in value.split(',') if part.strip())
+    unknown = set(parts) - set(EXPORT_PARTS)
+    if unknown or not parts:
+        raise ValueError(', '.join(sorted(unknown)))
+    return parts
@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from artifacts.export import EXPORT_PARTS, export_filename, export_stream, parse_include
+from artifacts.models import Artifact
+
+
+class Command(BaseCommand):
+    help = '유물의 피드 사진, 원본 이미지, 3D 모델 파일을 ZIP 으로 내보냅니다. (임시 파일 없이 스트리밍)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('artifact_id')
+        parser.add_argument('--output', '-o', help="저장할 경로 ('-' 이면 표준 출력, 생략 시 '<유물 이름>.zip')")
+        parser.add_argument('--include', help=f'포함할 구성 요소 (쉼표 구분: {", ".join(EXPORT_PARTS)})')
+        parser.add_argument('--published-only', action='store_true', help='공개 피드와 완료된 모델만 포함')
+        parser.add_argument('--resume', action='store_true', help='기존 파일 크기 이후부터 이어서 기록')
+
+    def handle(self, *args, **options):
+        try:
+            artifact = Artifact.objects.get(id=options['artifact_id'])
+        except (Artifact.DoesNotExist, ValueError):
+            raise CommandError('유물을 찾을 수 없습니다.')
+        try:
+            include = parse_include(options['include'])
+        except ValueError as e:
+            raise CommandError(f'알 수 없는 include 값입니다: {e}')
+
+        stream = export_stream(artifact, include, include_unpublished=not options['published_only'])
+        output = options['output'] or export_filename(artifact)
+        if output == '-':
+            for chunk in stream:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        start = 0
+        if options['resume']:
+            try:
+                with open(output, 'rb') as file:
+                    start = min(file.seek(0, 2), stream.size)
+            except FileNotFoundError:
+                pass
+        with open(output, 'r+b' if start else 'wb') as file:
+            file.seek(start)
+            file.truncate()
+            if start < stream.size:
+                for chunk in stream.iter_range(start):
+                    file.write(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'{output}: 파일 {len(stream.entries)}개, {stream.size / 1024 / 1024:.1f}MB'
+            + (f' ({start} 바이트부터 이어서 기록)' if start else '')
+        ))
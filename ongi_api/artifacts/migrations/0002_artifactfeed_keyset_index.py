@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0001_initial'),
+        ('feeds', '0002_remove_feed_content_remove_feed_title_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artifactfeed',
+            index=models.Index(fields=['artifact', '-created_at', '-id'], name='artifact_feeds_keyset_idx'),
+        ),
+    ]
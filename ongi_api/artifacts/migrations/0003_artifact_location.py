@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0002_artifactfeed_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='artifact',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='artifact',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='artifact',
+            index=models.Index(fields=['latitude', 'longitude'], name='artifacts_lat_lng_idx'),
+        ),
+    ]
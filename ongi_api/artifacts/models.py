@@ -1,6 +1,7 @@
 from django.db import models
 import uuid
 from feeds.models import Feed
+from core.geo import geohash_encode
 
 
 class Artifact(models.Model):
@@ -21,14 +22,37 @@ class Artifact(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='auto_generated')
     
     image_count = models.IntegerField(default=0)
+    
+    # 연결된 피드 촬영 위치의 중심 좌표
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
+    def update_location(self):
+        """연결된 피드 좌표 평균으로 위치 갱신 (저장은 호출자가 수행)"""
+        from django.db.models import Avg
+        
+        center = Feed.objects.filter(
+            feed_artifacts__artifact=self, latitude__isnull=False
+        ).aggregate(lat=Avg('latitude'), lng=Avg('longitude'))
+        if center['lat'] is None:
+            return
+        self.latitude = center['lat']
+        self.longitude = center['lng']
+        self.geohash = geohash_encode(center['lat'], center['lng'])
+
     class Meta:
         db_table = 'artifacts'
+        indexes = [
+            # 바운딩 박스 조회용
+            models.Index(fields=['latitude', 'longitude'], name='artifacts_lat_lng_idx'),
+        ]
 
 
 class ArtifactFeed(models.Model):
@@ -44,6 +68,10 @@ class ArtifactFeed(models.Model):
     class Meta:
         db_table = 'artifact_feeds'
         unique_together = ('artifact', 'feed')
+        indexes = [
+            # 유물별 피드 키셋 페이지네이션용
+            models.Index(fields=['artifact', '-created_at', '-id'], name='artifact_feeds_keyset_idx'),
+        ]
 
 
 def check_and_create_artifact(artifact_name):
@@ -69,13 +97,12 @@ def check_and_create_artifact(artifact_name):
                 artifact=artifact,
                 feed=feed
             )
+        
+        artifact.update_location()
+        artifact.save()
             
         return artifact
     elif existing_artifact:
-        # 기존 유물 이미지 수 업데이트
-        existing_artifact.image_count = total_images
-        existing_artifact.save()
-        
         # 연결되지 않은 피드 연결
         existing_feeds = ArtifactFeed.objects.filter(artifact=existing_artifact).values_list('feed_id', flat=True)
         for feed in feeds:
@@ -84,6 +111,11 @@ def check_and_create_artifact(artifact_name):
                     artifact=existing_artifact,
                     feed=feed
                 )
+        
+        # 기존 유물 이미지 수 및 위치 업데이트
+        existing_artifact.image_count = total_images
+        existing_artifact.update_location()
+        existing_artifact.save()
                 
         return existing_artifact
     
@@ -1,9 +1,37 @@
+from django.db.models import Count, OuterRef, Prefetch, Subquery
 from rest_framework import serializers
 from .models import Artifact, ArtifactFeed
-from feeds.models import Feed
+from feeds.models import Feed, FeedImage
+from model3d.models import Model3D
 from feeds.serializers import FeedSerializer, UserMinimalSerializer
+from core.serializers import DynamicFieldsMixin, FragmentListSerializer, eager_load
 
-class ArtifactSerializer(serializers.ModelSerializer):
+RECENT_FEEDS_LIMIT = 5
+
+def _with_completed_models(queryset):
+    return queryset.prefetch_related(Prefetch(
+        'models',
+        queryset=Model3D.objects.filter(status='completed').order_by('pk').only('id', 'artifact_id', 'thumbnail_url'),
+        to_attr='completed_models',
+    ))
+
+
+def _with_first_feed_image(queryset, serializer):
+    first_image = FeedImage.objects.filter(
+        feed__feed_artifacts__artifact=OuterRef('pk')
+    ).order_by('feed__feed_artifacts__id', 'order').values('image_url')[:1]
+    return _with_completed_models(queryset.annotate(first_feed_image=Subquery(first_image)))
+
+
+def _with_recent_feeds(queryset, serializer):
+    feeds = eager_load(FeedSerializer(**serializer.nested_shape('feeds')), Feed.objects.all())
+    recent = ArtifactFeed.objects.order_by('pk').prefetch_related(Prefetch('feed', queryset=feeds))
+    return queryset.prefetch_related(
+        Prefetch('artifact_feeds', queryset=recent[:RECENT_FEEDS_LIMIT], to_attr='recent_artifact_feeds')
+    )
+
+
+class ArtifactSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """유물 정보 시리얼라이저"""
     feed_count = serializers.SerializerMethodField()
     has_3d_model = serializers.SerializerMethodField()
@@ -14,24 +42,55 @@ class ArtifactSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'time_period', 'estimated_year',
             'origin_location', 'status', 'image_count', 'feed_count',
-            'has_3d_model', 'thumbnail_url', 'created_at', 'updated_at'  # thumbnail_url 추가
+            'has_3d_model', 'thumbnail_url', 'latitude', 'longitude',
+            'created_at', 'updated_at'  # thumbnail_url 추가
         ]
-        read_only_fields = ['id', 'image_count', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'image_count', 'latitude', 'longitude', 'created_at', 'updated_at']
+        expandable_fields = {
+            'feeds': serializers.SerializerMethodField,  # 연관 피드 (최대 5개)
+        }
+        eager_loading = {
+            'feed_count': lambda queryset, serializer: queryset.annotate(linked_feed_count=Count('artifact_feeds', distinct=True)),
+            'has_3d_model': lambda queryset, serializer: (
+                queryset if 'thumbnail_url' in serializer.fields else _with_completed_models(queryset)
+            ),
+            'thumbnail_url': _with_first_feed_image,
+            'feeds': _with_recent_feeds,
+        }
+        fragment_cache = True
+        # feed_count/has_3d_model/thumbnail_url 이 참조하는 객체가 바뀌면 유물 조각 무효화
+        fragment_dependencies = {
+            ArtifactFeed: lambda link: [link.artifact_id],
+            Model3D: lambda model: [model.artifact_id],
+            FeedImage: lambda image: ArtifactFeed.objects.filter(feed_id=image.feed_id).values_list('artifact_id', flat=True),
+        }
+        fragment_live_fields = ['feeds']
+        list_serializer_class = FragmentListSerializer
+    
+    def _completed_model(self, obj):
+        if hasattr(obj, 'completed_models'):
+            return obj.completed_models[0] if obj.completed_models else None
+        return obj.models.filter(status='completed').first()
     
     def get_feed_count(self, obj):
         """연관된 피드 수를 반환"""
+        if hasattr(obj, 'linked_feed_count'):
+            return obj.linked_feed_count
         return obj.artifact_feeds.count()
     
     def get_has_3d_model(self, obj):
         """3D 모델 존재 여부를 반환"""
-        return obj.models.filter(status='completed').exists()
+        return self._completed_model(obj) is not None
         
     def get_thumbnail_url(self, obj):
         """썸네일 URL 반환"""
         # 연결된 3D 모델이 있으면 그 썸네일 사용
-        model = obj.models.filter(status='completed').first()
+        model = self._completed_model(obj)
         if model and model.thumbnail_url:
             return model.thumbnail_url.url
+        
+        if hasattr(obj, 'first_feed_image'):
+            return obj.first_feed_image
             
         # 아니면 연결된 피드의 첫 번째 이미지 사용
         artifact_feed = obj.artifact_feeds.first()
@@ -44,15 +103,17 @@ class ArtifactSerializer(serializers.ModelSerializer):
         # 기본 이미지 없음
         return None
 
+    def get_feeds(self, obj):
+        """연관된 피드 목록을 반환 (최대 5개, ?expand=feeds)"""
+        if hasattr(obj, 'recent_artifact_feeds'):
+            artifact_feeds = obj.recent_artifact_feeds
+        else:
+            artifact_feeds = ArtifactFeed.objects.filter(artifact=obj).select_related('feed').order_by('pk')[:RECENT_FEEDS_LIMIT]
+        feeds = [item.feed for item in artifact_feeds]
+        return FeedSerializer(feeds, many=True, **self.nested_shape('feeds')).data
+
 class ArtifactDetailSerializer(ArtifactSerializer):
     """유물 상세 정보 시리얼라이저"""
-    feeds = serializers.SerializerMethodField()
     
     class Meta(ArtifactSerializer.Meta):
-        fields = ArtifactSerializer.Meta.fields + ['feeds']
-    
-    def get_feeds(self, obj):
-        """연관된 피드 목록을 반환 (최대 5개)"""
-        artifact_feeds = ArtifactFeed.objects.filter(artifact=obj).select_related('feed')[:5]
-        feeds = [item.feed for item in artifact_feeds]
-        return FeedSerializer(feeds, many=True).data
\ No newline at end of file
+        default_expand = ['feeds']
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.events import publish_on_commit
+from .models import Artifact, ArtifactFeed
+from .trending import get_trending
+
+
+@receiver(post_save, sender=Artifact)
+def artifact_saved(sender, instance, created, **kwargs):
+    # 피드 집계로 새 유물이 만들어지면 알림
+    if created:
+        publish_on_commit(
+            ['artifacts'],
+            'artifact.created',
+            {'id': str(instance.id), 'name': instance.name, 'status': instance.status, 'created_at': instance.created_at},
+            staff_only=instance.status == 'rejected',
+        )
+    if instance.status == 'rejected':
+        # 거부된 유물이 인기 목록 자리를 차지하지 않도록 제거
+        transaction.on_commit(lambda: get_trending().discard(instance.id))
+
+
+@receiver(post_delete, sender=Artifact)
+def artifact_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: get_trending().discard(instance.id))
+
+
+@receiver(post_save, sender=ArtifactFeed)
+def artifact_feed_linked(sender, instance, created, **kwargs):
+    # 유물에 게시된 피드가 연결되면 인기 점수 반영 (피드 작성 시각 기준으로 감쇠)
+    if created and instance.feed.status == 'published':
+        created_at = instance.feed.created_at
+        transaction.on_commit(lambda: get_trending().record(instance.artifact_id, 'feed', created_at))
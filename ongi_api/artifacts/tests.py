@@ -1,3 +1,294 @@
+import os
+import shutil
+import tempfile
+
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from users.models import User, CustomToken
+from artifacts.models import Artifact, ArtifactFeed
+from feeds.models import Feed, FeedImage
+from model3d.models import Model3D
+
+from core.tests import primary_reads
+
+
+@primary_reads
+class NearbyArtifactTests(TestCase):
+    def setUp(self):
+        from core.geo import geohash_encode
+
+        self.places = {}
+        for name, lat, lng in (('경복궁', 37.5796, 126.9770), ('덕수궁', 37.5658, 126.9751),
+                               ('불국사', 35.7901, 129.3320), ('피지', -17.8, 179.9), ('사모아', -13.8, -172.1)):
+            self.places[name] = Artifact.objects.create(
+                name=name, status='verified', latitude=lat, longitude=lng, geohash=geohash_encode(lat, lng),
+            )
+        Artifact.objects.create(name='거부', status='rejected', latitude=37.57, longitude=126.976,
+                                geohash=geohash_encode(37.57, 126.976))
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.json()]
+
+    def test_radius_sorted_by_distance(self):
+        response = self.client.get('/api/artifacts/nearby/', {'lat': 37.5665, 'lng': 126.9780, 'radius_km': 3})
+        self.assertEqual(self.names(response), ['덕수궁', '경복궁'])
+        distances = [item['distance_km'] for item in response.json()]
+        self.assertLess(distances[0], 0.5)
+        self.assertAlmostEqual(distances[1], 1.46, places=1)
+        response = self.client.get('/api/artifacts/nearby/', {'lat': 37.5665, 'lng': 126.9780, 'radius_km': 400})
+        self.assertEqual(self.names(response), ['덕수궁', '경복궁', '불국사'])
+
+    def test_bbox_including_antimeridian(self):
+        response = self.client.get('/api/artifacts/nearby/', {'bbox': '35,126,38,130'})
+        self.assertEqual(set(self.names(response)), {'경복궁', '덕수궁', '불국사'})
+        self.assertIsNone(response.json()[0]['distance_km'])
+        response = self.client.get('/api/artifacts/nearby/', {'bbox': '-20,179,-10,-170'})
+        self.assertEqual(set(self.names(response)), {'피지', '사모아'})
+
+    def test_limit_is_clamped_and_bad_input_rejected(self):
+        params = {'lat': 37.5665, 'lng': 126.9780, 'radius_km': 3}
+        self.assertEqual(self.names(self.client.get('/api/artifacts/nearby/', {**params, 'limit': -5})), ['덕수궁'])
+        self.assertEqual(self.names(self.client.get('/api/artifacts/nearby/', {**params, 'limit': 0})), ['덕수궁'])
+        self.assertEqual(self.client.get('/api/artifacts/nearby/', {'lat': 37.5}).status_code, 400)
+        self.assertEqual(self.client.get('/api/artifacts/nearby/', {'bbox': '1,2,3'}).status_code, 400)
+
+
+@primary_reads
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', email='pager@example.com', password='pw')
+        self.artifact = Artifact.objects.create(name='달항아리', status='verified')
+        self.links = [
+            ArtifactFeed.objects.create(
+                artifact=self.artifact,
+                feed=Feed.objects.create(user=self.user, artifact_name='달항아리', status='published'),
+            )
+            for _ in range(7)
+        ]
+
+    def pages(self, page_size):
+        ids, cursor = [], None
+        while True:
+            params = {'page_size': page_size, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get(f'/api/artifacts/{self.artifact.id}/feeds/', params).json()
+            ids.append([item['id'] for item in data['results']])
+            cursor = data['next_cursor']
+            self.assertEqual(data['has_more'], cursor is not None)
+            if cursor is None:
+                return ids
+
+    def test_cursor_round_trip(self):
+        import datetime
+        import uuid
+        from core.pagination import decode_cursor, encode_cursor
+
+        created_at = datetime.datetime(2024, 5, 1, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+        pk = uuid.uuid4()
+        cursor = encode_cursor(created_at, pk)
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), (created_at, pk))
+
+    def test_ties_on_created_at_are_not_skipped_or_repeated(self):
+        same_time = timezone.now()
+        ArtifactFeed.objects.filter(artifact=self.artifact).update(created_at=same_time)
+        pages = self.pages(3)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        # 같은 시각이면 id 내림차순으로 이어짐
+        expected = [str(link.feed_id) for link in sorted(self.links, key=lambda link: link.id, reverse=True)]
+        self.assertEqual([feed_id for page in pages for feed_id in page], expected)
+
+    def test_pages_follow_creation_order(self):
+        ArtifactFeed.objects.filter(id=self.links[0].id).update(created_at=timezone.now() + timezone.timedelta(days=1))
+        pages = self.pages(5)
+        self.assertEqual([len(page) for page in pages], [5, 2])
+        self.assertEqual(pages[0][0], str(self.links[0].feed_id))
+        self.assertEqual(len({feed_id for page in pages for feed_id in page}), 7)
+
+    def test_tampered_cursor_is_rejected(self):
+        import base64
+        from core.pagination import InvalidCursor, decode_cursor
+
+        def encode(value):
+            return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+        tampered = [
+            '!!!', encode('not json'), encode('{"a": 1}'), encode('["2024-05-01T00:00:00"]'),
+            encode('["yesterday", "8a6e0804-2bd0-4294-b888-8d9b4a3c3d62"]'), encode('["2024-05-01T00:00:00", "42"]'),
+            encode('["2024-01-01T00:00:00+00:00", 5]'), encode('[20240501, "8a6e0804-2bd0-4294-b888-8d9b4a3c3d62"]'),
+        ]
+        for cursor in tampered:
+            with self.assertRaises(InvalidCursor, msg=cursor):
+                decode_cursor(cursor)
+        for cursor in (tampered[1], tampered[-2]):
+            response = self.client.get(f'/api/artifacts/{self.artifact.id}/feeds/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('detail', response.json())
+
+
+@primary_reads
+class ArtifactAdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='curator', email='curator@example.com', password='pw')
+        self.client.force_login(self.admin)
+        self.artifact = Artifact.objects.create(name='청동은입사 포류수금문 정병', status='verified')
+
+    def add_feeds(self, count, images=3):
+        for _ in range(count):
+            feed = Feed.objects.create(user=self.admin, artifact_name=self.artifact.name, status='published')
+            for order in range(images):
+                FeedImage.objects.create(feed=feed, image_url=f'/media/feeds/{feed.id}/{order}.jpg', order=order)
+            ArtifactFeed.objects.create(artifact=self.artifact, feed=feed)
+
+    def queries(self, url):
+        from django.db import connection
+
+        self.client.get(url)  # 콘텐츠 타입 등 프로세스 캐시를 채운 뒤 측정
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_gallery_query_count_does_not_grow(self):
+        url = f'/admin/artifacts/artifact/{self.artifact.id}/gallery/'
+        self.add_feeds(2)
+        few, _ = self.queries(url)
+        self.add_feeds(20)
+        many, response = self.queries(url)
+        self.assertEqual(few, many)
+        self.assertEqual(response.context['page_obj'].paginator.count, 66)
+        self.assertEqual(len(response.context['page_obj'].object_list), 48)
+
+    def test_change_form_limits_inline_rows(self):
+        from artifacts.admin import INLINE_FEED_LIMIT
+
+        url = f'/admin/artifacts/artifact/{self.artifact.id}/change/'
+        self.add_feeds(2)
+        few, _ = self.queries(url)
+        self.add_feeds(INLINE_FEED_LIMIT + 5)
+        many, response = self.queries(url)
+        self.assertEqual(few, many)
+        formset = response.context['inline_admin_formsets'][0].formset
+        self.assertEqual(len(formset.forms), INLINE_FEED_LIMIT)
+        self.assertContains(response, f'{INLINE_FEED_LIMIT + 7}개 전체 보기')
+        self.assertEqual(self.client.get(f'/admin/artifacts/artifactfeed/?artifact__id__exact={self.artifact.id}').status_code, 200)
+
+
+@primary_reads
+class ArtifactExportTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        user = User.objects.create_user(username='export', email='export@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=user).key}'
+        self.artifact = Artifact.objects.create(name='청자 상감운학문 매병', status='verified')
+        for index, feed_status in enumerate(['published', 'published', 'draft']):
+            feed = Feed.objects.create(user=user, artifact_name=self.artifact.name, status=feed_status)
+            os.makedirs(os.path.join(self.media_root, 'feeds', str(feed.id)))
+            with open(os.path.join(self.media_root, 'feeds', str(feed.id), 'photo.jpg'), 'wb') as file:
+                file.write(os.urandom(50000 + index))
+            FeedImage.objects.create(feed=feed, image_url=f'/media/feeds/{feed.id}/photo.jpg')
+            ArtifactFeed.objects.create(artifact=self.artifact, feed=feed)
+
+    def test_streams_zip_and_resumes_with_range(self):
+        import io
+        import zipfile
+
+        url = f'/api/artifacts/{self.artifact.id}/export/'
+        with override_settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = b''.join(response.streaming_content)
+            self.assertEqual(int(response['Content-Length']), len(body))
+            archive = zipfile.ZipFile(io.BytesIO(body))
+            self.assertEqual(len(archive.namelist()), 2)  # 비공개 피드 제외
+            self.assertIsNone(archive.testzip())
+
+            partial = self.client.get(url, HTTP_RANGE='bytes=60000-', HTTP_IF_RANGE=response['ETag'])
+            self.assertEqual(partial.status_code, 206)
+            self.assertEqual(partial['Content-Range'], f'bytes 60000-{len(body) - 1}/{len(body)}')
+            self.assertEqual(b''.join(partial.streaming_content), body[60000:])
+
+            stale = self.client.get(url, HTTP_RANGE='bytes=60000-', HTTP_IF_RANGE='"other"')
+            self.assertEqual(stale.status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_RANGE=f'bytes={len(body)}-').status_code, 416)
+            self.assertEqual(self.client.get(url, {'include': 'unknown'}).status_code, 400)
+
+
+@primary_reads
+class TrendingTests(TestCase):
+    def setUp(self):
+        from artifacts.trending import InProcessTrending
+
+        self.trending = InProcessTrending(top_k=2)
+        self.user = User.objects.create_user(username='trend', email='trend@example.com', password='pw')
+
+    def test_decay_and_incremental_top_k(self):
+        from django.utils import timezone
+
+        old, recent, other = (Artifact.objects.create(name=name, status='verified') for name in ('오래된', '최근', '기타'))
+        now = timezone.now()
+        with override_settings(TRENDING_HALF_LIFE_HOURS=24):
+            for artifact, when in ((old, now - timezone.timedelta(days=3)), (recent, now)):
+                feed = Feed.objects.create(user=self.user, artifact_name=artifact.name, status='published')
+                Feed.objects.filter(id=feed.id).update(created_at=when)
+                ArtifactFeed.objects.create(artifact=artifact, feed=feed)
+            top = self.trending.top(10)
+            self.assertEqual([artifact_id for artifact_id, _ in top], [str(recent.id), str(old.id)])
+            self.assertAlmostEqual(top[1][1], 3.0 / 8, places=2)  # 반감기 3번
+
+            # 조회 수로 순위가 바뀌고, 상위 K 밖이던 유물도 이벤트만으로 들어온다
+            for _ in range(4):
+                self.trending.record(other.id, 'view')
+            self.assertEqual([artifact_id for artifact_id, _ in self.trending.top(10)], [str(other.id), str(recent.id)])
+
+            # 재계산 후에도 조회 점수 유지
+            self.trending.reset()
+            self.assertEqual(self.trending.top(1)[0][0], str(other.id))
+
+    def test_discard_frees_top_slot(self):
+        first, second, third = (Artifact.objects.create(name=name, status='verified') for name in ('가', '나', '다'))
+        self.trending.top(1)
+        for artifact, views in ((first, 3), (second, 2), (third, 1)):
+            for _ in range(views):
+                self.trending.record(artifact.id, 'view')
+        self.assertEqual([artifact_id for artifact_id, _ in self.trending.top(2)], [str(first.id), str(second.id)])
+        self.trending.discard(first.id)
+        self.assertEqual([artifact_id for artifact_id, _ in self.trending.top(2)], [str(second.id), str(third.id)])
+
+    def test_events_during_rebuild_are_kept(self):
+        artifact = Artifact.objects.create(name='재계산', status='verified')
+        self.trending.top(1)
+        self.trending._recorded = []  # 백그라운드 재계산이 DB 를 읽는 중인 상태
+        self.trending.record(artifact.id, 'view')
+        self.trending.rebuild()
+        self.assertEqual(self.trending.top(1)[0][0], str(artifact.id))
+
+    def test_model_completion_time_survives_edits(self):
+        artifact = Artifact.objects.create(name='완성', status='verified')
+        model = Model3D.objects.create(artifact=artifact, status='completed')
+        completed_at = model.completed_at
+        self.assertIsNotNone(completed_at)
+        model.description = '설명 수정'
+        model.save()
+        model.refresh_from_db()
+        self.assertEqual(model.completed_at, completed_at)
+        model.status = 'processing'
+        model.save(update_fields=['status'])
+        model.refresh_from_db()
+        self.assertIsNone(model.completed_at)
+
+    def test_endpoint_hides_rejected(self):
+        from artifacts import trending
 
-# Create your tests here.
+        visible = Artifact.objects.create(name='공개', status='verified')
+        rejected = Artifact.objects.create(name='거부', status='rejected')
+        self.addCleanup(setattr, trending, '_trending', trending._trending)
+        trending._trending = self.trending
+        self.trending.record(rejected.id, 'model')
+        self.trending.record(visible.id, 'view')
+        data = self.client.get('/api/artifacts/trending/').json()
+        self.assertEqual([item['id'] for item in data], [str(visible.id)])
+        self.assertIn('trending_score', data[0])
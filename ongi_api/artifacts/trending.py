@@ -0,0 +1,277 @@
+"""
+시간 감쇠 인기 유물 (피드 업로드/조회/3D 모델 완성 이벤트 가중 합)
+
+점수는 기준 시각 L 에 대한 forward decay 로 저장한다: 이벤트마다 weight * e^((t - L) / tau) 를 더함
+모든 점수가 같은 비율로 감쇠하므로 시간이 지나도 저장된 값을 고칠 필요가 없고, 점수가 증가만 하므로
+상위 K 개 목록을 이벤트마다 정확히 갱신할 수 있다. 현재 점수는 저장 값 * e^(-(now - L) / tau)
+"""
+import heapq
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+
+DEFAULT_WEIGHTS = {'feed': 3.0, 'view': 1.0, 'model': 10.0}
+RENORMALIZE_AFTER = 30  # 기준 시각이 tau 의 이 배수만큼 지나면 다시 잡음 (지수 값 오버플로 방지)
+PRUNE_EVERY = 1000  # Redis: 이벤트 이 수마다 하위 유물 정리
+PRUNE_KEEP_FACTOR = 10  # Redis: 상위 K 의 이 배수까지만 점수 유지
+
+
+def _tau():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600 / math.log(2)
+
+
+def _weights():
+    return {**DEFAULT_WEIGHTS, **getattr(settings, 'TRENDING_WEIGHTS', {})}
+
+
+def _timestamp(when):
+    return when.timestamp() if when is not None else time.time()
+
+
+def history_events(since):
+    """DB 에서 복원할 수 있는 이벤트 [(artifact_id, 종류, 시각)] (조회 수는 저장하지 않으므로 제외)"""
+    from .models import ArtifactFeed
+    from model3d.models import Model3D
+
+    links = ArtifactFeed.objects.filter(feed__status='published', feed__created_at__gte=since).exclude(artifact__status='rejected')
+    for artifact_id, created_at in links.values_list('artifact_id', 'feed__created_at').iterator(chunk_size=5000):
+        yield str(artifact_id), 'feed', created_at
+    # 완료 후 수정(설명 변경 등)이 점수를 다시 올리지 않도록 완료 시각 기준
+    models = Model3D.objects.filter(status='completed', completed_at__gte=since).exclude(artifact__status='rejected')
+    for artifact_id, completed_at in models.values_list('artifact_id', 'completed_at').iterator(chunk_size=5000):
+        yield str(artifact_id), 'model', completed_at
+
+
+def _history_since():
+    # 이보다 오래된 이벤트는 반감기 10번 이상 지나 점수에 거의 영향이 없음
+    return timezone.now() - timezone.timedelta(hours=10 * getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24))
+
+
+class InProcessTrending:
+    """
+    워커 프로세스 내 인기 유물 점수와 상위 K 목록
+    TRENDING_REBUILD_SECONDS 마다 백그라운드 스레드에서 DB 이벤트로 점수를 다시 계산해 다른 워커의 변경/삭제를 반영한다
+    (요청 경로는 재계산을 기다리지 않고 기존 목록을 읽음, 처음 한 번만 바로 적재)
+    조회 수는 DB 에 없으므로 워커별로 따로 누적해 재계산 후에도 유지한다
+    """
+
+    def __init__(self, top_k=100, rebuild_seconds=None):
+        self._lock = threading.RLock()
+        self._top_k = top_k
+        self._rebuild_seconds = rebuild_seconds
+        self._built_at = None
+        self._landmark = time.time()
+        self._scores = {}  # {artifact_id: 저장 점수}
+        self._views = {}  # {artifact_id: 조회 저장 점수}
+        self._top = []  # [(저장 점수, artifact_id)] 점수 내림차순, 최대 K 개
+        self._recorded = None  # 재계산 중 들어온 이벤트 [(artifact_id, 종류, 시각)] (재계산 결과에 다시 적용)
+
+    def _ensure_loaded(self):
+        if self._built_at is None:
+            self.rebuild()
+        elif (
+            self._rebuild_seconds and self._recorded is None
+            and time.monotonic() - self._built_at >= self._rebuild_seconds
+        ):
+            self._recorded = []
+            threading.Thread(target=self._rebuild_in_background, name='trending-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        from django.db import connection
+
+        try:
+            self.rebuild()
+        finally:
+            connection.close()  # 작업 스레드의 DB 연결 정리
+
+    def rebuild(self):
+        """DB 이벤트와 누적 조회 점수로 점수/상위 목록 재계산 (DB 조회는 잠금 밖에서)"""
+        with self._lock:
+            if self._recorded is None:
+                self._recorded = []
+            landmark = time.time()
+            shift = math.exp((self._landmark - landmark) / _tau())
+            views = {artifact_id: score * shift for artifact_id, score in self._views.items() if score * shift > 1e-9}
+        try:
+            scores = dict(views)
+            weights, tau = _weights(), _tau()
+            for artifact_id, kind, when in history_events(_history_since()):
+                scores[artifact_id] = scores.get(artifact_id, 0.0) + weights[kind] * math.exp((_timestamp(when) - landmark) / tau)
+        except Exception:
+            with self._lock:
+                self._recorded = None
+                self._built_at = time.monotonic()  # 다음 주기에 다시 시도
+            raise
+        with self._lock:
+            recorded, self._recorded = self._recorded, None
+            self._landmark, self._scores, self._views = landmark, scores, views
+            self._top = heapq.nlargest(self._top_k, ((score, artifact_id) for artifact_id, score in scores.items()))
+            self._built_at = time.monotonic()
+            # 재계산 중 기록된 이벤트 반영 (DB 조회에 이미 포함된 피드/모델 이벤트는 다음 재계산에서 바로잡힘)
+            for artifact_id, kind, when in recorded:
+                if kind == 'discard':
+                    self._discard(artifact_id)
+                else:
+                    self._apply(artifact_id, kind, when)
+
+    def _renormalize(self):
+        # 기준 시각을 현재로 옮기며 저장 점수를 같은 비율로 줄임 (순서는 그대로이므로 DB 조회 불필요)
+        landmark = time.time()
+        shift = math.exp((self._landmark - landmark) / _tau())
+        self._scores = {artifact_id: score * shift for artifact_id, score in self._scores.items()}
+        self._views = {artifact_id: score * shift for artifact_id, score in self._views.items()}
+        self._top = [(score * shift, artifact_id) for score, artifact_id in self._top]
+        self._landmark = landmark
+
+    def record(self, artifact_id, kind, when=None):
+        artifact_id = str(artifact_id)
+        with self._lock:
+            self._ensure_loaded()
+            if self._recorded is not None:
+                self._recorded.append((artifact_id, kind, when))
+            self._apply(artifact_id, kind, when)
+
+    def _apply(self, artifact_id, kind, when):
+        if (time.time() - self._landmark) / _tau() > RENORMALIZE_AFTER:
+            self._renormalize()
+        increment = _weights()[kind] * math.exp((_timestamp(when) - self._landmark) / _tau())
+        score = self._scores.get(artifact_id, 0.0) + increment
+        self._scores[artifact_id] = score
+        if kind == 'view':
+            self._views[artifact_id] = self._views.get(artifact_id, 0.0) + increment
+        self._promote(artifact_id, score)
+
+    def _promote(self, artifact_id, score):
+        """점수가 오른 유물을 상위 목록에 반영 (다른 유물의 순서는 바뀌지 않으므로 O(K))"""
+        top = [entry for entry in self._top if entry[1] != artifact_id]
+        if len(top) >= self._top_k and score <= top[-1][0]:
+            return
+        index = next((index for index, entry in enumerate(top) if entry[0] < score), len(top))
+        top.insert(index, (score, artifact_id))
+        self._top = top[:self._top_k]
+
+    def discard(self, artifact_id):
+        """삭제/거부된 유물을 점수와 상위 목록에서 제거 (빈자리는 다음 순위로 채움)"""
+        artifact_id = str(artifact_id)
+        with self._lock:
+            if self._recorded is not None:
+                self._recorded.append((artifact_id, 'discard', None))
+            self._discard(artifact_id)
+
+    def _discard(self, artifact_id):
+        self._scores.pop(artifact_id, None)
+        self._views.pop(artifact_id, None)
+        if any(entry[1] == artifact_id for entry in self._top):
+            self._top = heapq.nlargest(self._top_k, ((score, key) for key, score in self._scores.items()))
+
+    def top(self, limit):
+        """[(artifact_id, 현재 점수), ...] 상위부터"""
+        with self._lock:
+            self._ensure_loaded()
+            decay = math.exp((self._landmark - time.time()) / _tau())
+            return [(artifact_id, score * decay) for score, artifact_id in self._top[:limit]]
+
+    def reset(self):
+        with self._lock:
+            self._built_at = None
+
+
+class RedisTrending:
+    """
+    Redis sorted set 인기 유물 (워커 간 공유, 조회 수 포함)
+    TRENDING_REDIS_URL 설정 시 사용하며 redis 패키지가 필요하다
+    """
+    KEY = 'ongi:trending:score'
+    LANDMARK_KEY = 'ongi:trending:landmark'
+
+    def __init__(self, url, top_k=100):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._top_k = top_k
+        self._records = 0
+
+    def _landmark(self):
+        landmark = self._redis.get(self.LANDMARK_KEY)
+        if landmark is not None:
+            landmark = float(landmark)
+            if (time.time() - landmark) / _tau() <= RENORMALIZE_AFTER:
+                return landmark
+            # 기준 시각을 옮기면서 저장 점수를 같은 비율로 줄임 (다른 워커가 먼저 옮겼으면 그 값 사용)
+            import redis
+
+            new_landmark = time.time()
+            with self._redis.pipeline() as pipe:
+                try:
+                    pipe.watch(self.LANDMARK_KEY)
+                    if float(pipe.get(self.LANDMARK_KEY)) != landmark:
+                        return float(pipe.get(self.LANDMARK_KEY))
+                    pipe.multi()
+                    pipe.zunionstore(self.KEY, {self.KEY: math.exp((landmark - new_landmark) / _tau())})
+                    pipe.zremrangebyrank(self.KEY, 0, -(self._top_k * PRUNE_KEEP_FACTOR) - 1)
+                    pipe.set(self.LANDMARK_KEY, new_landmark)
+                    pipe.execute()
+                except redis.WatchError:
+                    return float(self._redis.get(self.LANDMARK_KEY))
+            return new_landmark
+        return self._load()
+
+    def _load(self):
+        landmark = time.time()
+        if not self._redis.set(self.LANDMARK_KEY, landmark, nx=True):
+            return float(self._redis.get(self.LANDMARK_KEY))  # 다른 워커가 적재 중
+        weights, tau = _weights(), _tau()
+        pipe = self._redis.pipeline(transaction=False)
+        for index, (artifact_id, kind, when) in enumerate(history_events(_history_since()), 1):
+            pipe.zincrby(self.KEY, weights[kind] * math.exp((_timestamp(when) - landmark) / tau), artifact_id)
+            if index % 5000 == 0:
+                pipe.execute()
+        pipe.execute()
+        return landmark
+
+    def record(self, artifact_id, kind, when=None):
+        landmark = self._landmark()
+        increment = _weights()[kind] * math.exp((_timestamp(when) - landmark) / _tau())
+        self._redis.zincrby(self.KEY, increment, str(artifact_id))
+        self._records += 1
+        if self._records % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """점수가 낮은 유물을 정리해 sorted set 크기를 상위 K 의 PRUNE_KEEP_FACTOR 배로 유지"""
+        self._redis.zremrangebyrank(self.KEY, 0, -(self._top_k * PRUNE_KEEP_FACTOR) - 1)
+
+    def discard(self, artifact_id):
+        self._redis.zrem(self.KEY, str(artifact_id))
+
+    def top(self, limit):
+        landmark = self._landmark()
+        decay = math.exp((landmark - time.time()) / _tau())
+        rows = self._redis.zrevrange(self.KEY, 0, min(limit, self._top_k) - 1, withscores=True)
+        return [(member.decode(), score * decay) for member, score in rows]
+
+    def reset(self):
+        self._redis.delete(self.KEY, self.LANDMARK_KEY)
+
+
+_trending = None
+_trending_lock = threading.Lock()
+
+
+def get_trending():
+    """설정에 맞는 인기 유물 인스턴스 (프로세스당 하나)"""
+    global _trending
+    if _trending is None:
+        with _trending_lock:
+            if _trending is None:
+                redis_url = getattr(settings, 'TRENDING_REDIS_URL', None)
+                top_k = getattr(settings, 'TRENDING_TOP_K', 100)
+                if redis_url:
+                    _trending = RedisTrending(redis_url, top_k)
+                else:
+                    _trending = InProcessTrending(top_k, getattr(settings, 'TRENDING_REBUILD_SECONDS', 600))
+    return _trending
@@ -4,11 +4,19 @@ from .views import (
     artifact_detail_view,
     artifact_update_view,
     artifact_feeds_view,
+    artifact_nearby_view,
+    artifact_trending_view,
+    artifact_batch_view,
+    artifact_export_view,
 )
 
 urlpatterns = [
     path('', artifact_list_view, name='artifact-list'),  # 유물 목록 조회
+    path('nearby/', artifact_nearby_view, name='artifact-nearby'),  # 위치 기반 유물 조회
+    path('trending/', artifact_trending_view, name='artifact-trending'),  # 인기 유물 조회
+    path('batch/', artifact_batch_view, name='artifact-batch'),  # 여러 유물 일괄 조회
     path('<uuid:artifact_id>/', artifact_detail_view, name='artifact-detail'),  # 유물 상세 조회
     path('<uuid:artifact_id>/update/', artifact_update_view, name='artifact-update'),  # 유물 정보 수정
     path('<uuid:artifact_id>/feeds/', artifact_feeds_view, name='artifact-feeds'),  # 유물 관련 피드 조회
+    path('<uuid:artifact_id>/export/', artifact_export_view, name='artifact-export'),  # 유물 사진/모델 ZIP 내보내기
 ]
\ No newline at end of file
@@ -1,4 +1,7 @@
+import uuid
+
 from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch, Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -6,6 +9,14 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from .models import Artifact, ArtifactFeed
 from .serializers import ArtifactSerializer, ArtifactDetailSerializer
 from feeds.serializers import FeedSerializer
+from core.pagination import InvalidCursor, approximate_count, keyset_page, parse_page_size
+from core.geo import bounding_box, covering_prefixes, haversine_km
+from core.batch import TooManyIds, batch_payload, parse_ids
+from core.serializers import eager_load, shaped
+from core.zipstream import zip_response
+from .export import export_filename, export_stream, parse_include
+from .trending import get_trending
+from feeds.models import Feed
 
 @api_view(['GET'])
 def artifact_list_view(request):
@@ -23,19 +34,123 @@ def artifact_list_view(request):
         # 특정 상태의 유물만 조회
         artifacts = Artifact.objects.filter(status=status_filter).order_by('-created_at')
     
-    serializer = ArtifactSerializer(artifacts, many=True)
+    serializer = shaped(ArtifactSerializer, request, artifacts, many=True)
     return Response(serializer.data)
 
+@api_view(['GET'])
+def artifact_nearby_view(request):
+    """
+    위치 기반 유물 조회
+    ?lat=&lng=&radius_km= (반경) 또는 ?bbox=min_lat,min_lng,max_lat,max_lng (사각형)
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+        bbox = request.query_params.get('bbox')
+        if bbox:
+            min_lat, min_lng, max_lat, max_lng = (float(value) for value in bbox.split(','))
+            center = None
+        else:
+            lat = float(request.query_params['lat'])
+            lng = float(request.query_params['lng'])
+            radius_km = min(float(request.query_params.get('radius_km', 5)), 500)
+            center = (lat, lng)
+    except (KeyError, ValueError):
+        return Response(
+            {"detail": "lat, lng (radius_km) 또는 bbox=min_lat,min_lng,max_lat,max_lng 가 필요합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    serializer = shaped(ArtifactSerializer, request, many=True)
+    artifacts = eager_load(serializer, Artifact.objects.exclude(status='rejected'))
+    
+    if center is None:
+        # 사각형: 위경도 인덱스 범위 조회 (날짜 변경선을 넘는 경우 경도 조건 분리)
+        artifacts = artifacts.filter(latitude__range=(min_lat, max_lat))
+        if min_lng <= max_lng:
+            artifacts = artifacts.filter(longitude__range=(min_lng, max_lng))
+        else:
+            artifacts = artifacts.filter(Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng))
+        results = [(artifact, None) for artifact in artifacts.order_by('-image_count')[:limit]]
+    else:
+        # 반경: geohash 접두어로 후보를 좁힌 뒤 정확한 거리로 필터링
+        prefix_filter = Q()
+        for prefix in covering_prefixes(lat, lng, radius_km):
+            prefix_filter |= Q(geohash__startswith=prefix)
+        box = bounding_box(lat, lng, radius_km)
+        candidates = artifacts.filter(prefix_filter, latitude__range=(box[0], box[2]))
+        results = []
+        for artifact in candidates.iterator(chunk_size=2000):  # eager_load 의 prefetch 는 청크 단위로 실행
+            distance = haversine_km(lat, lng, artifact.latitude, artifact.longitude)
+            if distance <= radius_km:
+                results.append((artifact, distance))
+        results.sort(key=lambda item: item[1])
+        results = results[:limit]
+    
+    serializer.instance = [artifact for artifact, _ in results]
+    data = serializer.data
+    for item, (_, distance) in zip(data, results):
+        item['distance_km'] = round(distance, 3) if distance is not None else None
+    return Response(data)
+
+@api_view(['GET'])
+def artifact_trending_view(request):
+    """
+    인기 유물 조회 (최근 피드 업로드/조회/3D 모델 완성의 시간 감쇠 점수순)
+    미리 유지되는 상위 K 개 목록에서 읽으므로 피드를 조회하지 않는다
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        return Response({"detail": "limit 은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(trending_artifacts(shaped(ArtifactSerializer, request, many=True), limit))
+
+def trending_artifacts(serializer, limit):
+    """인기 유물 상위 limit 개를 serializer(many=True) 로 직렬화 (trending_score 포함, 거부된 유물 제외)"""
+    # 다른 워커에서 삭제/거부되어 아직 목록에 남은 유물이 있어도 limit 개를 채우도록 여유 있게 조회
+    rows = get_trending().top(limit * 2)
+    artifacts = eager_load(serializer, Artifact.objects.exclude(status='rejected')).in_bulk(
+        [artifact_id for artifact_id, _ in rows]
+    )
+    results = [
+        (artifacts[artifact_id], score) for artifact_id, score in
+        ((uuid.UUID(artifact_id), score) for artifact_id, score in rows)
+        if artifact_id in artifacts
+    ][:limit]
+    
+    serializer.instance = [artifact for artifact, _ in results]
+    data = serializer.data
+    for item, (_, score) in zip(data, results):
+        item['trending_score'] = round(score, 4)
+    return data
+
+@api_view(['GET'])
+def artifact_batch_view(request):
+    """여러 유물 카드 정보를 한 번에 조회 (?ids=<id>,<id>,...)"""
+    try:
+        ids, invalid = parse_ids(request.query_params.get('ids'))
+    except TooManyIds as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = shaped(ArtifactSerializer, request, many=True)
+    artifacts = eager_load(serializer, Artifact.objects.all()).in_bulk(ids)
+    # 거부된 유물은 관리자만 조회 가능
+    is_visible = None if request.user.is_staff else (lambda artifact: artifact.status != 'rejected')
+    return Response(batch_payload(ids, invalid, artifacts, serializer, is_visible))
+
 @api_view(['GET'])
 def artifact_detail_view(request, artifact_id):
     """유물 상세 정보 조회"""
-    artifact = get_object_or_404(Artifact, id=artifact_id)
+    serializer = shaped(ArtifactDetailSerializer, request)
+    artifact = get_object_or_404(eager_load(serializer, Artifact.objects.all()), id=artifact_id)
     
     # 거부된 유물은 관리자만 조회 가능
     if artifact.status == 'rejected' and not request.user.is_staff:
         return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
     
-    serializer = ArtifactDetailSerializer(artifact)
+    if artifact.status != 'rejected':
+        get_trending().record(artifact.id, 'view')
+    serializer.instance = artifact
     return Response(serializer.data)
 
 @api_view(['PUT', 'PATCH'])
@@ -59,28 +174,58 @@ def artifact_feeds_view(request, artifact_id):
     if artifact.status == 'rejected' and not request.user.is_staff:
         return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
     
-    # 페이지네이션 파라미터
-    page_size = int(request.query_params.get('page_size', 10))
-    page = int(request.query_params.get('page', 1))
+    # 페이지네이션 파라미터 (커서 기반)
+    try:
+        page_size = parse_page_size(request.query_params.get('page_size'))
+    except ValueError:
+        return Response({"detail": "page_size 는 1 이상의 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    cursor = request.query_params.get('cursor')
     
-    # 유물과 연결된 피드 찾기
-    artifact_feeds = ArtifactFeed.objects.filter(artifact=artifact).select_related('feed')
+    # 유물과 연결된 피드 찾기 (요청한 필드에 필요한 관계만 미리 로드)
+    serializer = shaped(FeedSerializer, request, many=True)
+    artifact_feeds = ArtifactFeed.objects.filter(artifact=artifact)
     
-    # 페이지네이션 적용
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_feeds = artifact_feeds[start_idx:end_idx]
+    try:
+        page_items, next_cursor = keyset_page(
+            artifact_feeds.prefetch_related(Prefetch('feed', queryset=eager_load(serializer, Feed.objects.all()))),
+            cursor=cursor,
+            page_size=page_size,
+        )
+    except InvalidCursor as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
     # 피드 목록 추출 및 직렬화
-    feeds = [item.feed for item in paginated_feeds]
-    serializer = FeedSerializer(feeds, many=True)
+    serializer.instance = [item.feed for item in page_items]
     
     response_data = {
         'results': serializer.data,
-        'count': artifact_feeds.count(),
-        'page': page,
         'page_size': page_size,
-        'total_pages': (artifact_feeds.count() + page_size - 1) // page_size
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
     }
     
-    return Response(response_data)
\ No newline at end of file
+    # 전체 개수는 요청한 경우에만 (캐시/추정치 사용)
+    if request.query_params.get('include_count') in ('1', 'true'):
+        count, is_estimate = approximate_count(artifact_feeds, f'artifact_feeds_count:{artifact.id}')
+        response_data['count'] = count
+        response_data['count_is_estimate'] = is_estimate
+    
+    return Response(response_data)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def artifact_export_view(request, artifact_id):
+    """유물의 피드 사진, 원본 이미지, 3D 모델을 ZIP 으로 스트리밍 (Range 이어받기 지원)"""
+    artifact = get_object_or_404(Artifact, id=artifact_id)
+    
+    # 거부된 유물은 관리자만 조회 가능
+    if artifact.status == 'rejected' and not request.user.is_staff:
+        return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        include = parse_include(request.query_params.get('include'))
+    except ValueError as e:
+        return Response({"detail": f"알 수 없는 include 값입니다: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # 비공개 피드와 미완료 모델은 관리자만 포함
+    stream = export_stream(artifact, include, include_unpublished=request.user.is_staff)
+    return zip_response(request, stream, export_filename(artifact))
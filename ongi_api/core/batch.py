@@ -0,0 +1,56 @@
+import uuid
+
+from django.conf import settings
+
+
+def max_batch_ids():
+    return getattr(settings, 'BATCH_MAX_IDS', 100)
+
+
+class TooManyIds(ValueError):
+    pass
+
+
+def parse_ids(value):
+    """
+    쉼표로 구분된 id 목록 파싱 (요청 순서 유지, 중복 제거)
+    반환: (UUID 목록, 유효하지 않은 원본 문자열 목록)
+    """
+    raw_ids = [part.strip() for part in (value or '').split(',') if part.strip()]
+    if len(raw_ids) > max_batch_ids():
+        raise TooManyIds(f'한 번에 최대 {max_batch_ids()}개까지 조회할 수 있습니다.')
+
+    ids, invalid, seen = [], [], set()
+    for raw in raw_ids:
+        try:
+            object_id = uuid.UUID(raw)
+        except ValueError:
+            invalid.append(raw)
+            continue
+        if object_id not in seen:
+            seen.add(object_id)
+            ids.append(object_id)
+    return ids, invalid
+
+
+def batch_payload(ids, invalid, objects, serializer, is_visible=None):
+    """
+    in_bulk 결과를 요청 순서대로 직렬화하고, 찾지 못한 id 는 항목별로 missing 에 기록
+    serializer 는 시리얼라이저 클래스 또는 many=True 로 만든 인스턴스
+    is_visible 이 False 를 반환한 객체도 존재를 드러내지 않도록 missing 으로 처리한다
+    """
+    found = []
+    missing = [{'id': raw, 'detail': '유효하지 않은 ID입니다.'} for raw in invalid]
+    for object_id in ids:
+        obj = objects.get(object_id)
+        if obj is None or (is_visible is not None and not is_visible(obj)):
+            missing.append({'id': str(object_id), 'detail': '찾을 수 없습니다.'})
+        else:
+            found.append(obj)
+    if isinstance(serializer, type):
+        serializer = serializer(many=True)
+    serializer.instance = found
+    return {
+        'results': serializer.data,
+        'missing': missing,
+    }
@@ -0,0 +1,56 @@
+import itertools
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# 복제본으로 읽기를 보낼 수 있는 앱 (GET 엔드포인트 기준)
+REPLICA_READ_APPS = {'feeds', 'artifacts', 'model3d'}
+
+# 현재 요청이 복제본 읽기 대상인지 여부
+replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+# 요청 중 쓰기가 발생하면 이후 읽기는 primary 로 고정 (read-your-writes)
+pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+# 요청에서 처음 고른 복제본 (요청 안의 읽기는 같은 복제본을 사용해 복제 지연이 섞이지 않게 함)
+request_replica = ContextVar('request_replica', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+
+class ReadReplicaRouter:
+    """
+    feeds/artifacts/model3d 의 GET 요청 읽기는 복제본으로, 그 외 읽기와 모든 쓰기는 primary 로 보내는 라우터
+    복제본은 요청마다 돌아가며 하나를 골라 그 요청 동안 재사용한다
+    복제본이 설정되지 않은 환경에서는 항상 primary 를 사용한다
+    """
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+
+    def db_for_read(self, model, **hints):
+        if (
+            self._cycle is not None
+            and replica_reads_allowed.get()
+            and not pinned_to_primary.get()
+            and model._meta.app_label in REPLICA_READ_APPS  # 인증 토큰 등 users 읽기는 primary 유지
+        ):
+            replica = request_replica.get()
+            if replica is None:
+                replica = next(self._cycle)
+                request_replica.set(replica)
+            return replica
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        pinned_to_primary.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary 와 같은 데이터이므로 별칭이 달라도 관계 허용
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,239 @@
+import asyncio
+import collections
+import itertools
+import json
+import queue
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+
+REPLAY_BUFFER_SIZE = 500  # Last-Event-ID 재전송용 최근 이벤트 수
+SUBSCRIBER_QUEUE_SIZE = 100  # 느린 구독자의 대기 이벤트 한도 (초과 시 오래된 것부터 버림)
+
+
+class Event:
+    __slots__ = ('id', 'topic', 'type', 'data', 'staff_only')
+
+    def __init__(self, id, topic, type, data, staff_only=False):
+        self.id = id
+        self.topic = topic
+        self.type = type
+        self.data = data
+        self.staff_only = staff_only  # 관리자 구독자에게만 전달 (완료되지 않은 모델 등)
+
+    def encode(self):
+        """SSE 메시지 형식"""
+        payload = json.dumps({'topic': self.topic, **self.data}, cls=DjangoJSONEncoder, ensure_ascii=False)
+        return f'id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n'
+
+
+class Subscription:
+    """
+    구독자 하나의 이벤트 대기열
+    동기 뷰는 get(), ASGI 스트림은 aget() 으로 기다린다
+    """
+
+    def __init__(self, broker, topics, staff=False):
+        self.broker = broker
+        self.topics = frozenset(topics)
+        self.staff = staff
+        self.replayed_through = 0  # 재전송으로 이미 넣은 마지막 이벤트 id (실시간 수신분과 중복 방지)
+        self._queue = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._lock = threading.Lock()  # 동기 대기열 -> 이벤트 루프 전환과 put 사이의 경합 방지
+        self._loop = None
+        self._async_queue = None
+
+    def accepts(self, event):
+        return event.topic in self.topics and (self.staff or not event.staff_only)
+
+    def put(self, event):
+        with self._lock:
+            loop = self._loop
+            if loop is None:
+                while True:
+                    try:
+                        self._queue.put_nowait(event)
+                        return
+                    except queue.Full:
+                        try:
+                            self._queue.get_nowait()
+                        except queue.Empty:
+                            pass
+        loop.call_soon_threadsafe(self._put_async, event)
+
+    def _put_async(self, event):
+        if self._async_queue.full():
+            self._async_queue.get_nowait()
+        self._async_queue.put_nowait(event)
+
+    def get(self, timeout):
+        """이벤트 또는 타임아웃 시 None"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout):
+        if self._async_queue is None:
+            with self._lock:
+                self._async_queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+                self._loop = asyncio.get_running_loop()
+                while not self._queue.empty():  # 전환 전에 쌓인 이벤트 이동
+                    self._put_async(self._queue.get_nowait())
+        try:
+            return await asyncio.wait_for(self._async_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    프로세스 내 pub/sub 브로커 (테스트, 단일 워커용)
+    최근 이벤트를 보관해 재연결한 클라이언트에 놓친 이벤트를 다시 보낸다
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+        self._recent = collections.deque(maxlen=REPLAY_BUFFER_SIZE)
+
+    def publish(self, topics, type, data, staff_only=False):
+        with self._lock:
+            self._dispatch(next(self._ids), topics, type, data, staff_only)
+
+    def _dispatch(self, event_id, topics, type, data, staff_only=False):
+        # self._lock 을 잡은 상태에서 호출 (put 은 대기하지 않음)
+        events = [Event(event_id, topic, type, data, staff_only) for topic in topics]
+        self._recent.extend(events)
+        for event in events:
+            for subscription in self._subscribers:
+                if subscription.accepts(event) and event.id > subscription.replayed_through:
+                    subscription.put(event)
+
+    def subscribe(self, topics, last_event_id=None, staff=False):
+        subscription = Subscription(self, topics, staff)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                for event in self._recent:
+                    if event.id > last_event_id and subscription.accepts(event):
+                        subscription.put(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Redis pub/sub 으로 워커 간 이벤트 전달
+    EVENTS_REDIS_URL 설정 시 사용하며 redis 패키지가 필요하다
+    이벤트 id 는 Redis 카운터로 매기고 최근 이벤트는 sorted set 에 보관해, 어느 워커에 다시 연결해도 Last-Event-ID 로 이어 받는다
+    워커마다 리스너 스레드 하나가 받은 이벤트를 로컬 구독자에게 나눠준다
+    """
+    CHANNEL = 'ongi:events'
+    SEQ_KEY = 'ongi:events:seq'
+    RECENT_KEY = 'ongi:events:recent'
+    # id 발급, 재전송 보관, 발행을 원자적으로 처리해 id 순서와 발행 순서를 맞춘다
+    PUBLISH_SCRIPT = """
+        local id = redis.call('INCR', KEYS[1])
+        local message = id .. ':' .. ARGV[1]
+        redis.call('ZADD', KEYS[2], id, message)
+        redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[2]) - 1)
+        redis.call('PUBLISH', ARGV[3], message)
+        return id
+    """
+
+    def __init__(self, url):
+        import redis
+
+        super().__init__()
+        self._redis = redis.Redis.from_url(url)
+        self._publish = self._redis.register_script(self.PUBLISH_SCRIPT)
+        self._listener = None
+
+    def publish(self, topics, type, data, staff_only=False):
+        payload = json.dumps(
+            {'topics': list(topics), 'type': type, 'data': data, 'staff_only': staff_only}, cls=DjangoJSONEncoder,
+        )
+        self._publish(keys=[self.SEQ_KEY, self.RECENT_KEY], args=[payload, REPLAY_BUFFER_SIZE, self.CHANNEL])
+
+    @staticmethod
+    def _decode(message):
+        """'id:json' 메시지를 (id, payload) 로 (형식이 다르면 None)"""
+        try:
+            event_id, payload = message.decode().split(':', 1)
+            return int(event_id), json.loads(payload)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def subscribe(self, topics, last_event_id=None, staff=False):
+        self._ensure_listener()
+        subscription = Subscription(self, topics, staff)
+        with self._lock:
+            # 등록과 재전송 사이에 리스너가 끼어들지 않도록 잠금 안에서 처리
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                for message in self._redis.zrangebyscore(self.RECENT_KEY, f'({last_event_id}', '+inf'):
+                    decoded = self._decode(message)
+                    if decoded is None:
+                        continue
+                    event_id, payload = decoded
+                    for topic in payload['topics']:
+                        event = Event(event_id, topic, payload['type'], payload['data'], payload.get('staff_only', False))
+                        if subscription.accepts(event):
+                            subscription.put(event)
+                    subscription.replayed_through = event_id
+        return subscription
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(target=self._listen, name='events-redis-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.CHANNEL)
+        for message in pubsub.listen():
+            decoded = self._decode(message['data'])
+            if decoded is None:
+                continue
+            event_id, payload = decoded
+            with self._lock:
+                self._dispatch(
+                    event_id, payload['topics'], payload['type'], payload['data'], payload.get('staff_only', False),
+                )
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """설정에 맞는 브로커 인스턴스 (프로세스당 하나)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                redis_url = getattr(settings, 'EVENTS_REDIS_URL', None)
+                _broker = RedisBroker(redis_url) if redis_url else InProcessBroker()
+    return _broker
+
+
+def publish_on_commit(topics, type, data, staff_only=False):
+    """트랜잭션 커밋 후 이벤트 발행 (롤백되면 발행하지 않음)"""
+    transaction.on_commit(lambda: get_broker().publish(topics, type, data, staff_only))
@@ -0,0 +1,82 @@
+"""
+직렬화 결과 조각 캐시의 객체 버전 관리
+객체마다 무작위 버전 토큰을 두고 조각 키에 포함시켜, 객체나 선언된 의존 객체가 바뀌면
+토큰만 새로 발급해 그 객체의 모든 조각(시리얼라이저/필드 구성별)을 한 번에 무효화한다
+버전 키가 캐시에서 밀려나도 새 토큰이 발급되므로 오래된 조각이 되살아나지 않는다
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+def fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def fragments_enabled():
+    return getattr(settings, 'FRAGMENT_CACHE_ENABLED', True)
+
+
+def fragment_timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600)
+
+
+def _version_key(model, pk):
+    return f'frag:v:{model._meta.label_lower}:{pk}'
+
+
+def get_versions(model, pks):
+    """{pk: 버전 토큰} (없으면 새로 발급)"""
+    cache = fragment_cache()
+    keys = {_version_key(model, pk): pk for pk in pks}
+    found = cache.get_many(list(keys))
+    missing = {key: uuid.uuid4().hex[:12] for key in keys if key not in found}
+    if missing:
+        # 다른 프로세스가 먼저 발급했으면 그 값을 사용
+        for key, token in missing.items():
+            if not cache.add(key, token, None):
+                token = cache.get(key, token)
+            found[key] = token
+    return {pk: found[key] for key, pk in keys.items()}
+
+
+def bump(model, pks):
+    """
+    객체들의 조각 무효화 (커밋 후 새 버전 토큰 발급)
+    커밋 전에 발급하면 다른 요청이 이전 데이터로 새 버전 조각을 만들 수 있다
+    """
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        transaction.on_commit(
+            lambda: fragment_cache().set_many({_version_key(model, pk): uuid.uuid4().hex[:12] for pk in pks}, None)
+        )
+
+
+def shape_hash(*parts):
+    return hashlib.sha1('\0'.join(map(str, parts)).encode()).hexdigest()[:12]
+
+
+def register(serializer_class):
+    """
+    Meta.model 과 Meta.fragment_dependencies({의존 모델: instance -> 대상 pk 목록}) 의
+    저장/삭제 시 대상 객체 조각을 무효화하도록 시그널 연결
+    """
+    meta = serializer_class.Meta
+    target = meta.model
+    dependencies = [(target, _self_pk, 'self')]
+    dependencies += [(source, resolve, id(resolve)) for source, resolve in getattr(meta, 'fragment_dependencies', {}).items()]
+    for source, resolve, name in dependencies:
+        def invalidate(sender, instance, resolve=resolve, **kwargs):
+            bump(target, list(resolve(instance)))
+
+        uid = f'fragments:{target._meta.label_lower}:{source._meta.label_lower}:{name}'
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate, sender=source, weak=False, dispatch_uid=uid)
+
+
+def _self_pk(instance):
+    return [instance.pk]
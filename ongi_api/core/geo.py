@@ -0,0 +1,118 @@
+import math
+
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # 약 5m 셀
+EARTH_RADIUS_KM = 6371.0088
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash):
+    """(min_lat, min_lng, max_lat, max_lng)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            target = lng_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if value >> shift & 1:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def covering_prefixes(lat, lng, radius_km):
+    """
+    중심 셀과 주변 8개 셀의 geohash 접두어
+    셀의 짧은 변이 반경 이상인 가장 정밀한 단계를 골라 원 전체를 덮는다
+    """
+    km_per_degree = math.pi * EARTH_RADIUS_KM / 180
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        center = geohash_encode(lat, lng, precision)
+        min_lat, min_lng, max_lat, max_lng = geohash_bounds(center)
+        d_lat, d_lng = max_lat - min_lat, max_lng - min_lng
+        cos_lat = math.cos(math.radians(min(abs(lat) + d_lat, 90.0)))
+        if min(d_lat * km_per_degree, d_lng * km_per_degree * cos_lat) >= radius_km:
+            break
+    else:
+        return ['']  # 반경이 가장 큰 셀보다 크면 전체 검색
+
+    prefixes = set()
+    for row in (-1, 0, 1):
+        for col in (-1, 0, 1):
+            n_lat = lat + row * d_lat
+            if not -90 <= n_lat <= 90:
+                continue
+            n_lng = (lng + col * d_lng + 180) % 360 - 180
+            prefixes.add(geohash_encode(n_lat, n_lng, precision))
+    return sorted(prefixes)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius_km):
+    """반경을 감싸는 위경도 사각형 (min_lat, min_lng, max_lat, max_lng)"""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    d_lng = min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return max(lat - d_lat, -90.0), lng - d_lng, min(lat + d_lat, 90.0), lng + d_lng
+
+
+def _to_degrees(value, ref):
+    degrees, minutes, seconds = (float(part) for part in value)
+    result = degrees + minutes / 60 + seconds / 3600
+    return -result if ref in ('S', 'W') else result
+
+
+def exif_gps(image_file):
+    """
+    이미지 EXIF 에서 GPS 좌표 추출 (파일 경로 또는 파일 객체)
+    반환: {'lat': float, 'lng': float} 또는 None
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(image_file) as image:
+            gps = image.getexif().get_ifd(0x8825)  # GPSInfo
+    except (OSError, ValueError, SyntaxError):
+        return None
+    finally:
+        if hasattr(image_file, 'seek'):
+            image_file.seek(0)
+
+    try:
+        lat = _to_degrees(gps[2], gps.get(1, 'N'))
+        lng = _to_degrees(gps[4], gps.get(3, 'E'))
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or (lat == 0 and lng == 0):
+        return None
+    return {'lat': lat, 'lng': lng}
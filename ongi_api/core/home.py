@@ -0,0 +1,161 @@
+"""
+홈 화면 묶음 응답 (GET /api/home/)
+사용자 정보, 완료된 3D 모델, 인기 유물, 최근 피드를 한 번의 요청으로 반환한다
+섹션은 서로 독립이므로 공유 스레드 풀에서 동시에 조회하고, 섹션마다 제한 시간을 둔다
+실패하거나 시간을 넘긴 섹션은 null 로 두고 errors 에 이유를 담아 나머지 섹션은 그대로 반환한다
+시간을 넘긴 섹션도 스레드는 끝날 때까지 쓰이므로, 풀에 걸린 섹션 수가 HOME_MAX_IN_FLIGHT 에 이르면
+새 섹션은 대기열에 넣지 않고 바로 'busy' 로 응답한다 (ongi_home_sections_in_flight 메트릭으로 확인)
+"""
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from artifacts.serializers import ArtifactSerializer
+from artifacts.views import trending_artifacts
+from feeds.models import Feed
+from feeds.serializers import FeedSerializer
+from model3d.models import Model3D
+from model3d.serializers import Model3DSerializer
+from users.views import UserBatchSerializer
+from .metrics import registry
+from .serializers import eager_load
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HOME_LIMIT = 10
+MAX_HOME_LIMIT = 50
+
+
+# 섹션 시리얼라이저는 요청의 fields/expand 와 관계없이 고정된 형태로 만든다 (context 에 request 를 넣지 않음)
+def _user_section(user, limit):
+    return UserBatchSerializer(user).data
+
+
+def _models_section(user, limit):
+    serializer = Model3DSerializer(many=True)
+    serializer.instance = eager_load(serializer, Model3D.objects.filter(status='completed').order_by('-created_at'))[:limit]
+    return serializer.data
+
+
+def _artifacts_section(user, limit):
+    return trending_artifacts(ArtifactSerializer(many=True), limit)
+
+
+def _feeds_section(user, limit):
+    serializer = FeedSerializer(many=True)
+    serializer.instance = eager_load(serializer, Feed.objects.filter(status='published').order_by('-created_at'))[:limit]
+    return serializer.data
+
+
+SECTIONS = {
+    'user': _user_section,
+    'models': _models_section,
+    'artifacts': _artifacts_section,
+    'feeds': _feeds_section,
+}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = 0  # 풀에 제출된 뒤 아직 끝나지 않은 섹션 수 (제한 시간을 넘겨 버려진 섹션 포함)
+_rejected = 0  # 풀이 가득 차 바로 'busy' 로 응답한 섹션 수
+
+
+def get_executor():
+    """섹션 조회용 스레드 풀 (프로세스당 하나, HOME_WORKERS 가 0 이면 None)"""
+    global _executor
+    workers = getattr(settings, 'HOME_WORKERS', 8)
+    if workers <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='home-section')
+    return _executor
+
+
+def _reserve():
+    """풀에 섹션 하나를 제출할 자리가 있으면 차지하고 True"""
+    global _in_flight, _rejected
+    with _executor_lock:
+        if _in_flight >= getattr(settings, 'HOME_MAX_IN_FLIGHT', 32):
+            _rejected += 1
+            return False
+        _in_flight += 1
+        return True
+
+
+def _release(future):
+    global _in_flight
+    with _executor_lock:
+        _in_flight -= 1
+
+
+registry.register_gauge('ongi_home_sections_in_flight', '홈 화면 스레드 풀에 걸린 섹션 수', lambda: _in_flight)
+registry.register_gauge(
+    'ongi_home_sections_rejected_total', '홈 화면 풀이 가득 차 건너뛴 섹션 수', lambda: _rejected, kind='counter',
+)
+
+
+def _run_section(section, user, limit):
+    # 작업 스레드의 DB 연결도 요청 처리와 같이 CONN_MAX_AGE/상태 확인 규칙으로 정리
+    close_old_connections()
+    try:
+        return section(user, limit)
+    finally:
+        close_old_connections()
+
+
+def section_timeout(name):
+    timeouts = getattr(settings, 'HOME_SECTION_TIMEOUTS', {})
+    return timeouts.get(name, getattr(settings, 'HOME_SECTION_TIMEOUT', 2.0))
+
+
+def build_home(user, names, limit):
+    """
+    섹션 이름 목록을 조회해 (섹션별 데이터, 섹션별 오류) 반환
+    제한 시간은 모든 섹션을 동시에 제출한 시점부터 잰다 (응답 시간은 가장 긴 제한 시간을 넘지 않음)
+    """
+    executor = get_executor()
+    data, errors = {}, {}
+    if executor is None:
+        # 동시 실행 없이 순서대로 조회 (오류 격리만 적용)
+        for name in names:
+            try:
+                data[name] = SECTIONS[name](user, limit)
+            except Exception:
+                logger.exception('홈 섹션 조회 실패: %s', name)
+                data[name], errors[name] = None, 'error'
+        return data, errors
+
+    started = time.monotonic()
+    futures = {}
+    for name in names:
+        if not _reserve():
+            data[name], errors[name] = None, 'busy'
+            continue
+        # 복제본 읽기 고정 여부 등 요청의 contextvar 를 작업 스레드에도 전달
+        future = executor.submit(contextvars.copy_context().run, _run_section, SECTIONS[name], user, limit)
+        future.add_done_callback(_release)  # 끝나거나 취소되면 자리 반환
+        futures[name] = future
+    if errors:
+        logger.warning('홈 섹션 풀이 가득 차 건너뜀: %s', ', '.join(errors))
+    for name, future in futures.items():
+        try:
+            data[name] = future.result(timeout=max(0, started + section_timeout(name) - time.monotonic()))
+        except TimeoutError:
+            # 실행 중인 스레드는 멈출 수 없으므로 결과만 버림 (아직 대기 중이면 취소)
+            future.cancel()
+            logger.warning('홈 섹션 제한 시간 초과: %s', name)
+            data[name], errors[name] = None, 'timeout'
+        except Exception:
+            logger.exception('홈 섹션 조회 실패: %s', name)
+            data[name], errors[name] = None, 'error'
+    return data, errors
@@ -0,0 +1,161 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from users.models import User, CustomToken
+from feeds.models import Feed
+from artifacts.models import Artifact
+from model3d.models import Model3D
+from core.middleware import QueryCounter
+
+
+def percentile(values, q):
+    """정렬된 목록에서 최근접 순위 분위수"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = '실제 URL 라우트를 동시 클라이언트로 호출해 엔드포인트별 지연 시간과 쿼리 수를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='엔드포인트당 요청 수')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='측정할 엔드포인트 이름 (반복 가능)')
+        parser.add_argument('--base-url', help='실행 중인 서버 주소 (생략 시 프로세스 내 테스트 클라이언트 사용)')
+        parser.add_argument('--username', help='인증에 사용할 관리자 사용자명 (생략 시 첫 관리자)')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+
+    def handle(self, *args, **options):
+        token = self._token(options['username'])
+        endpoints = self._endpoints()
+        if options['endpoints']:
+            endpoints = {name: endpoints[name] for name in options['endpoints'] if name in endpoints}
+        if not endpoints:
+            raise CommandError('측정할 엔드포인트가 없습니다. generate_dataset 으로 데이터를 먼저 생성하세요.')
+
+        base_url = options['base_url']
+        results = []
+        for name, url in endpoints.items():
+            if base_url:
+                samples = self._run_http(base_url.rstrip('/') + url, token, options)
+            else:
+                samples = self._run_local(url, token, options)
+            results.append(self._summarize(name, url, samples))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
+        else:
+            self._print_table(results)
+
+    def _token(self, username):
+        users = User.objects.filter(is_staff=True)
+        if username:
+            users = users.filter(username=username)
+        user = users.order_by('date_joined').first()
+        if user is None:
+            raise CommandError('벤치마크에 사용할 관리자(is_staff) 사용자가 없습니다.')
+        token, _ = CustomToken.objects.get_or_create(user=user)
+        return token.key
+
+    def _endpoints(self):
+        """대표 객체를 골라 측정할 URL 목록 구성"""
+        endpoints = {
+            'feed-list': '/api/feeds/',
+            'my-feeds': '/api/feeds/my-feeds/',
+            'artifact-list': '/api/artifacts/?status=all',
+            'model3d-list': '/api/models/',
+        }
+        feed = Feed.objects.filter(status='published').order_by('-created_at').first()
+        if feed:
+            endpoints['feed-detail'] = f'/api/feeds/{feed.id}/'
+            endpoints['user-info'] = f'/api/users/{feed.user_id}/'
+        artifact = Artifact.objects.order_by('-image_count').first()
+        if artifact:
+            endpoints['artifact-detail'] = f'/api/artifacts/{artifact.id}/'
+            endpoints['artifact-feeds'] = f'/api/artifacts/{artifact.id}/feeds/'
+            endpoints['artifact-models'] = f'/api/models/artifacts/{artifact.id}/'
+        model = Model3D.objects.filter(status='completed').first()
+        if model:
+            endpoints['model3d-detail'] = f'/api/models/{model.id}/'
+        return endpoints
+
+    def _run_local(self, url, token, options):
+        def worker(count):
+            client = Client(HTTP_AUTHORIZATION=f'Token {token}')
+            samples = []
+            try:
+                for _ in range(count):
+                    counter = QueryCounter()
+                    start = time.perf_counter()
+                    with ExitStack() as stack:
+                        for alias in connections:
+                            stack.enter_context(connections[alias].execute_wrapper(counter))
+                        response = client.get(url)
+                    samples.append((time.perf_counter() - start, counter.count, response.status_code))
+            finally:
+                connections.close_all()
+            return samples
+
+        return self._fan_out(worker, options)
+
+    def _run_http(self, url, token, options):
+        def worker(count):
+            samples = []
+            for _ in range(count):
+                request = urllib.request.Request(url, headers={'Authorization': f'Token {token}'})
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request) as response:
+                        response.read()
+                        status_code = response.status
+                except urllib.error.HTTPError as error:
+                    status_code = error.code
+                samples.append((time.perf_counter() - start, None, status_code))
+            return samples
+
+        return self._fan_out(worker, options)
+
+    def _fan_out(self, worker, options):
+        concurrency = max(1, options['concurrency'])
+        total = options['requests']
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return [sample for samples in pool.map(worker, shares) for sample in samples]
+
+    def _summarize(self, name, url, samples):
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        queries = [sample[1] for sample in samples if sample[1] is not None]
+        errors = sum(1 for sample in samples if sample[2] >= 400)
+        return {
+            'endpoint': name,
+            'url': url,
+            'requests': len(samples),
+            'errors': errors,
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'queries_avg': sum(queries) / len(queries) if queries else None,
+            'queries_max': max(queries) if queries else None,
+        }
+
+    def _print_table(self, results):
+        header = f"{'endpoint':<18}{'reqs':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q avg':>8}{'q max':>7}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in results:
+            q_avg = f"{row['queries_avg']:.1f}" if row['queries_avg'] is not None else '-'
+            q_max = str(row['queries_max']) if row['queries_max'] is not None else '-'
+            self.stdout.write(
+                f"{row['endpoint']:<18}{row['requests']:>6}{row['errors']:>5}"
+                f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{q_avg:>8}{q_max:>7}"
+            )
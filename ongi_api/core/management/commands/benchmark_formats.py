@@ -0,0 +1,93 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from users.models import User, CustomToken
+from core.parsers import _msgpack_ext_hook
+from core.renderers import CBORRenderer, MessagePackRenderer
+
+
+def _formats():
+    """(이름, 렌더러, 디코딩 함수) 목록 (설치된 패키지만)"""
+    formats = [('json', JSONRenderer(), json.loads)]
+    try:
+        import msgpack
+    except ImportError:
+        pass
+    else:
+        formats.append(('msgpack', MessagePackRenderer(), lambda data: msgpack.unpackb(
+            data, raw=False, timestamp=3, ext_hook=_msgpack_ext_hook,
+        )))
+    try:
+        import cbor2
+    except ImportError:
+        pass
+    else:
+        formats.append(('cbor', CBORRenderer(), cbor2.loads))
+    return formats
+
+
+class Command(BaseCommand):
+    help = '피드/유물 목록 응답을 JSON, MessagePack, CBOR 로 인코딩해 크기와 인코딩/디코딩 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='형식별 인코딩/디코딩 반복 횟수 (중앙값 사용)')
+        parser.add_argument('--rows', type=int, help='목록 앞에서 이 수만큼만 사용')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON 으로 출력')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_staff=True).order_by('date_joined').first()
+        if user is None:
+            raise CommandError('벤치마크에 사용할 관리자(is_staff) 사용자가 없습니다.')
+        token, _ = CustomToken.objects.get_or_create(user=user)
+        client = Client(HTTP_AUTHORIZATION=f'Token {token.key}', HTTP_ACCEPT='application/json')
+
+        formats = _formats()
+        if len(formats) == 1:
+            self.stderr.write('msgpack / cbor2 패키지가 없어 JSON 만 측정합니다.')
+        results = []
+        for name, url in (('feed-list', '/api/feeds/'), ('artifact-list', '/api/artifacts/?status=all')):
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{url} 응답 {response.status_code}')
+            # 렌더러가 받는 것과 같은 시리얼라이저 출력 (바이너리 렌더러는 serializer 의 필드 타입으로 변환)
+            data = ReturnList(response.data[:options['rows']], serializer=response.data.serializer)
+            for format_name, renderer, decode in formats:
+                results.append(self._measure(name, len(data), format_name, renderer, decode, data, options['repeat']))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, ensure_ascii=False, indent=2))
+            return
+        self.stdout.write(f"{'endpoint':<14}{'rows':>6}  {'format':<8}{'bytes':>11}{'gzip':>10}{'ratio':>7}{'encode ms':>11}{'decode ms':>11}")
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:<14}{row['rows']:>6}  {row['format']:<8}{row['bytes']:>11}{row['gzip_bytes']:>10}"
+                f"{row['size_ratio']:>7.2f}{row['encode_ms']:>11.2f}{row['decode_ms']:>11.2f}"
+            )
+
+    def _measure(self, endpoint, rows, format_name, renderer, decode, data, repeat):
+        encode_times, decode_times = [], []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            payload = renderer.render(data)
+            encode_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            decode(payload)
+            decode_times.append(time.perf_counter() - start)
+        json_size = len(JSONRenderer().render(data))
+        return {
+            'endpoint': endpoint,
+            'rows': rows,
+            'format': format_name,
+            'bytes': len(payload),
+            'gzip_bytes': len(gzip.compress(payload, 6)),
+            'size_ratio': round(len(payload) / json_size, 3) if json_size else None,
+            'encode_ms': round(statistics.median(encode_times) * 1000, 3),
+            'decode_ms': round(statistics.median(decode_times) * 1000, 3),
+        }
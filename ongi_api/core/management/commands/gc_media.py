@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from core.media_gc import MediaGC
+
+
+class Command(BaseCommand):
+    help = 'DB 에서 참조하지 않는 MEDIA_ROOT 파일을 격리 후 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='이동/삭제 없이 대상만 출력')
+        parser.add_argument('--incremental', action='store_true', help='삭제 시그널로 기록된 후보만 검사')
+        parser.add_argument('--limit', type=int, help='증분 모드에서 처리할 최대 후보 수')
+        parser.add_argument('--rate', type=float, default=0, help='초당 최대 격리 파일 수 (0: 무제한)')
+        parser.add_argument('--grace-seconds', type=int, help='이 시간 내 수정된 파일은 건너뜀')
+        parser.add_argument('--quarantine-days', type=int, help='격리 보관 기간(일)')
+        parser.add_argument('--skip-purge', action='store_true', help='격리 기간이 지난 파일 삭제 생략')
+
+    def handle(self, *args, **options):
+        verbose = options['verbosity'] > 1 or options['dry_run']
+        gc = MediaGC(
+            dry_run=options['dry_run'],
+            rate=options['rate'],
+            grace_seconds=options['grace_seconds'],
+            log=self.stdout.write if verbose else None,
+        )
+        if not options['skip_purge']:
+            gc.purge_quarantine(options['quarantine_days'])
+        if options['incremental']:
+            gc.incremental(options['limit'])
+        else:
+            gc.full_scan()
+
+        stats = gc.stats
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}검사 {stats['scanned']}개, 격리 {stats['quarantined']}개 "
+            f"({stats['bytes'] / 1024 / 1024:.1f}MB), 만료 배치 삭제 {stats['purged']}개"
+        ))
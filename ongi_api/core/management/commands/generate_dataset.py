@@ -0,0 +1,198 @@
+import hashlib
+import io
+import os
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.media_layout import feed_image_path, versioned_name
+from users.models import User, rank_for_feed_count
+from feeds.models import Feed, FeedImage
+from artifacts.models import Artifact, ArtifactFeed
+from model3d.models import Model3D
+
+
+ARTIFACT_WORDS = [
+    '청자', '백자', '분청사기', '금동', '불상', '향로', '석탑', '범종', '와당', '토기',
+    '동경', '인장', '비석', '관모', '귀걸이', '허리띠', '갑옷', '화살촉', '거울', '병풍',
+]
+GENDERS = ['male', 'female', 'other', 'non-binary', 'prefer not to say']
+
+
+def _fake_jpeg():
+    """가짜 이미지 파일용 작은 JPEG 바이트 생성"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), (180, 150, 110)).save(buffer, format='JPEG', quality=60)
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = '벤치마크용 합성 데이터(사용자, 피드, 피드 이미지, 유물, 3D 모델)를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--feeds', type=int, default=10000)
+        parser.add_argument('--images-per-feed', type=int, default=3, help='피드당 평균 이미지 수')
+        parser.add_argument('--artifacts', type=int, default=500, help='유물명 종류 수')
+        parser.add_argument('--models', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--with-files', action='store_true', help='MEDIA_ROOT 에 가짜 이미지 파일 생성')
+        parser.add_argument('--prefix', default='bench', help='생성 사용자명/이메일 접두어')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.with_files = options['with_files']
+        self.image_bytes = _fake_jpeg()
+        self.image_digest = hashlib.sha256(self.image_bytes).hexdigest()  # 업로드와 같은 내용 해시 파일 이름용
+
+        if options['users'] <= 0 or options['artifacts'] <= 0:
+            raise CommandError('--users 와 --artifacts 는 1 이상이어야 합니다.')
+
+        started = time.monotonic()
+        user_ids = self._create_users(options['users'], options['prefix'])
+        artifacts = self._create_artifacts(options['artifacts'])
+        feed_counts, image_counts = self._create_feeds(
+            options['feeds'], options['images_per_feed'], user_ids, artifacts
+        )
+        self._finalize_users(user_ids, feed_counts)
+        completed = self._finalize_artifacts(artifacts, image_counts)
+        self._create_models(options['models'], completed)
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {time.monotonic() - started:.1f}초'))
+
+    def _log(self, label, done, total, started):
+        rate = done / max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f'{label}: {done}/{total} ({rate:,.0f} rows/s)')
+
+    def _create_users(self, count, prefix):
+        password = make_password('benchmark')  # 해싱 비용은 한 번만
+        run = uuid.uuid4().hex[:6]
+        user_ids = []
+        started = time.monotonic()
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for i in range(offset, min(offset + self.batch_size, count)):
+                user = User(
+                    id=uuid.uuid4(),
+                    username=f'{prefix}_{run}_{i}',
+                    email=f'{prefix}_{run}_{i}@example.com',
+                    password=password,
+                    gender=self.rng.choice(GENDERS),
+                )
+                batch.append(user)
+                user_ids.append(user.id)
+            User.objects.bulk_create(batch, batch_size=self.batch_size)
+            self._log('users', len(user_ids), count, started)
+        return user_ids
+
+    def _create_artifacts(self, count):
+        artifacts = []
+        for i in range(count):
+            name = f'{self.rng.choice(ARTIFACT_WORDS)} {self.rng.choice(ARTIFACT_WORDS)} {i}'
+            artifacts.append(Artifact(id=uuid.uuid4(), name=name, status='auto_generated'))
+        Artifact.objects.bulk_create(artifacts, batch_size=self.batch_size)
+        return artifacts
+
+    def _pick(self, population):
+        # 파레토 분포로 소수의 인기 항목에 데이터가 몰리도록 선택
+        index = int(self.rng.paretovariate(1.2)) - 1
+        return population[index % len(population)]
+
+    def _create_feeds(self, count, images_per_feed, user_ids, artifacts):
+        feed_counts = {}
+        image_counts = {}
+        done = 0
+        started = time.monotonic()
+        while done < count:
+            size = min(self.batch_size, count - done)
+            feeds, links, images = [], [], []
+            for _ in range(size):
+                user_id = self._pick(user_ids)
+                artifact = self._pick(artifacts)
+                status = 'published' if self.rng.random() < 0.9 else self.rng.choice(['draft', 'hidden'])
+                feed = Feed(id=uuid.uuid4(), user_id=user_id, artifact_name=artifact.name, status=status)
+                feeds.append(feed)
+
+                n_images = max(1, int(self.rng.expovariate(1 / max(images_per_feed, 1))))
+                for order in range(n_images):
+                    images.append(FeedImage(
+                        id=uuid.uuid4(),
+                        feed_id=feed.id,
+                        image_url=self._write_feed_image(feed.id, order),
+                        order=order,
+                    ))
+                if status == 'published':
+                    feed_counts[user_id] = feed_counts.get(user_id, 0) + 1
+                    image_counts[artifact.id] = image_counts.get(artifact.id, 0) + n_images
+                    links.append(ArtifactFeed(id=uuid.uuid4(), artifact_id=artifact.id, feed_id=feed.id))
+
+            with transaction.atomic():
+                Feed.objects.bulk_create(feeds, batch_size=self.batch_size)
+                FeedImage.objects.bulk_create(images, batch_size=self.batch_size)
+                ArtifactFeed.objects.bulk_create(links, batch_size=self.batch_size)
+            done += size
+            self._log('feeds', done, count, started)
+        return feed_counts, image_counts
+
+    def _write_feed_image(self, feed_id, order):
+        relative_path = versioned_name(feed_image_path(feed_id, f'image_{order}_bench.jpg'), self.image_digest)
+        if self.with_files:
+            path = os.path.join(settings.MEDIA_ROOT, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as destination:
+                destination.write(self.image_bytes)
+        return f'{settings.MEDIA_URL}{relative_path}'
+
+    def _finalize_users(self, user_ids, feed_counts):
+        """bulk_create 는 Feed.save 를 거치지 않으므로 feed_count/rank 를 직접 반영"""
+        users = []
+        for user_id, feed_count in feed_counts.items():
+            users.append(User(id=user_id, feed_count=feed_count, rank=rank_for_feed_count(feed_count)))
+            if len(users) >= self.batch_size:
+                User.objects.bulk_update(users, ['feed_count', 'rank'])
+                users = []
+        if users:
+            User.objects.bulk_update(users, ['feed_count', 'rank'])
+
+    def _finalize_artifacts(self, artifacts, image_counts):
+        """check_and_create_artifact 와 같이 이미지 10장 이상인 유물만 남김"""
+        kept, dropped = [], []
+        for artifact in artifacts:
+            artifact.image_count = image_counts.get(artifact.id, 0)
+            (kept if artifact.image_count >= 10 else dropped).append(artifact)
+        Artifact.objects.bulk_update(kept, ['image_count'], batch_size=self.batch_size)
+        for offset in range(0, len(dropped), self.batch_size):
+            ids = [artifact.id for artifact in dropped[offset:offset + self.batch_size]]
+            Artifact.objects.filter(id__in=ids).delete()
+        self.stdout.write(f'artifacts: {len(kept)} (이미지 부족으로 제외 {len(dropped)})')
+        return kept
+
+    def _create_models(self, count, artifacts):
+        if not artifacts or count <= 0:
+            return
+        models = []
+        now = timezone.now()
+        for _ in range(count):
+            model_id = uuid.uuid4()
+            model_status = self.rng.choices(['completed', 'processing', 'pending', 'failed'], [7, 1, 1, 1])[0]
+            models.append(Model3D(
+                id=model_id,
+                artifact_id=self.rng.choice(artifacts).id,
+                model_url=f'models/bench_{model_id}.glb',
+                status=model_status,
+                completed_at=now if model_status == 'completed' else None,  # bulk_create 는 save() 를 거치지 않음
+                poly_count=self.rng.randint(10_000, 500_000),
+                file_size=self.rng.randint(500, 50_000),
+            ))
+        Model3D.objects.bulk_create(models, batch_size=self.batch_size)
+        self.stdout.write(f'models: {count}')
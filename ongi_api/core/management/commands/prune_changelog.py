@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = '보관 기간이 지난 동기화 변경 기록을 삭제합니다. (그 이전 토큰의 클라이언트는 전체 재동기화)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'SYNC_RETENTION_DAYS', 90))
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timezone.timedelta(days=options['days'])
+        # 가장 최근 기록은 남겨 만료된 토큰을 구분할 수 있게 함
+        latest = ChangeLog.objects.order_by('-seq').values_list('seq', flat=True).first()
+        deleted, _ = ChangeLog.objects.filter(created_at__lt=cutoff).exclude(seq=latest).delete()
+        self.stdout.write(self.style.SUCCESS(f'변경 기록 {deleted}개 삭제'))
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from artifacts.models import Artifact, ArtifactFeed
+from core import fragments
+from core.media_gc import media_relative
+from core.media_layout import is_sharded, is_versioned, sharded_path, versioned_name
+from core.sync import record_changes
+from feeds.models import FeedImage
+from feeds.thumbnails import THUMBNAIL_DIR, THUMBNAIL_SIZES
+from model3d.models import Model3D, Model3DVariant, SourceImage
+from users.models import User
+
+
+def _feed_path(key, path):
+    # feeds/<피드 ID>/<파일>
+    parts = path.split('/')
+    return sharded_path('feeds', parts[1], *parts[2:]) if parts[0] == 'feeds' and len(parts) >= 3 else None
+
+
+def _profile_path(key, path):
+    # <사용자 ID>/profile/<파일>
+    parts = path.split('/')
+    return sharded_path('users', parts[0], *parts[1:]) if len(parts) >= 3 and parts[1] == 'profile' else None
+
+
+def _model_path(subdir):
+    # models/[<subdir>/]<파일> -> models/<샤드>/<모델 ID>/[<subdir>/]<파일>
+    def plan(key, path):
+        prefix = f'models/{subdir}/' if subdir else 'models/'
+        name = path[len(prefix):]
+        if not path.startswith(prefix) or '/' in name:
+            return None
+        return sharded_path('models', key, *([subdir] if subdir else []), name)
+    return plan
+
+
+# (모델, 필드, 키 필드, URL 저장 여부, 새 경로 계산, 델타 동기화 엔티티)
+SOURCES = [
+    (FeedImage, 'image_url', 'feed_id', True, _feed_path, 'feed_images'),
+    (User, 'profile_image', 'id', True, _profile_path, None),
+    (Model3D, 'model_url', 'id', False, _model_path(''), 'models'),
+    (Model3D, 'thumbnail_url', 'id', False, _model_path('thumbnails'), 'models'),
+    (SourceImage, 'image_url', 'model_id', False, _model_path('sources'), None),
+    (Model3DVariant, 'file', 'model_id', False, _model_path(''), None),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        '기존 미디어 파일을 해시 분산 폴더(<종류>/ab/cd/<키>/)의 내용 해시 이름으로 옮기고 DB 경로를 갱신합니다. '
+        '서비스 중에 실행할 수 있으며, 이전 파일은 남겨 두었다가 gc_media 로 정리합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 트랜잭션에서 갱신할 행 수')
+        parser.add_argument('--sleep', type=float, default=0, help='배치 사이 대기 시간(초)')
+        parser.add_argument('--dry-run', action='store_true', help='파일/DB 변경 없이 대상 수만 출력')
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.stats = {'rows': 0, 'files': 0, 'missing': 0}
+        for model, field, key_field, is_url, plan, entity in SOURCES:
+            label = f'{model._meta.label}.{field}'
+            last_pk = None
+            while True:
+                # pk 순서로 끊어 읽어 새로 추가된 행/이미 옮긴 행과 관계없이 진행
+                rows = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''}).order_by('pk')
+                if last_pk is not None:
+                    rows = rows.filter(pk__gt=last_pk)
+                batch = list(rows.values_list('pk', key_field, field)[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+                self._migrate_batch(model, field, is_url, plan, entity, batch)
+                self.stdout.write(f"{label}: {self.stats['rows']}행 갱신, 파일 {self.stats['files']}개")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+
+        prefix = '[dry-run] ' if self.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{self.stats['rows']}행 갱신, 파일 {self.stats['files']}개 배치, "
+            f"원본 없음 {self.stats['missing']}개 (이전 경로 파일은 gc_media 로 정리)"
+        ))
+
+    def _migrate_batch(self, model, field, is_url, plan, entity, batch):
+        moves, pks = {}, []
+        for pk, key, value in batch:
+            path = media_relative(value)
+            if not path or (is_sharded(path) and is_versioned(path)):
+                continue
+            if path not in moves:
+                target = path if is_sharded(path) else plan(key, path)
+                if target is None:
+                    continue
+                target = self._place(path, target)
+                if target is None:
+                    self.stats['missing'] += 1
+                    continue
+                moves[path] = target
+            pks.append(pk)
+        if not moves or self.dry_run:
+            self.stats['rows'] += len(pks)
+            return
+
+        stored = (lambda path: f'{settings.MEDIA_URL}{path}') if is_url else (lambda path: path)
+        with transaction.atomic():
+            # 값이 그대로인 행만 갱신 (처리 중 바뀐 행은 덮어쓰지 않음, 같은 파일을 참조하는 행은 함께 갱신)
+            for path, target in moves.items():
+                self.stats['rows'] += model.objects.filter(**{field: stored(path)}).update(**{field: stored(target)})
+            if entity:
+                record_changes(entity, pks)
+            # update() 는 시그널이 없으므로 조각 캐시 직접 무효화
+            fragments.bump(model, pks)
+            if model is FeedImage:
+                feed_ids = FeedImage.objects.filter(pk__in=pks).values_list('feed_id', flat=True)
+                artifact_ids = set(ArtifactFeed.objects.filter(feed_id__in=feed_ids).values_list('artifact_id', flat=True))
+                fragments.bump(Artifact, artifact_ids)  # 유물 썸네일
+                record_changes('artifacts', artifact_ids)
+
+    def _place(self, path, target):
+        """
+        내용 해시를 붙인 새 경로에 파일 배치 (같은 파일 시스템이면 하드 링크, 아니면 복사) 후 그 경로 반환
+        이전 경로 파일은 DB 갱신 전 요청이 계속 쓸 수 있도록 남겨 둔다
+        """
+        source = os.path.join(settings.MEDIA_ROOT, path)
+        if not os.path.isfile(source):
+            return None
+        if self.dry_run:
+            return target
+        if not is_versioned(target):
+            digest = hashlib.sha256()
+            with open(source, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            target = versioned_name(target, digest.hexdigest())
+        pairs = [(source, os.path.join(settings.MEDIA_ROOT, target))]
+        if path.startswith('feeds/'):
+            # 이미 만든 썸네일도 옮겨 다시 생성하지 않게 함
+            pairs += [
+                (os.path.join(settings.MEDIA_ROOT, THUMBNAIL_DIR, str(size), path),
+                 os.path.join(settings.MEDIA_ROOT, THUMBNAIL_DIR, str(size), target))
+                for size in THUMBNAIL_SIZES
+            ]
+        for src, dst in pairs:
+            if not os.path.isfile(src) or (os.path.isfile(dst) and os.path.getsize(dst) == os.path.getsize(src)):
+                continue
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            temp_path = f'{dst}.tmp'
+            try:
+                os.link(src, temp_path)
+            except OSError:
+                shutil.copy2(src, temp_path)
+            os.replace(temp_path, dst)
+            self.stats['files'] += 1
+        return target
@@ -0,0 +1,240 @@
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OrphanCandidate
+
+
+QUARANTINE_DIR = '.gc_quarantine'
+BATCH_SIZE = 2000
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def media_relative(url_or_name):
+    """MEDIA_URL 로 시작하는 URL 또는 스토리지 파일명을 MEDIA_ROOT 기준 상대 경로로 변환"""
+    if not url_or_name:
+        return None
+    if url_or_name.startswith(settings.MEDIA_URL):
+        url_or_name = url_or_name[len(settings.MEDIA_URL):]
+    elif '://' in url_or_name:
+        return None  # 외부 URL
+    return os.path.normpath(url_or_name).replace('\\', '/').lstrip('/')
+
+
+def _reference_sources():
+    """(모델, 필드명) 목록 - 미디어 파일을 참조하는 모든 컬럼"""
+    from feeds.models import FeedImage
+    from model3d.models import Model3D, Model3DVariant, SourceImage
+    from users.models import User
+
+    return [
+        (FeedImage, 'image_url'),
+        (User, 'profile_image'),
+        (Model3D, 'model_url'),
+        (Model3D, 'thumbnail_url'),
+        (SourceImage, 'image_url'),
+        (Model3DVariant, 'file'),
+    ]
+
+
+def referenced_paths():
+    """DB 가 참조하는 미디어 상대 경로 집합 (배치 단위 스트리밍 조회)"""
+    paths = set()
+    for model, field in _reference_sources():
+        rows = (
+            model.objects.using('default')
+            .exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+            .values_list(field, flat=True)
+            .iterator(chunk_size=BATCH_SIZE)
+        )
+        for value in rows:
+            path = media_relative(value)
+            if path:
+                paths.add(path)
+    return paths
+
+
+def is_referenced(path):
+    """단일 경로의 참조 여부 (증분 모드용)"""
+    source = source_path(path)
+    for model, field in _reference_sources():
+        values = [source, settings.MEDIA_URL + source]
+        if model.objects.using('default').filter(**{f'{field}__in': values}).exists():
+            return True
+    return False
+
+
+def source_path(path):
+    """파생 파일(썸네일 등)이면 원본 경로, 아니면 그대로"""
+    parts = path.split('/', 2)
+    if parts[0] == 'thumbnails' and len(parts) == 3:
+        return parts[2]  # thumbnails/<size>/<원본 경로>
+    if parts[0] == 'tiles':
+        # tiles/<원본 경로>/image.dzi 또는 tiles/<원본 경로>/image_files/<레벨>/<타일>
+        source, _, _ = path[len('tiles/'):].partition('/image_files/')
+        return source[:-len('/image.dzi')] if source.endswith('/image.dzi') else source
+    return path
+
+
+def _excluded_dirs():
+    return {QUARANTINE_DIR, *_setting('MEDIA_GC_EXCLUDE_DIRS', ())}
+
+
+def walk_media(root=None, prune_empty_after=None):
+    """
+    MEDIA_ROOT 아래 파일을 scandir 로 순회하며 (상대 경로, stat) 생성
+    prune_empty_after(초) 를 주면 순회가 끝난 뒤 비어 있고 그보다 오래 수정되지 않은 디렉터리를 삭제한다
+    (업로드가 makedirs 후 파일을 쓰기 전에 디렉터리가 지워지지 않도록 최근 디렉터리는 남김)
+    """
+    root = root or settings.MEDIA_ROOT
+    excluded = _excluded_dirs()
+
+    def walk(directory, prefix):
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            return
+        with entries:
+            for entry in entries:
+                relative = f'{prefix}{entry.name}'
+                if entry.is_dir(follow_symlinks=False):
+                    if not prefix and entry.name in excluded:
+                        continue
+                    yield from walk(entry.path, relative + '/')
+                elif entry.is_file(follow_symlinks=False):
+                    yield relative, entry.stat(follow_symlinks=False)
+        if prefix and prune_empty_after is not None:
+            try:
+                if time.time() - os.stat(directory).st_mtime >= prune_empty_after:
+                    os.rmdir(directory)  # 비어 있을 때만 성공
+            except OSError:
+                pass
+
+    yield from walk(root, '')
+
+
+class RateLimiter:
+    """초당 작업 수 제한 (0 이면 무제한)"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.interval
+
+
+class MediaGC:
+    """
+    미참조 미디어 파일 정리
+    바로 삭제하지 않고 격리 폴더로 옮긴 뒤 MEDIA_GC_QUARANTINE_DAYS 가 지나면 삭제한다
+    """
+
+    def __init__(self, dry_run=False, rate=0, grace_seconds=None, log=None):
+        self.dry_run = dry_run
+        self.limiter = RateLimiter(rate)
+        # 업로드 직후 DB 저장 전인 파일을 지우지 않도록 최근 수정 파일은 건너뜀
+        self.grace_seconds = _setting('MEDIA_GC_GRACE_SECONDS', 3600) if grace_seconds is None else grace_seconds
+        self.log = log or (lambda message: None)
+        self.batch = timezone.now().strftime('%Y%m%d%H%M%S')
+        self.stats = {'scanned': 0, 'quarantined': 0, 'bytes': 0, 'purged': 0}
+
+    def _quarantine(self, path, size):
+        self.limiter.wait()
+        self.log(f'격리: {path} ({size} bytes)')
+        self.stats['quarantined'] += 1
+        self.stats['bytes'] += size
+        if self.dry_run:
+            return
+        source = os.path.join(settings.MEDIA_ROOT, path)
+        target = os.path.join(settings.MEDIA_ROOT, QUARANTINE_DIR, self.batch, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.replace(source, target)
+        except FileNotFoundError:
+            pass
+
+    def _is_fresh(self, stat):
+        return time.time() - stat.st_mtime < self.grace_seconds
+
+    def full_scan(self):
+        """전체 스캔: DB 참조 집합과 MEDIA_ROOT 의 모든 파일 비교"""
+        referenced = referenced_paths()
+        self.log(f'참조 경로 {len(referenced)}개')
+        prune_empty_after = None if self.dry_run else self.grace_seconds
+        for path, stat in walk_media(prune_empty_after=prune_empty_after):
+            self.stats['scanned'] += 1
+            if source_path(path) in referenced or self._is_fresh(stat):
+                continue
+            self._quarantine(path, stat.st_size)
+        return self.stats
+
+    def incremental(self, limit=None):
+        """삭제 시그널이 기록한 후보 경로만 검사"""
+        candidates = OrphanCandidate.objects.order_by('id')
+        if limit:
+            candidates = candidates[:limit]
+        processed = []
+        for candidate in candidates.iterator(chunk_size=BATCH_SIZE):
+            self.stats['scanned'] += 1
+            for path in self._with_derived(candidate.path):
+                try:
+                    stat = os.stat(os.path.join(settings.MEDIA_ROOT, path))
+                except FileNotFoundError:
+                    continue
+                if not is_referenced(path):
+                    self._quarantine(path, stat.st_size)
+            processed.append(candidate.id)
+        if processed and not self.dry_run:
+            OrphanCandidate.objects.filter(id__in=processed).delete()
+        return self.stats
+
+    def _with_derived(self, path):
+        from feeds.thumbnails import THUMBNAIL_DIR, THUMBNAIL_SIZES
+        from feeds.tiles import TILE_DIR
+
+        yield path
+        for size in THUMBNAIL_SIZES:
+            yield f'{THUMBNAIL_DIR}/{size}/{path}'
+        for relative, _ in walk_media(os.path.join(settings.MEDIA_ROOT, TILE_DIR, path)):
+            yield f'{TILE_DIR}/{path}/{relative}'
+
+    def purge_quarantine(self, days=None):
+        """보관 기간이 지난 격리 배치 삭제"""
+        days = _setting('MEDIA_GC_QUARANTINE_DAYS', 7) if days is None else days
+        quarantine_root = os.path.join(settings.MEDIA_ROOT, QUARANTINE_DIR)
+        cutoff = (timezone.now() - timezone.timedelta(days=days)).strftime('%Y%m%d%H%M%S')
+        try:
+            batches = sorted(entry.name for entry in os.scandir(quarantine_root) if entry.is_dir())
+        except FileNotFoundError:
+            return self.stats
+        for batch in batches:
+            if batch >= cutoff:
+                break
+            self.log(f'격리 배치 삭제: {batch}')
+            self.stats['purged'] += 1
+            if not self.dry_run:
+                shutil.rmtree(os.path.join(quarantine_root, batch), ignore_errors=True)
+        return self.stats
+
+
+def mark_orphan_candidates(*values):
+    """커밋 후 후보 경로 기록 (삭제 시그널에서 호출)"""
+    paths = {path for path in map(media_relative, values) if path}
+    if not paths:
+        return
+    transaction.on_commit(lambda: OrphanCandidate.objects.bulk_create(
+        [OrphanCandidate(path=path) for path in paths], ignore_conflicts=True,
+    ))
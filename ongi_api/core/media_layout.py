@@ -0,0 +1,58 @@
+"""
+MEDIA_ROOT 폴더 분산 배치
+피드/사용자/모델마다 폴더를 바로 만들면 한 폴더에 수백만 개 항목이 쌓이므로,
+키 해시의 앞 두 글자씩 두 단계(<종류>/ab/cd/<키>/...)로 나눠 폴더당 항목 수를 256 개 이하로 유지한다
+
+파일 이름에는 내용 해시를 넣어(profile.<해시>.jpg) 내용이 바뀌면 URL 도 바뀌게 하므로,
+버전이 붙은 경로는 클라이언트/프록시가 만료 없이 캐시할 수 있다
+"""
+import hashlib
+import os
+import re
+
+
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+VERSION_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_VERSIONED = re.compile(rf'\.[0-9a-f]{{{VERSION_LENGTH}}}\.[^./]+(/|$)')
+_SHARDED = re.compile(r'^[^/]+/' + '/'.join([f'[0-9a-f]{{{SHARD_WIDTH}}}'] * SHARD_LEVELS) + '/')
+
+
+def shard(key):
+    """키 -> 'ab/cd'"""
+    digest = hashlib.md5(str(key).encode()).hexdigest()
+    return '/'.join(digest[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH] for level in range(SHARD_LEVELS))
+
+
+def sharded_path(kind, key, *parts):
+    """MEDIA_ROOT 기준 상대 경로 <종류>/<샤드>/<키>/<parts...>"""
+    return '/'.join([kind, shard(key), str(key), *parts])
+
+
+def is_sharded(path):
+    return bool(_SHARDED.match(path))
+
+
+def versioned_name(name, digest):
+    """'a/b/profile.jpg' + 해시 -> 'a/b/profile.<해시 앞 12자>.jpg'"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{digest[:VERSION_LENGTH]}{ext}'
+
+
+def is_versioned(path):
+    """내용 해시가 붙은 경로 (썸네일/타일처럼 버전 경로에서 파생된 경로 포함)"""
+    return bool(_VERSIONED.search(path))
+
+
+def feed_image_path(feed_id, filename):
+    return sharded_path('feeds', feed_id, filename)
+
+
+def profile_image_path(user_id, filename='profile.jpg'):
+    return sharded_path('users', user_id, 'profile', filename)
+
+
+def model_file_path(model_id, *parts):
+    return sharded_path('models', model_id, *parts)
@@ -0,0 +1,168 @@
+import threading
+from bisect import bisect_left
+
+
+# 히스토그램 버킷 경계 (Prometheus 관례에 따라 상한값)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # 초
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)  # 쿼리 수
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)  # 바이트
+
+
+class Histogram:
+    """고정 버킷 누적 히스토그램"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def cumulative(self):
+        """(상한값, 누적 개수) 목록 반환"""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def quantile(self, q):
+        """버킷 상한값 기준 근사 분위수"""
+        if not self.total:
+            return None
+        target = q * self.total
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return float('inf')
+
+    def to_dict(self):
+        return {
+            'count': self.total,
+            'sum': self.sum,
+            'avg': self.sum / self.total if self.total else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class RouteStats:
+    """라우트(메서드 + URL 패턴) 단위 집계"""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_time = Histogram(LATENCY_BUCKETS)
+        self.serialize_time = Histogram(LATENCY_BUCKETS)
+        self.render_time = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.status_counts = {}
+
+    def to_dict(self):
+        return {
+            'latency_seconds': self.latency.to_dict(),
+            'db_time_seconds': self.db_time.to_dict(),
+            'serialize_seconds': self.serialize_time.to_dict(),
+            'render_seconds': self.render_time.to_dict(),
+            'queries': self.queries.to_dict(),
+            'response_bytes': self.response_size.to_dict(),
+            'status': dict(self.status_counts),
+        }
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 요청 메트릭 저장소
+    워커 프로세스마다 독립적으로 집계되며, 스크레이퍼가 각 워커를 수집한다
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._gauges = {}  # 이름: (설명, 종류, 값을 읽는 함수)
+
+    def register_gauge(self, name, help_text, read, kind='gauge'):
+        """요청과 무관한 프로세스 상태 값 등록 (수집할 때 read() 로 읽음)"""
+        with self._lock:
+            self._gauges[name] = (help_text, kind, read)
+
+    def gauges(self):
+        with self._lock:
+            gauges = list(self._gauges.items())
+        return {name: read() for name, (_, _, read) in gauges}
+
+    def record(self, method, route, status_code, latency, db_time, queries, serialize_time, render_time, size):
+        key = (method, route)
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = RouteStats()
+            stats.latency.observe(latency)
+            stats.db_time.observe(db_time)
+            stats.serialize_time.observe(serialize_time)
+            stats.render_time.observe(render_time)
+            stats.queries.observe(queries)
+            stats.response_size.observe(size)
+            stats.status_counts[status_code] = stats.status_counts.get(status_code, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self):
+        """JSON 응답용 라우트별 요약"""
+        with self._lock:
+            return [
+                {'method': method, 'route': route, **stats.to_dict()}
+                for (method, route), stats in sorted(self._routes.items(), key=lambda item: item[0][1])
+            ]
+
+    def prometheus(self):
+        """Prometheus text exposition 형식으로 변환"""
+        families = [
+            ('ongi_request_duration_seconds', '요청 처리 시간', 'latency'),
+            ('ongi_request_db_seconds', '요청당 DB 시간', 'db_time'),
+            ('ongi_request_serialize_seconds', '요청당 시리얼라이저 .data 생성 시간', 'serialize_time'),
+            ('ongi_request_render_seconds', '요청당 응답 렌더링(인코딩) 시간', 'render_time'),
+            ('ongi_request_queries', '요청당 DB 쿼리 수', 'queries'),
+            ('ongi_response_size_bytes', '응답 크기', 'response_size'),
+        ]
+        with self._lock:
+            items = sorted(self._routes.items(), key=lambda item: item[0][1])
+            lines = []
+            for name, help_text, attr in families:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (method, route), stats in items:
+                    hist = getattr(stats, attr)
+                    labels = f'method="{method}",route="{_escape(route)}"'
+                    for bound, running in hist.cumulative():
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {running}')
+                    lines.append(f'{name}_sum{{{labels}}} {hist.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {hist.total}')
+            lines.append('# HELP ongi_responses_total 상태 코드별 응답 수')
+            lines.append('# TYPE ongi_responses_total counter')
+            for (method, route), stats in items:
+                for status_code, count in sorted(stats.status_counts.items()):
+                    lines.append(
+                        f'ongi_responses_total{{method="{method}",route="{_escape(route)}",status="{status_code}"}} {count}'
+                    )
+            for name, (help_text, kind, read) in sorted(self._gauges.items()):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                lines.append(f'{name} {read()}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+registry = MetricsRegistry()
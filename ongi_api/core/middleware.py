@@ -0,0 +1,107 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .db_routers import REPLICA_READ_APPS, pinned_to_primary, replica_reads_allowed, request_replica
+from .metrics import registry
+
+
+class QueryCounter:
+    """execute_wrapper 로 요청 중 실행된 쿼리 수와 DB 시간을 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - start
+
+
+class RequestMetricsMiddleware:
+    """
+    요청별 쿼리 수, DB 시간, 직렬화 시간, 응답 렌더링 시간, 응답 크기를 라우트 단위로 집계하는 미들웨어
+    직렬화 시간은 시리얼라이저 .data 생성(지연 평가되는 쿼리 포함), 렌더링 시간은 렌더러의 인코딩만 포함한다
+    METRICS_SAMPLE_RATE 비율의 요청만 계측하므로 운영 환경에서도 켜둘 수 있다
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+
+    def __call__(self, request):
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        request._metrics_serialize_time = 0.0  # core.serializers 에서 누적
+        request._metrics_render_time = 0.0
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+        latency = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unmatched'
+        size = 0 if response.streaming else len(response.content)
+
+        registry.record(
+            method=request.method,
+            route=route,
+            status_code=response.status_code,
+            latency=latency,
+            db_time=counter.elapsed,
+            queries=counter.count,
+            serialize_time=request._metrics_serialize_time,
+            render_time=request._metrics_render_time,
+            size=size,
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response 렌더링(JSON 인코딩) 시간 측정
+        if hasattr(request, '_metrics_render_time'):
+            start = time.perf_counter()
+
+            def _finish(rendered):
+                request._metrics_render_time += time.perf_counter() - start
+
+            response.add_post_render_callback(_finish)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    뷰가 결정된 뒤 복제본 읽기 허용 여부를 표시하는 미들웨어
+    안전한 메서드(GET/HEAD)이면서 REPLICA_READ_APPS 에 속한 뷰만 복제본을 사용한다
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        allowed_token = replica_reads_allowed.set(False)
+        pinned_token = pinned_to_primary.set(False)
+        replica_token = request_replica.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(allowed_token)
+            pinned_to_primary.reset(pinned_token)
+            request_replica.reset(replica_token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in ('GET', 'HEAD'):
+            app_name = view_func.__module__.split('.', 1)[0]
+            replica_reads_allowed.set(app_name in REPLICA_READ_APPS)
+        return None
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:06
+
+from django.db import migrations, models
+
+
+BACKFILL = [
+    ('artifacts', 'Artifact', 'artifacts'),
+    ('model3d', 'Model3D', 'models'),
+    ('feeds', 'Feed', 'feeds'),
+    ('feeds', 'FeedImage', 'feed_images'),
+]
+
+
+def backfill(apps, schema_editor):
+    # 기존 객체를 첫 동기화(since=0) 에 포함시키기 위한 기록
+    ChangeLog = apps.get_model('core', 'ChangeLog')
+    for app_label, model_name, entity in BACKFILL:
+        ids = apps.get_model(app_label, model_name).objects.values_list('id', flat=True).iterator(chunk_size=2000)
+        batch = []
+        for object_id in ids:
+            batch.append(ChangeLog(entity=entity, object_id=object_id, action='upsert'))
+            if len(batch) >= 2000:
+                ChangeLog.objects.bulk_create(batch)
+                batch = []
+        ChangeLog.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_orphan_candidate'),
+        ('artifacts', '0003_artifact_location'),
+        ('feeds', '0003_feed_location'),
+        ('model3d', '0005_model3d_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('upsert', '생성/수정'), ('delete', '삭제')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'core_change_log',
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
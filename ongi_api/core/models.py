@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class OrphanCandidate(models.Model):
+    """
+    삭제된 객체가 참조하던 미디어 경로 (증분 GC 대상)
+    gc_media --incremental 이 처리 후 삭제한다
+    """
+    path = models.CharField(max_length=500, unique=True)  # MEDIA_ROOT 기준 상대 경로
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'core_orphan_candidates'
+
+
+class ChangeLog(models.Model):
+    """
+    동기화 대상 객체의 변경 기록 (모바일 델타 동기화용)
+    seq 가 단조 증가하므로 클라이언트는 마지막으로 받은 seq 이후만 요청한다
+    """
+    ACTION_CHOICES = [
+        ('upsert', '생성/수정'),
+        ('delete', '삭제'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=20)  # core.sync.ENTITIES 의 키
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'core_change_log'
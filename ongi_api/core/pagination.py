@@ -0,0 +1,103 @@
+import base64
+import json
+import uuid
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+COUNT_CACHE_TIMEOUT = 60  # 초
+# 플래너 추정치가 이보다 작으면 정확한 COUNT 를 수행
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    """(created_at, id) 를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps([created_at.isoformat(), str(pk)], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(created_at, str) or not isinstance(pk, str):
+            raise ValueError
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            raise ValueError
+        return created_at, uuid.UUID(pk)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise InvalidCursor('유효하지 않은 커서입니다.')
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """page_size 쿼리 파라미터 검증 (1 ~ maximum)"""
+    if value in (None, ''):
+        return default
+    page_size = int(value)
+    if page_size < 1:
+        raise ValueError('page_size 는 1 이상이어야 합니다.')
+    return min(page_size, maximum)
+
+
+def keyset_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    (-created_at, -id) 순서의 키셋 페이지네이션
+    OFFSET 없이 커서 이후 page_size 개만 조회하므로 깊은 페이지도 비용이 일정하다
+    반환: (객체 목록, 다음 커서 또는 None)
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+    items = list(queryset[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].pk) if has_more else None
+    return items, next_cursor
+
+
+def approximate_count(queryset, cache_key):
+    """
+    캐시된 전체 개수 반환 (없으면 계산 후 캐시)
+    PostgreSQL 에서는 플래너 추정치가 충분히 크면 COUNT 없이 추정치를 사용한다
+    반환: (개수, 추정치 여부)
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = None
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        estimate = _planner_estimate(queryset, connection)
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            result = (estimate, True)
+    if result is None:
+        result = (queryset.count(), False)
+
+    cache.set(cache_key, result, COUNT_CACHE_TIMEOUT)
+    return result
+
+
+def _planner_estimate(queryset, connection):
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
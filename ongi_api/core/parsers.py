@@ -0,0 +1,40 @@
+import uuid
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .renderers import UUID_EXT_CODE
+
+
+def _msgpack_ext_hook(code, data):
+    import msgpack
+
+    if code == UUID_EXT_CODE and len(data) == 16:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack 요청 본문 (UUID 확장 타입 -> uuid.UUID, Timestamp -> datetime)"""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, timestamp=3, ext_hook=_msgpack_ext_hook)
+        except ValueError as e:
+            raise ParseError(f'MessagePack 형식 오류: {e}')
+
+
+class CBORParser(BaseParser):
+    """CBOR 요청 본문 (태그 37 -> uuid.UUID, 태그 0/1 -> datetime)"""
+    media_type = 'application/cbor'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import cbor2
+
+        try:
+            return cbor2.loads(stream.read())
+        except (ValueError, cbor2.CBORError) as e:
+            raise ParseError(f'CBOR 형식 오류: {e}')
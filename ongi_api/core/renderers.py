@@ -0,0 +1,113 @@
+"""
+바이너리 응답 형식 (Accept: application/msgpack, application/cbor)
+JSON 에서 문자열로 반복되는 UUID/시각을 각 형식의 고유 타입으로 담는다
+- MessagePack: UUID 는 확장 타입 37 (16바이트), 시각은 표준 Timestamp 확장(-1)
+- CBOR: UUID 는 태그 37, 시각은 태그 1 (epoch 초)
+시리얼라이저 출력(조각 캐시 포함)은 문자열이므로 인코딩 직전에 UUIDField/DateTimeField 값을 필드 타입에 따라 변환한다
+msgpack / cbor2 패키지가 설치된 경우에만 settings 에 등록된다
+"""
+import datetime
+import uuid
+
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+UUID_EXT_CODE = 37  # CBOR UUID 태그 번호와 맞춤
+
+_json_encoder = JSONEncoder()
+
+
+def _parse_datetime(value):
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    # 시간대 없는 시각은 해석이 모호하므로 문자열 그대로
+    return parsed if parsed.tzinfo is not None else value
+
+
+def _typed(value, field):
+    """시리얼라이저 필드 타입에 맞춰 값 변환 (UUIDField, DateTimeField 의 문자열만)"""
+    if value is None or field is None:
+        return to_native(value)
+    if isinstance(field, serializers.ListSerializer):
+        return [_typed(item, field.child) for item in value] if isinstance(value, list) else value
+    if isinstance(field, serializers.Serializer):
+        if not isinstance(value, dict):
+            return value
+        fields = field.fields
+        # 뷰가 덧붙인 키 (trending_score 등) 는 필드가 없으므로 그대로
+        return {key: _typed(item, fields.get(key)) for key, item in value.items()}
+    if isinstance(field, serializers.ListField):
+        return [_typed(item, field.child) for item in value] if isinstance(value, list) else value
+    if isinstance(field, serializers.ManyRelatedField):
+        return [_typed(item, field.child_relation) for item in value] if isinstance(value, list) else value
+    if isinstance(value, str):
+        if isinstance(field, serializers.UUIDField):
+            try:
+                return uuid.UUID(value)
+            except ValueError:
+                return value
+        if isinstance(field, serializers.DateTimeField):
+            return _parse_datetime(value)
+    return value
+
+
+def to_native(data):
+    """
+    응답 데이터 안의 시리얼라이저 출력(serializer.data)에서 UUIDField/DateTimeField 문자열을 uuid.UUID/datetime 으로 변환
+    시리얼라이저에서 나오지 않은 값은 문자열 모양과 관계없이 그대로 둔다 (사용자 입력이 타입을 바꾸지 않도록)
+    """
+    serializer = getattr(data, 'serializer', None)
+    if serializer is not None:
+        return _typed(data, serializer)
+    if isinstance(data, dict):
+        return {key: to_native(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [to_native(value) for value in data]
+    return data
+
+
+def _fallback(obj):
+    """형식이 직접 지원하지 않는 값 (Decimal, 지연 번역 문자열 등) 은 JSON 과 같은 방식으로 변환"""
+    return _json_encoder.default(obj)
+
+
+def _msgpack_default(obj):
+    import msgpack
+
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT_CODE, obj.bytes)
+    if isinstance(obj, datetime.datetime) and obj.tzinfo is not None:
+        return msgpack.Timestamp.from_datetime(obj)
+    return _fallback(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import msgpack
+
+        if data is None:
+            return b''
+        return msgpack.packb(to_native(data), default=_msgpack_default, use_bin_type=True)
+
+
+class CBORRenderer(BaseRenderer):
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import cbor2
+
+        if data is None:
+            return b''
+        return cbor2.dumps(to_native(data), datetime_as_timestamp=True, default=lambda encoder, obj: encoder.encode(_fallback(obj)))
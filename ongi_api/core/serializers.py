@@ -0,0 +1,244 @@
+import time
+
+from django.db.models import QuerySet
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+from . import fragments
+
+
+def parse_shape(value):
+    """
+    'id,user.username,images' 형식의 필드 목록을 중첩 dict 로 변환
+    -> {'id': {}, 'user': {'username': {}}, 'images': {}}
+    하위 dict 가 비어 있으면 해당 필드의 기본 형태를 그대로 사용한다
+    """
+    shape = {}
+    for path in (value or '').split(','):
+        node = shape
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return shape
+
+
+def measured_data(serializer, build):
+    """
+    시리얼라이저 .data 생성 시간을 요청의 직렬화 시간에 누적 (RequestMetricsMiddleware)
+    메서드 필드 등에서 다른 시리얼라이저의 .data 를 부르는 경우 바깥 호출만 측정한다
+    """
+    request = serializer._context.get('request')
+    request = getattr(request, '_request', request)  # DRF Request -> HttpRequest
+    if request is None or not hasattr(request, '_metrics_serialize_time') or getattr(request, '_metrics_serializing', False):
+        return build()
+    request._metrics_serializing = True
+    start = time.perf_counter()
+    try:
+        return build()
+    finally:
+        request._metrics_serialize_time += time.perf_counter() - start
+        request._metrics_serializing = False
+
+
+class DynamicFieldsMixin:
+    """
+    ?fields= / ?expand= 로 응답 형태를 고르는 시리얼라이저 믹스인
+    최상위 시리얼라이저는 context 의 request 에서, 중첩 시리얼라이저는 부모에게서 형태를 받는다
+
+    Meta.expandable_fields: 요청할 때만 추가되는 필드 {이름: 필드 생성 함수}
+    Meta.default_expand: 기본으로 펼치는 expandable 필드 이름
+    Meta.eager_loading: 필드가 응답에 포함될 때만 적용할 쿼리셋 최적화 {이름: (queryset, serializer) -> queryset}
+
+    Meta.fragment_cache: 객체별 직렬화 결과(조각)를 캐시 (core.fragments)
+    Meta.fragment_dependencies: 조각을 무효화할 다른 모델 {모델: instance -> 대상 pk 목록}
+    Meta.fragment_live_fields: 캐시하지 않고 매번 계산할 필드
+    중첩 시리얼라이저 필드는 조각에 넣지 않고 각자의 조각으로 조립하므로,
+    작성자 정보가 바뀌어도 피드 조각은 그대로 쓰인다
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, 'Meta', None)
+        if getattr(meta, 'fragment_cache', False):
+            fragments.register(cls)
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self._context.get('request')
+        if request is not None:
+            if fields is None:
+                fields = parse_shape(request.query_params.get('fields'))
+            if expand is None:
+                expand = parse_shape(request.query_params.get('expand'))
+        self.apply_shape(fields or {}, expand or {})
+
+    def apply_shape(self, fields, expand):
+        meta = getattr(self, 'Meta', None)
+        expandable = getattr(meta, 'expandable_fields', {})
+        expanded = (set(getattr(meta, 'default_expand', ())) | set(expand)) & set(expandable)
+        if fields:
+            expanded &= set(fields) | set(expand)
+
+        for name in expandable:
+            if name in expanded and name not in self.fields:
+                self.fields[name] = expandable[name]()
+        if fields:
+            for name in list(self.fields):
+                if name not in fields and name not in expand:
+                    self.fields.pop(name)
+
+        self._field_shape, self._expand_shape = fields, expand
+        self._fragment_shape = None
+        for name, field in self.fields.items():
+            target = getattr(field, 'child', field)
+            if isinstance(target, DynamicFieldsMixin):
+                target.apply_shape(fields.get(name, {}), expand.get(name, {}))
+
+    def nested_shape(self, name):
+        """메서드 필드에서 만드는 중첩 시리얼라이저에 넘길 fields/expand 인자"""
+        return {
+            'fields': getattr(self, '_field_shape', {}).get(name, {}),
+            'expand': getattr(self, '_expand_shape', {}).get(name, {}),
+        }
+
+    def _fragments_active(self):
+        return getattr(getattr(self, 'Meta', None), 'fragment_cache', False) and fragments.fragments_enabled()
+
+    def _fragment_fields(self):
+        """(조각에 담는 필드 이름, 조각 밖에서 조립/계산하는 필드 이름)"""
+        if self._fragment_shape is None:
+            live = set(getattr(self.Meta, 'fragment_live_fields', ()))
+            cached, composed = [], set()
+            for field in self._readable_fields:
+                if isinstance(getattr(field, 'child', field), serializers.BaseSerializer) or field.field_name in live:
+                    composed.add(field.field_name)
+                else:
+                    cached.append(field.field_name)
+            # 절대 URL 이 요청 호스트에 따라 달라지므로 호스트도 키에 포함
+            request = self.context.get('request')
+            scope = request.build_absolute_uri('/') if request is not None else ''
+            self._fragment_shape = (cached, composed, fragments.shape_hash(type(self).__module__, type(self).__qualname__, scope, *cached))
+            self._fragment_memo = {}
+            self._fragment_versions = {}
+        return self._fragment_shape
+
+    def _fragment_key(self, instance):
+        _, _, shape = self._fragment_fields()
+        version = self._fragment_versions.get(instance.pk)
+        if version is None:
+            version = fragments.get_versions(self.Meta.model, [instance.pk])[instance.pk]
+        stamp = getattr(instance, 'updated_at', None)
+        return f'frag:{shape}:{instance.pk}:{version}:{stamp.timestamp() if stamp else ""}'
+
+    def warm_fragments(self, instances):
+        """
+        목록 직렬화 전에 조각과 버전을 한 번에 조회 (중첩 시리얼라이저까지 재귀)
+        객체 수와 관계없이 중첩 단계마다 캐시 조회 2번
+        """
+        if not self._fragments_active() or not instances:
+            return
+        _, composed, _ = self._fragment_fields()
+        self._fragment_versions.update(fragments.get_versions(self.Meta.model, {instance.pk for instance in instances}))
+        keys = [self._fragment_key(instance) for instance in instances]
+        self._fragment_memo.update(fragments.fragment_cache().get_many(keys))
+
+        for name in composed:
+            field = self.fields[name]
+            target = getattr(field, 'child', field)
+            if not isinstance(target, DynamicFieldsMixin):
+                continue
+            related = []
+            for instance in instances:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+                if attribute is None:
+                    continue
+                if field is not target:
+                    related.extend(attribute.all() if isinstance(attribute, BaseManager) else attribute)
+                else:
+                    related.append(attribute)
+            target.warm_fragments(related)
+
+    def _represent(self, instance, names):
+        """Serializer.to_representation 과 같은 방식으로 지정 필드만 직렬화"""
+        result = {}
+        for name in names:
+            field = self.fields[name]
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            result[name] = None if check_for_none is None else field.to_representation(attribute)
+        return result
+
+    def to_representation(self, instance):
+        if not self._fragments_active():
+            return super().to_representation(instance)
+
+        cached, composed, _ = self._fragment_fields()
+        key = self._fragment_key(instance)
+        fragment = self._fragment_memo.get(key)
+        if fragment is None:
+            fragment = fragments.fragment_cache().get(key)
+            if fragment is None:
+                fragment = self._represent(instance, cached)
+                fragments.fragment_cache().set(key, fragment, fragments.fragment_timeout())
+            self._fragment_memo[key] = fragment
+
+        live = self._represent(instance, composed)
+        # 필드 순서 유지
+        return {
+            field.field_name: live[field.field_name] if field.field_name in composed else fragment[field.field_name]
+            for field in self._readable_fields
+            if field.field_name in live or field.field_name in fragment
+        }
+
+    @property
+    def data(self):
+        return measured_data(self, lambda: super(DynamicFieldsMixin, self).data)
+
+    def eager_load(self, queryset):
+        """응답에 포함된 필드에 필요한 select/prefetch/annotate 만 적용"""
+        loaders = getattr(getattr(self, 'Meta', None), 'eager_loading', {})
+        for name in self.fields:
+            if name in loaders:
+                queryset = loaders[name](queryset, self)
+        return queryset
+
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """항목을 직렬화하기 전에 조각 캐시를 일괄 조회하는 목록 시리얼라이저 (Meta.list_serializer_class)"""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        if isinstance(self.child, DynamicFieldsMixin):
+            self.child.warm_fragments(items)
+        return [self.child.to_representation(item) for item in items]
+
+    @property
+    def data(self):
+        return measured_data(self, lambda: super(FragmentListSerializer, self).data)
+
+
+def eager_load(serializer, queryset):
+    """시리얼라이저(또는 many=True 목록)의 형태에 맞춰 쿼리셋 최적화"""
+    target = getattr(serializer, 'child', serializer)
+    if isinstance(target, DynamicFieldsMixin) and isinstance(queryset, QuerySet):
+        return target.eager_load(queryset)
+    return queryset
+
+
+def shaped(serializer_class, request, queryset=None, many=False):
+    """
+    요청의 fields/expand 형태로 시리얼라이저 생성
+    queryset 을 주면 형태에 필요한 관계만 미리 조회하도록 최적화해 instance 로 설정한다
+    단일 객체는 eager_load(serializer, 쿼리셋) 으로 조회한 뒤 instance 를 직접 지정한다
+    """
+    serializer = serializer_class(many=many, context={'request': request})
+    if queryset is not None:
+        serializer.instance = eager_load(serializer, queryset)
+    return serializer
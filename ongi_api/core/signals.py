@@ -0,0 +1,83 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from artifacts.models import Artifact, ArtifactFeed
+from feeds.models import Feed, FeedImage
+from model3d.models import Model3D, Model3DVariant, SourceImage
+from users.models import User
+from .media_gc import mark_orphan_candidates
+from .sync import record_change
+
+
+@receiver(post_delete, sender=FeedImage)
+def feed_image_deleted(sender, instance, **kwargs):
+    mark_orphan_candidates(instance.image_url)
+
+
+@receiver(post_delete, sender=User)
+def user_profile_deleted(sender, instance, **kwargs):
+    mark_orphan_candidates(instance.profile_image)
+
+
+@receiver(post_delete, sender=Model3D)
+def model3d_deleted(sender, instance, **kwargs):
+    mark_orphan_candidates(instance.model_url.name, instance.thumbnail_url.name)
+
+
+@receiver(post_delete, sender=SourceImage)
+def source_image_deleted(sender, instance, **kwargs):
+    mark_orphan_candidates(instance.image_url.name)
+
+
+@receiver(post_delete, sender=Model3DVariant)
+def model3d_variant_deleted(sender, instance, **kwargs):
+    mark_orphan_candidates(instance.file.name)
+
+
+# 델타 동기화 변경 기록
+@receiver(post_save, sender=Feed)
+def feed_changed(sender, instance, **kwargs):
+    record_change('feeds', instance.id)
+
+
+@receiver(post_delete, sender=Feed)
+def feed_removed(sender, instance, **kwargs):
+    record_change('feeds', instance.id, 'delete')
+
+
+@receiver(post_save, sender=FeedImage)
+def feed_image_changed(sender, instance, **kwargs):
+    record_change('feed_images', instance.id)
+
+
+@receiver(post_delete, sender=FeedImage)
+def feed_image_removed(sender, instance, **kwargs):
+    record_change('feed_images', instance.id, 'delete')
+
+
+@receiver(post_save, sender=Artifact)
+def artifact_changed(sender, instance, **kwargs):
+    record_change('artifacts', instance.id)
+
+
+@receiver(post_delete, sender=Artifact)
+def artifact_removed(sender, instance, **kwargs):
+    record_change('artifacts', instance.id, 'delete')
+
+
+@receiver([post_save, post_delete], sender=ArtifactFeed)
+def artifact_feed_changed(sender, instance, **kwargs):
+    # 유물의 피드 수/썸네일이 바뀜
+    record_change('artifacts', instance.artifact_id)
+
+
+@receiver(post_save, sender=Model3D)
+def model3d_changed(sender, instance, **kwargs):
+    record_change('models', instance.id)
+    record_change('artifacts', instance.artifact_id)  # has_3d_model/썸네일
+
+
+@receiver(post_delete, sender=Model3D)
+def model3d_removed(sender, instance, **kwargs):
+    record_change('models', instance.id, 'delete')
+    record_change('artifacts', instance.artifact_id)
@@ -0,0 +1,38 @@
+import hashlib
+import os
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from .media_layout import versioned_name
+
+
+class VersionedFileSystemStorage(FileSystemStorage):
+    """
+    저장할 때 파일 이름에 내용 해시를 붙이는 스토리지 (profile.jpg -> profile.<해시>.jpg)
+    같은 내용이 이미 있으면 다시 쓰지 않고 그 이름을 돌려준다
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        base = self.generate_filename(name)
+        name = versioned_name(base, digest.hexdigest())
+        if max_length and len(name) > max_length:
+            # 해시가 잘리지 않도록 원래 파일 이름 쪽을 줄임
+            directory, filename = os.path.split(base)
+            stem, ext = os.path.splitext(filename)
+            stem = stem[:len(stem) - (len(name) - max_length)]
+            if not stem:
+                raise SuspiciousFileOperation(f'파일 이름을 {max_length}자 안으로 줄일 수 없습니다: {base}')
+            name = versioned_name(os.path.join(directory, stem + ext), digest.hexdigest())
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db.models import Max, Min, Prefetch
+from django.utils import timezone
+
+from .models import ChangeLog
+
+
+DEFAULT_SYNC_LIMIT = 200
+MAX_SYNC_LIMIT = 1000
+
+
+class SyncExpired(Exception):
+    """요청한 토큰 이후의 변경 기록이 이미 정리됨 (전체 재동기화 필요)"""
+
+    def __init__(self, reset_token):
+        super().__init__(reset_token)
+        self.reset_token = reset_token  # 전체 목록을 받은 뒤 이어서 요청할 토큰
+
+
+def record_change(entity, object_id, action='upsert'):
+    ChangeLog.objects.create(entity=entity, object_id=object_id, action=action)
+
+
+def record_changes(entity, object_ids, action='upsert', batch_size=1000):
+    """bulk_create 등 시그널이 발생하지 않는 일괄 처리용"""
+    ChangeLog.objects.bulk_create(
+        (ChangeLog(entity=entity, object_id=object_id, action=action) for object_id in object_ids),
+        batch_size=batch_size,
+    )
+
+
+def _feeds(ids, user):
+    from feeds.models import Feed, FeedImage
+    from feeds.serializers import FeedSerializer
+
+    queryset = Feed.objects.filter(id__in=ids).select_related('user').prefetch_related(
+        Prefetch('images', queryset=FeedImage.objects.order_by('order'))
+    )
+    if not user.is_staff:
+        # 비공개 피드는 작성자에게만 (다른 사용자에게는 삭제로 전달)
+        queryset = queryset.filter(status='published') | queryset.filter(user_id=user.id)
+    return queryset, FeedSerializer
+
+
+def _feed_images(ids, user):
+    from feeds.models import FeedImage
+    from feeds.serializers import FeedImageSerializer
+
+    class SyncFeedImageSerializer(FeedImageSerializer):
+        class Meta(FeedImageSerializer.Meta):
+            fields = FeedImageSerializer.Meta.fields + ['feed']
+
+    queryset = FeedImage.objects.filter(id__in=ids)
+    if not user.is_staff:
+        queryset = queryset.filter(feed__status='published') | queryset.filter(feed__user_id=user.id)
+    return queryset, SyncFeedImageSerializer
+
+
+def _artifacts(ids, user):
+    from artifacts.models import Artifact
+    from artifacts.serializers import ArtifactSerializer
+
+    queryset = Artifact.objects.filter(id__in=ids)
+    if not user.is_staff:
+        queryset = queryset.exclude(status='rejected')  # 거부된 유물은 관리자만 (다른 사용자에게는 삭제로 전달)
+    return queryset, ArtifactSerializer
+
+
+def _models(ids, user):
+    from model3d.models import Model3D
+    from model3d.serializers import Model3DSerializer
+
+    queryset = Model3D.objects.filter(id__in=ids).select_related('artifact').prefetch_related('source_images')
+    if not user.is_staff:
+        queryset = queryset.filter(status='completed')  # 완료된 모델만 공개
+    return queryset, Model3DSerializer
+
+
+# 엔티티 이름 -> (id 목록, 요청 사용자) 로 보이는 객체 쿼리셋과 시리얼라이저를 반환하는 함수
+ENTITIES = {
+    'feeds': _feeds,
+    'feed_images': _feed_images,
+    'artifacts': _artifacts,
+    'models': _models,
+}
+
+
+def _commit_cutoff():
+    # seq 는 할당 순서일 뿐 커밋 순서가 아니므로, 먼저 할당된 seq 가 나중에 커밋될 수 있다
+    # 이 시간보다 오래된 기록만 내보내 진행 중인 트랜잭션의 기록을 토큰이 건너뛰지 않게 한다
+    return timezone.now() - timezone.timedelta(seconds=getattr(settings, 'SYNC_COMMIT_LAG_SECONDS', 10))
+
+
+def collect_changes(since, limit, user):
+    """
+    since 이후 변경을 최대 limit 개 기록까지 모아 반환
+    같은 객체의 여러 변경은 하나로 합치고, 삭제되었거나 볼 수 없게 된 객체는 tombstone 으로 보낸다
+    최근 SYNC_COMMIT_LAG_SECONDS 안의 기록은 다음 요청에서 내보낸다
+    반환: (changes, deleted, next_token, has_more)
+    """
+    cutoff = _commit_cutoff()
+    # 처음부터 받는 요청(since=0)도 정리된 기록이 있으면 일부만 받게 되므로 만료 처리
+    first = ChangeLog.objects.aggregate(first=Min('seq'))['first']
+    if first is not None and since < first - 1:
+        reset_token = ChangeLog.objects.filter(created_at__lt=cutoff).aggregate(last=Max('seq'))['last']
+        raise SyncExpired(reset_token or first - 1)
+
+    rows = list(
+        ChangeLog.objects.filter(seq__gt=since).order_by('seq')
+        .values_list('seq', 'entity', 'object_id', 'action', 'created_at')[:limit + 1]
+    )
+    # 커밋 대기 구간에 들어간 첫 기록부터는 이번 응답에서 제외 (seq 순서가 끊기지 않도록 그 앞까지만)
+    for index, row in enumerate(rows):
+        if row[4] >= cutoff:
+            rows = rows[:index]
+            break
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_token = rows[-1][0] if rows else since
+
+    # 객체별 마지막 동작만 남김
+    latest = {}
+    for _, entity, object_id, action, _ in rows:
+        latest[(entity, object_id)] = action
+
+    changes, deleted = {}, {}
+    for entity, loader in ENTITIES.items():
+        upserts = [object_id for (name, object_id), action in latest.items() if name == entity and action == 'upsert']
+        removed = {object_id for (name, object_id), action in latest.items() if name == entity and action == 'delete'}
+        changes[entity] = []
+        if upserts:
+            queryset, serializer_class = loader(upserts, user)
+            objects = list(queryset.distinct())
+            visible = {obj.pk for obj in objects}
+            removed.update(object_id for object_id in upserts if object_id not in visible)
+            changes[entity] = serializer_class(objects, many=True).data
+        deleted[entity] = sorted(str(object_id) for object_id in removed)
+    return changes, deleted, next_token, has_more
@@ -0,0 +1,809 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import time
+from unittest import skipUnless
+
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from users.models import User, CustomToken
+from artifacts.models import Artifact, ArtifactFeed
+from feeds.models import Feed, FeedImage
+from model3d.models import Model3D
+from . import events
+from .db_routers import ReadReplicaRouter, pinned_to_primary, replica_aliases, replica_reads_allowed, request_replica
+
+# 복제본 라우팅 통합 테스트는 SQLite 별칭을 복제본 대용으로 사용한다 (SQLite 는 기본 1개, ONGI_DB_REPLICAS 로 변경)
+#   ONGI_DB_ENGINE=sqlite3 python manage.py test core
+REPLICAS = replica_aliases()
+
+# TestCase 의 트랜잭션 안에서 만든 데이터는 복제본 연결에서 보이지 않으므로
+# feeds/artifacts/model3d 에 GET 요청을 보내는 TestCase 는 라우터 없이 primary 에서 읽는다
+primary_reads = override_settings(DATABASE_ROUTERS=[])
+
+
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        self.router.replicas = ['replica_0', 'replica_1']
+        self.router._cycle = iter(['replica_0', 'replica_1'] * 10)
+        self.tokens = [replica_reads_allowed.set(False), pinned_to_primary.set(False), request_replica.set(None)]
+
+    def tearDown(self):
+        replica_reads_allowed.reset(self.tokens[0])
+        pinned_to_primary.reset(self.tokens[1])
+        request_replica.reset(self.tokens[2])
+
+    def test_reads_go_to_primary_outside_read_requests(self):
+        self.assertEqual(self.router.db_for_read(Feed), 'default')
+
+    def test_each_request_sticks_to_one_replica(self):
+        replica_reads_allowed.set(True)
+        self.assertEqual(self.router.db_for_read(Feed), 'replica_0')
+        self.assertEqual(self.router.db_for_read(Artifact), 'replica_0')
+        request_replica.set(None)  # 다음 요청
+        self.assertEqual(self.router.db_for_read(Feed), 'replica_1')
+
+    def test_users_reads_stay_on_primary(self):
+        replica_reads_allowed.set(True)
+        self.assertEqual(self.router.db_for_read(CustomToken), 'default')
+
+    def test_write_pins_following_reads_to_primary(self):
+        replica_reads_allowed.set(True)
+        self.assertEqual(self.router.db_for_write(Feed), 'default')
+        self.assertEqual(self.router.db_for_read(Feed), 'default')
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'feeds'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'feeds'))
+
+
+@skipUnless(REPLICAS, 'ONGI_DB_REPLICAS 로 복제본 별칭이 설정되어야 합니다.')
+class ReplicaRoutingRequestTests(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.token = CustomToken.objects.create(user=self.user)
+        Feed.objects.create(user=self.user, artifact_name='청자')
+
+    def _aliases_used(self, method, url):
+        used = set()
+
+        def wrapper(alias):
+            def _wrapper(execute, sql, params, many, context):
+                used.add(alias)
+                return execute(sql, params, many, context)
+            return _wrapper
+
+        for alias in connections:
+            connections[alias].execute_wrappers.append(wrapper(alias))
+        try:
+            response = getattr(self.client, method)(url, HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        finally:
+            for alias in connections:
+                connections[alias].execute_wrappers.pop()
+        return response, used
+
+    def test_feed_list_reads_from_replica(self):
+        response, used = self._aliases_used('get', '/api/feeds/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+        self.assertEqual(len(used & set(REPLICAS)), 1)
+
+    def test_user_endpoints_stay_on_primary(self):
+        response, used = self._aliases_used('get', f'/api/users/{self.user.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(used, {'default'})
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        from .metrics import registry
+
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.user = User.objects.create_user(username='ops', email='ops@example.com', password='pw')
+        self.user.is_staff = True
+        self.user.save()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+
+    def test_render_time_recorded_per_route(self):
+        self.client.get('/api/users/leaderboard/')
+        routes = {route['route']: route for route in self.client.get('/api/metrics/').json()['routes']}
+        stats = routes['api/users/leaderboard/']
+        self.assertEqual(stats['render_seconds']['count'], 1)
+        self.assertIn('ongi_request_render_seconds_count', self.client.get('/api/metrics/prometheus/').content.decode())
+
+    @primary_reads
+    def test_serialize_time_measured_from_serializer_data(self):
+        from unittest import mock
+
+        from .serializers import measured_data
+
+        Feed.objects.create(user=self.user, artifact_name='청자', status='published')
+        with mock.patch('core.serializers.measured_data', side_effect=measured_data) as measured:
+            self.client.get('/api/feeds/')
+        self.assertEqual(measured.call_count, 1)
+        routes = {route['route']: route for route in self.client.get('/api/metrics/').json()['routes']}
+        serialize = routes['api/feeds/']['serialize_seconds']
+        self.assertEqual(serialize['count'], 1)
+        self.assertGreater(serialize['sum'], 0)
+        self.assertIn('ongi_request_serialize_seconds_count', self.client.get('/api/metrics/prometheus/').content.decode())
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    def setUp(self):
+        self.broker = events.InProcessBroker()
+
+    def test_delivers_only_subscribed_topics(self):
+        subscription = self.broker.subscribe(['model3d:a'])
+        self.broker.publish(['model3d:b'], 'model3d.status', {'status': 'processing'})
+        self.broker.publish(['model3d:a'], 'model3d.status', {'status': 'completed'})
+        self.assertEqual(subscription.get(timeout=0.1).data, {'status': 'completed'})
+        self.assertIsNone(subscription.get(timeout=0.01))
+
+    def test_replays_events_after_last_event_id(self):
+        self.broker.publish(['artifacts'], 'artifact.created', {'name': 'a'})
+        self.broker.publish(['artifacts'], 'artifact.created', {'name': 'b'})
+        subscription = self.broker.subscribe(['artifacts'], last_event_id=1)
+        self.assertEqual(subscription.get(timeout=0.1).data, {'name': 'b'})
+
+    def test_skips_events_already_replayed(self):
+        subscription = self.broker.subscribe(['artifacts'])
+        subscription.replayed_through = 1  # 다른 워커의 기록에서 이미 재전송한 이벤트
+        self.broker.publish(['artifacts'], 'artifact.created', {'name': 'a'})
+        self.broker.publish(['artifacts'], 'artifact.created', {'name': 'b'})
+        self.assertEqual(subscription.get(timeout=0.1).data, {'name': 'b'})
+        self.assertIsNone(subscription.get(timeout=0.01))
+
+    def test_close_unsubscribes(self):
+        self.broker.subscribe(['artifacts']).close()
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+
+@override_settings(EVENTS_HEARTBEAT_SECONDS=1, EVENTS_STREAM_MAX_SECONDS=0)
+class EventPublishTests(TestCase):
+    def setUp(self):
+        events._broker = events.InProcessBroker()
+
+    def tearDown(self):
+        events._broker = None
+
+    def test_model_status_change_is_published_after_commit(self):
+        artifact = Artifact.objects.create(name='석조여래좌상')
+        model = Model3D.objects.create(artifact=artifact)
+        subscription = events.get_broker().subscribe([f'artifact:{artifact.id}'])
+        model = Model3D.objects.get(id=model.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model.status = 'completed'
+            model.progress = 100
+            model.save()
+            model.description = '설명'
+            model.save()  # 상태 변화 없음 - 발행하지 않음
+
+        event = subscription.get(timeout=0.1)
+        self.assertEqual(event.type, 'model3d.status')
+        self.assertEqual((event.data['status'], event.data['progress']), ('completed', 100))
+        self.assertIsNone(subscription.get(timeout=0.01))
+
+    def test_unfinished_model_events_only_reach_staff(self):
+        artifact = Artifact.objects.create(name='금동관')
+        subscription = events.get_broker().subscribe([f'artifact:{artifact.id}'])
+        staff_subscription = events.get_broker().subscribe([f'artifact:{artifact.id}'], staff=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            model = Model3D.objects.create(artifact=artifact, status='processing', model_url='models/draft.glb')
+        self.assertIsNone(subscription.get(timeout=0.01))
+        self.assertEqual(staff_subscription.get(timeout=0.1).data['status'], 'processing')
+        with self.captureOnCommitCallbacks(execute=True):
+            model.status = 'completed'
+            model.save()
+        self.assertEqual(subscription.get(timeout=0.1).data['status'], 'completed')
+        replayed = events.get_broker().subscribe([f'artifact:{artifact.id}'], last_event_id=0)
+        self.assertEqual(replayed.get(timeout=0.1).data['status'], 'completed')
+
+    def test_model_url_hidden_until_completed(self):
+        artifact = Artifact.objects.create(name='금동관')
+        subscription = events.get_broker().subscribe([f'artifact:{artifact.id}'], staff=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            model = Model3D.objects.create(artifact=artifact, status='processing', model_url='models/draft.glb')
+        self.assertIsNone(subscription.get(timeout=0.1).data['model_url'])
+        with self.captureOnCommitCallbacks(execute=True):
+            model.status = 'completed'
+            model.save()
+        self.assertTrue(subscription.get(timeout=0.1).data['model_url'].endswith('models/draft.glb'))
+
+    def authenticate(self):
+        user = User.objects.create_user(username='events', email='events@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=user).key}'
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get('/api/events/', {'topics': 'artifacts'})
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_stream_rejects_unknown_topics(self):
+        self.authenticate()
+        response = self.client.get('/api/events/', {'topics': 'users'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_replays_missed_events(self):
+        self.authenticate()
+        events.get_broker().publish(['artifacts'], 'artifact.created', {'name': '청자'})
+        response = self.client.get('/api/events/', {'topics': 'artifacts'}, HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID='0')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('event: artifact.created', body)
+        self.assertIn('청자', body)
+
+
+@primary_reads
+@override_settings(SYNC_COMMIT_LAG_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='sync', email='sync@example.com', password='pw')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+
+    def sync(self, since=0, **params):
+        response = self.client.get('/api/sync/', {'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_returns_only_changes_after_token(self):
+        Feed.objects.create(user=self.other, artifact_name='첫 피드', status='published')
+        token = self.sync()['next_token']
+        feed = Feed.objects.create(user=self.other, artifact_name='새 피드', status='published')
+
+        data = self.sync(token)
+        self.assertEqual([row['id'] for row in data['changes']['feeds']], [str(feed.id)])
+        self.assertEqual(self.sync(data['next_token'])['changes']['feeds'], [])
+
+    def test_deleted_and_hidden_feeds_become_tombstones(self):
+        deleted = Feed.objects.create(user=self.other, artifact_name='삭제', status='published')
+        hidden = Feed.objects.create(user=self.other, artifact_name='숨김', status='published')
+        FeedImage.objects.create(feed=deleted, image_url='/media/feeds/x.jpg')
+        token = self.sync()['next_token']
+        deleted_id = str(deleted.id)
+        deleted.delete()
+        hidden.status = 'hidden'
+        hidden.save()
+
+        data = self.sync(token)
+        self.assertEqual(data['changes']['feeds'], [])
+        self.assertEqual(sorted(data['deleted']['feeds']), sorted([deleted_id, str(hidden.id)]))
+        self.assertEqual(len(data['deleted']['feed_images']), 1)
+
+    def test_rejected_artifacts_become_tombstones(self):
+        artifact = Artifact.objects.create(name='위작 의심', status='auto_generated')
+        token = self.sync()['next_token']
+        artifact.status = 'rejected'
+        artifact.save()
+
+        data = self.sync(token)
+        self.assertEqual(data['changes']['artifacts'], [])
+        self.assertEqual(data['deleted']['artifacts'], [str(artifact.id)])
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual([row['id'] for row in self.sync(token)['changes']['artifacts']], [str(artifact.id)])
+
+    def test_recent_records_wait_for_commit_lag(self):
+        from .models import ChangeLog
+
+        token = self.sync()['next_token']
+        feed = Feed.objects.create(user=self.other, artifact_name='커밋 대기', status='published')
+        with override_settings(SYNC_COMMIT_LAG_SECONDS=60):
+            # 더 낮은 seq 가 아직 커밋되지 않았을 수 있으므로 토큰을 넘기지 않음
+            data = self.sync(token)
+            self.assertEqual((data['changes']['feeds'], data['next_token']), ([], token))
+            ChangeLog.objects.update(created_at=timezone.now() - timezone.timedelta(minutes=5))
+            self.assertEqual([row['id'] for row in self.sync(token)['changes']['feeds']], [str(feed.id)])
+
+    def test_pruned_history_requires_reset(self):
+        from .models import ChangeLog
+
+        for index in range(3):
+            Feed.objects.create(user=self.other, artifact_name=f'피드 {index}', status='published')
+        latest = ChangeLog.objects.order_by('-seq').first().seq
+        ChangeLog.objects.exclude(seq=latest).delete()
+        response = self.client.get('/api/sync/', {'since': 0})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json()['next_token'], str(latest))
+        self.assertEqual(self.sync(latest)['changes']['feeds'], [])
+
+    def test_feed_views_do_not_record_changes(self):
+        from .models import ChangeLog
+
+        feed = Feed.objects.create(user=self.other, artifact_name='조회', status='published')
+        count = ChangeLog.objects.count()
+        self.assertEqual(self.client.get(f'/api/feeds/{feed.id}/').status_code, 200)
+        feed.refresh_from_db()
+        self.assertEqual(feed.view_count, 1)
+        self.assertEqual(ChangeLog.objects.count(), count)
+
+    def test_pages_are_bounded(self):
+        for index in range(5):
+            Feed.objects.create(user=self.other, artifact_name=f'피드 {index}', status='published')
+        first = self.sync(limit=3)
+        self.assertTrue(first['has_more'])
+        second = self.sync(first['next_token'], limit=3)
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['changes']['feeds']) + len(second['changes']['feeds']), 5)
+
+
+@primary_reads
+class BatchFetchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='batch', email='batch@example.com', password='pw')
+        self.artifacts = []
+        for index in range(10):
+            artifact = Artifact.objects.create(name=f'유물 {index}', status='verified')
+            feed = Feed.objects.create(user=self.user, artifact_name=artifact.name, status='published')
+            FeedImage.objects.create(feed=feed, image_url=f'/media/feeds/{index}.jpg')
+            ArtifactFeed.objects.create(artifact=artifact, feed=feed)
+            Model3D.objects.create(artifact=artifact, status='completed')
+            self.artifacts.append(artifact)
+
+    def query_count(self, url, ids):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(url, {'ids': ','.join(str(object_id) for object_id in ids)})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def assert_constant_queries(self, url, ids):
+        single, _ = self.query_count(url, ids[:1])
+        many, data = self.query_count(url, ids)
+        self.assertEqual(single, many)
+        self.assertEqual(len(data['results']), len(ids))
+
+    def test_artifact_batch_constant_queries(self):
+        self.assert_constant_queries('/api/artifacts/batch/', [artifact.id for artifact in self.artifacts])
+
+    def test_model_batch_constant_queries(self):
+        self.assert_constant_queries('/api/models/batch/', list(Model3D.objects.values_list('id', flat=True)))
+
+    def test_user_batch_constant_queries(self):
+        users = [self.user] + [
+            User.objects.create_user(username=f'u{index}', email=f'u{index}@example.com', password='pw')
+            for index in range(5)
+        ]
+        self.assert_constant_queries('/api/users/batch/', [user.id for user in users])
+
+    def test_missing_ids_reported_per_item(self):
+        hidden = Artifact.objects.create(name='거부', status='rejected')
+        unknown = '00000000-0000-0000-0000-000000000000'
+        _, data = self.query_count('/api/artifacts/batch/', [self.artifacts[0].id, unknown, hidden.id, 'nope'])
+        self.assertEqual([item['id'] for item in data['results']], [str(self.artifacts[0].id)])
+        self.assertEqual(sorted(item['id'] for item in data['missing']), sorted([unknown, str(hidden.id), 'nope']))
+        self.assertEqual(data['results'][0]['feed_count'], 1)
+        self.assertTrue(data['results'][0]['has_3d_model'])
+        self.assertEqual(data['results'][0]['thumbnail_url'], '/media/feeds/0.jpg')
+
+    @override_settings(BATCH_MAX_IDS=3)
+    def test_rejects_too_many_ids(self):
+        response = self.client.get('/api/artifacts/batch/', {'ids': ','.join(str(a.id) for a in self.artifacts)})
+        self.assertEqual(response.status_code, 400)
+
+
+@primary_reads
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='shape', email='shape@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+        self.artifact = Artifact.objects.create(name='금동대향로', status='verified')
+        for index in range(3):
+            feed = Feed.objects.create(user=self.user, artifact_name=self.artifact.name, status='published')
+            FeedImage.objects.create(feed=feed, image_url=f'/media/feeds/{index}.jpg')
+            ArtifactFeed.objects.create(artifact=self.artifact, feed=feed)
+        self.model = Model3D.objects.create(artifact=self.artifact, status='completed')
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_fields_limits_output_and_queries(self):
+        full, full_queries = self.get('/api/feeds/')
+        sparse, sparse_queries = self.get('/api/feeds/', fields='id,user.username')
+        self.assertEqual(set(sparse[0]), {'id', 'user'})
+        self.assertEqual(sparse[0]['user'], {'username': 'shape'})
+        self.assertIn('images', full[0])
+        self.assertLess(sparse_queries, full_queries)
+
+    def test_detail_defaults_unchanged_and_expansions_optional(self):
+        detail, _ = self.get(f'/api/models/{self.model.id}/')
+        self.assertEqual(detail['artifact_detail']['name'], '금동대향로')
+        self.assertIn('encodings', detail)
+        listed, _ = self.get('/api/models/')
+        self.assertNotIn('artifact_detail', listed[0])
+        expanded, _ = self.get('/api/models/', expand='artifact_detail', fields='id,artifact_detail.feed_count')
+        self.assertEqual(expanded[0], {'id': str(self.model.id), 'artifact_detail': {'feed_count': 3}})
+
+    def test_expanded_artifact_feeds_are_prefetched(self):
+        _, one = self.get('/api/artifacts/', expand='feeds')
+        for index in range(3):
+            Artifact.objects.create(name=f'유물 {index}', status='verified')
+        data, many = self.get('/api/artifacts/', expand='feeds')
+        self.assertEqual(one, many)
+        self.assertEqual(len(next(item for item in data if item['id'] == str(self.artifact.id))['feeds']), 3)
+
+
+class GeoTests(SimpleTestCase):
+    def test_geohash_encode_and_bounds(self):
+        from .geo import geohash_bounds, geohash_encode
+
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        min_lat, min_lng, max_lat, max_lng = geohash_bounds(geohash_encode(37.5665, 126.978, 6))
+        self.assertTrue(min_lat <= 37.5665 <= max_lat and min_lng <= 126.978 <= max_lng)
+
+    def test_covering_prefixes_contain_every_point_in_radius(self):
+        import math
+        import random
+        from .geo import EARTH_RADIUS_KM, covering_prefixes, geohash_encode, haversine_km
+
+        rng = random.Random(32)
+        for lat, lng, radius_km in ((37.5665, 126.978, 3), (35.1796, 129.0756, 40), (64.1, -179.99, 15), (-33.9, 18.4, 0.2)):
+            prefixes = covering_prefixes(lat, lng, radius_km)
+            for _ in range(200):
+                # 반경 안의 임의 지점 (방위각/거리로 생성)
+                bearing, distance = rng.uniform(0, 2 * math.pi), radius_km * math.sqrt(rng.random())
+                d_lat = math.degrees(distance * math.cos(bearing) / EARTH_RADIUS_KM)
+                d_lng = math.degrees(distance * math.sin(bearing) / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+                point = (lat + d_lat, (lng + d_lng + 180) % 360 - 180)
+                if haversine_km(lat, lng, *point) > radius_km:
+                    continue
+                self.assertTrue(geohash_encode(*point).startswith(tuple(prefixes)), (lat, lng, point))
+
+
+@override_settings(FRAGMENT_CACHE_ENABLED=True)
+@primary_reads
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import caches
+
+        caches['fragments'].clear()
+        self.user = User.objects.create_user(username='fragment', email='fragment@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+        self.artifact = Artifact.objects.create(name='백자 달항아리', status='verified')
+        feed = Feed.objects.create(user=self.user, artifact_name=self.artifact.name, status='published')
+        FeedImage.objects.create(feed=feed, image_url='/media/feeds/moon.jpg')
+        ArtifactFeed.objects.create(artifact=self.artifact, feed=feed)
+
+    def test_fragments_reused_until_object_bumped(self):
+        from . import fragments
+
+        first = self.client.get('/api/feeds/').json()
+        # 시그널 없는 update() 는 버전을 올리기 전까지 캐시된 조각이 그대로 쓰인다
+        User.objects.filter(id=self.user.id).update(username='renamed')
+        self.assertEqual(self.client.get('/api/feeds/').json(), first)
+        with self.captureOnCommitCallbacks(execute=True):
+            fragments.bump(User, [self.user.id])
+        self.assertEqual(self.client.get('/api/feeds/').json()[0]['user']['username'], 'renamed')
+
+    def test_dependency_save_invalidates_artifact(self):
+        url = f'/api/artifacts/{self.artifact.id}/'
+        self.assertFalse(self.client.get(url).json()['has_3d_model'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Model3D.objects.create(artifact=self.artifact, status='completed')
+        self.assertTrue(self.client.get(url).json()['has_3d_model'])
+
+
+class MediaShardingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def write(self, path, data=b'data'):
+        os.makedirs(os.path.dirname(os.path.join(self.media_root, path)), exist_ok=True)
+        with open(os.path.join(self.media_root, path), 'wb') as file:
+            file.write(data)
+
+    def test_migrates_legacy_paths_and_keeps_old_files(self):
+        from django.core.management import call_command
+        import hashlib
+        from .media_layout import feed_image_path, is_sharded, model_file_path, profile_image_path, versioned_name
+
+        user = User.objects.create_user(username='shard', email='shard@example.com', password='pw')
+        feed = Feed.objects.create(user=user, artifact_name='청동거울', status='published')
+        other = Feed.objects.create(user=user, artifact_name='청동거울', status='published')
+        legacy = f'feeds/{feed.id}/image_0_a.jpg'
+        self.write(legacy)
+        self.write(f'thumbnails/300/{legacy}')
+        FeedImage.objects.create(feed=feed, image_url=f'/media/{legacy}')
+        FeedImage.objects.create(feed=other, image_url=f'/media/{legacy}')  # 업로드 중복 제거로 공유된 파일
+        self.write(f'{user.id}/profile/profile.jpg')
+        User.objects.filter(id=user.id).update(profile_image=f'/media/{user.id}/profile/profile.jpg')
+        model = Model3D.objects.create(artifact=Artifact.objects.create(name='청동거울'), model_url=f'models/{user.id}.glb')
+        self.write(f'models/{user.id}.glb')
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command('shard_media', stdout=open(os.devnull, 'w'))
+            call_command('shard_media', stdout=open(os.devnull, 'w'))  # 다시 실행해도 변화 없음
+
+        digest = hashlib.sha256(b'data').hexdigest()
+        target = versioned_name(feed_image_path(feed.id, 'image_0_a.jpg'), digest)
+        self.assertTrue(is_sharded(target))
+        self.assertEqual(set(FeedImage.objects.values_list('image_url', flat=True)), {f'/media/{target}'})
+        self.assertTrue(os.path.isfile(os.path.join(self.media_root, target)))
+        self.assertTrue(os.path.isfile(os.path.join(self.media_root, 'thumbnails/300', target)))
+        self.assertTrue(os.path.isfile(os.path.join(self.media_root, legacy)))  # 이전 파일은 GC 가 정리
+        self.assertEqual(User.objects.get(id=user.id).profile_image, f'/media/{versioned_name(profile_image_path(user.id), digest)}')
+        model.refresh_from_db()
+        self.assertEqual(model.model_url.name, versioned_name(model_file_path(model.id, f'{user.id}.glb'), digest))
+
+
+@skipUnless(
+    importlib.util.find_spec('msgpack') and importlib.util.find_spec('cbor2'),
+    'msgpack, cbor2 패키지가 설치되어야 합니다.',
+)
+@primary_reads
+class BinaryFormatTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='binary', email='binary@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+        self.feed = Feed.objects.create(user=self.user, artifact_name='청자 상감운학문 매병', status='published')
+
+    def test_msgpack_uses_native_uuid_and_timestamp(self):
+        import datetime
+        import uuid
+        import msgpack
+        from .parsers import _msgpack_ext_hook
+
+        response = self.client.get('/api/feeds/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        item = msgpack.unpackb(response.content, raw=False, timestamp=3, ext_hook=_msgpack_ext_hook)[0]
+        self.assertEqual(item['id'], self.feed.id)
+        self.assertIsInstance(item['user']['id'], uuid.UUID)
+        self.assertIsInstance(item['created_at'], datetime.datetime)
+        self.assertEqual(item['artifact_name'], '청자 상감운학문 매병')
+
+    def test_text_fields_keep_string_type(self):
+        import uuid
+        import msgpack
+        from .parsers import _msgpack_ext_hook
+
+        text = str(uuid.uuid4())
+        Feed.objects.filter(id=self.feed.id).update(artifact_name=text)
+        response = self.client.get(f'/api/feeds/{self.feed.id}/', HTTP_ACCEPT='application/msgpack')
+        item = msgpack.unpackb(response.content, raw=False, timestamp=3, ext_hook=_msgpack_ext_hook)
+        self.assertEqual(item['artifact_name'], text)  # 사용자 입력은 UUID 모양이어도 문자열
+        self.assertEqual(item['id'], self.feed.id)
+
+    def test_cbor_round_trip(self):
+        import cbor2
+
+        response = self.client.get(f'/api/feeds/{self.feed.id}/', HTTP_ACCEPT='application/cbor')
+        self.assertEqual(response['Content-Type'], 'application/cbor')
+        item = cbor2.loads(response.content)
+        self.assertEqual(item['id'], self.feed.id)
+        self.assertEqual(item['created_at'], self.feed.created_at.replace(microsecond=item['created_at'].microsecond))
+
+    def test_binary_request_body(self):
+        import msgpack
+
+        body = msgpack.packb({'artifact_name': '백자 바이너리', 'status': 'draft'})
+        response = self.client.post('/api/feeds/', body, content_type='application/msgpack', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['artifact_name'], '백자 바이너리')
+        response = self.client.post('/api/feeds/', b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/feeds/', b'\xff\xff', content_type='application/cbor')
+        self.assertEqual(response.status_code, 400)
+
+
+class HomeScreenTests(TestCase):
+    def setUp(self):
+        from artifacts.trending import get_trending
+
+        get_trending().reset()
+        self.user = User.objects.create_user(username='home', email='home@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+        Feed.objects.create(user=self.user, artifact_name='백자', status='published')
+        Feed.objects.create(user=self.user, artifact_name='청자', status='draft')
+        artifact = Artifact.objects.create(name='백자', status='verified')
+        Model3D.objects.create(artifact=artifact, status='completed')
+        Model3D.objects.create(artifact=artifact, status='processing')
+
+    @override_settings(HOME_WORKERS=0)
+    def test_sections_in_one_response(self):
+        data = self.client.get('/api/home/').json()
+        self.assertEqual(data['errors'], {})
+        self.assertEqual(data['user']['username'], 'home')
+        self.assertEqual([feed['artifact_name'] for feed in data['feeds']], ['백자'])
+        self.assertEqual([model['status'] for model in data['models']], ['completed'])
+        self.assertEqual([artifact['name'] for artifact in data['artifacts']], ['백자'])  # 3D 모델 완성 점수
+        self.assertEqual(list(self.client.get('/api/home/?sections=user').json()), ['user', 'errors'])
+        self.assertEqual(self.client.get('/api/home/?sections=user,unknown').status_code, 400)
+
+    @override_settings(HOME_WORKERS=2, HOME_SECTION_TIMEOUTS={'slow': 0.1})
+    def test_failing_sections_degrade(self):
+        import threading
+        from unittest import mock
+        from . import home
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def broken(user, limit):
+            raise RuntimeError('boom')
+
+        sections = {'user': home.SECTIONS['user'], 'broken': broken, 'slow': lambda user, limit: release.wait(5)}
+        with mock.patch.dict(home.SECTIONS, sections, clear=True), self.assertLogs('core.home', 'WARNING') as logs:
+            response = self.client.get('/api/home/?sections=user,broken,slow')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['user']['username'], 'home')
+        self.assertIsNone(data['broken'])
+        self.assertIsNone(data['slow'])
+        self.assertEqual(data['errors'], {'broken': 'error', 'slow': 'timeout'})
+        self.assertTrue(any('broken' in line and 'RuntimeError' in line for line in logs.output))
+
+    @override_settings(HOME_WORKERS=2, HOME_MAX_IN_FLIGHT=1, HOME_SECTION_TIMEOUTS={'slow': 0.05})
+    def test_stuck_sections_do_not_queue_up(self):
+        import threading
+        from unittest import mock
+        from . import home
+        from .metrics import registry
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+        sections = {'slow': lambda user, limit: release.wait(5), 'user': home.SECTIONS['user']}
+        with mock.patch.dict(home.SECTIONS, sections, clear=True):
+            with self.assertLogs('core.home', 'WARNING'):
+                self.assertEqual(self.client.get('/api/home/?sections=slow').json()['errors'], {'slow': 'timeout'})
+                # 버려진 섹션이 아직 실행 중이므로 새 섹션은 기다리지 않고 바로 busy
+                data = self.client.get('/api/home/?sections=user').json()
+            self.assertEqual(data['errors'], {'user': 'busy'})
+            self.assertEqual(registry.gauges()['ongi_home_sections_in_flight'], 1)
+            release.set()
+            for _ in range(100):
+                if not home._in_flight:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(self.client.get('/api/home/?sections=user').json()['errors'], {})
+
+
+class MediaGCTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        user = User.objects.create_user(username='gc', email='gc@example.com', password='pw')
+        self.feed = Feed.objects.create(user=user, artifact_name='금관', status='published')
+        FeedImage.objects.create(feed=self.feed, image_url='/media/feeds/kept.jpg')
+
+    def write(self, path, age=7200):
+        full_path = os.path.join(self.media_root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as file:
+            file.write(b'x')
+        past = time.time() - age
+        os.utime(full_path, (past, past))
+        return full_path
+
+    def age_dir(self, path, age=7200):
+        past = time.time() - age
+        os.utime(os.path.join(self.media_root, path), (past, past))
+
+    def test_full_scan_quarantines_unreferenced_files(self):
+        from .media_gc import QUARANTINE_DIR, MediaGC
+
+        self.write('feeds/kept.jpg')
+        self.write('thumbnails/150/feeds/kept.jpg')
+        orphan = self.write('feeds/orphan.jpg')
+        fresh = self.write('feeds/uploading.jpg', age=10)
+        os.makedirs(os.path.join(self.media_root, 'old-empty'))
+        os.makedirs(os.path.join(self.media_root, 'new-empty'))  # 업로드가 막 만든 폴더
+        self.age_dir('old-empty')
+
+        gc = MediaGC(grace_seconds=3600)
+        stats = gc.full_scan()
+        self.assertEqual(stats['quarantined'], 1)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, QUARANTINE_DIR, gc.batch, 'feeds/orphan.jpg')))
+        self.assertTrue(os.path.exists(fresh))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'thumbnails/150/feeds/kept.jpg')))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'old-empty')))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'new-empty')))
+
+    def test_dry_run_changes_nothing(self):
+        from .media_gc import QUARANTINE_DIR, MediaGC
+
+        orphan = self.write('feeds/orphan.jpg')
+        os.makedirs(os.path.join(self.media_root, 'old-empty'))
+        self.age_dir('old-empty')
+        os.makedirs(os.path.join(self.media_root, QUARANTINE_DIR, '20000101000000'))
+
+        gc = MediaGC(dry_run=True, grace_seconds=3600)
+        gc.purge_quarantine(days=7)
+        self.assertEqual(gc.full_scan()['quarantined'], 1)
+        self.assertEqual(gc.stats['purged'], 1)
+        self.assertTrue(os.path.exists(orphan))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'old-empty')))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, QUARANTINE_DIR, '20000101000000')))
+
+    def test_purge_removes_expired_batches_only(self):
+        from django.utils import timezone
+        from .media_gc import QUARANTINE_DIR, MediaGC
+
+        recent = timezone.now().strftime('%Y%m%d%H%M%S')
+        for batch in ('20000101000000', recent):
+            self.write(f'{QUARANTINE_DIR}/{batch}/feeds/orphan.jpg')
+        self.assertEqual(MediaGC().purge_quarantine(days=7)['purged'], 1)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, QUARANTINE_DIR)), [recent])
+
+    def test_incremental_checks_candidates_and_derived_files(self):
+        from .media_gc import MediaGC
+        from .models import OrphanCandidate
+
+        self.write('feeds/kept.jpg')
+        orphan = self.write('feeds/deleted.jpg')
+        thumbnail = self.write('thumbnails/150/feeds/deleted.jpg')
+        OrphanCandidate.objects.create(path='feeds/deleted.jpg')
+        OrphanCandidate.objects.create(path='feeds/kept.jpg')
+
+        self.assertEqual(MediaGC(grace_seconds=3600).incremental()['quarantined'], 2)
+        self.assertFalse(os.path.exists(orphan))
+        self.assertFalse(os.path.exists(thumbnail))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'feeds/kept.jpg')))
+        self.assertFalse(OrphanCandidate.objects.exists())
+
+
+class BenchmarkCommandTests(TransactionTestCase):
+    # benchmark_api 는 워커 스레드의 별도 연결(복제본 포함)로 요청하므로 커밋된 데이터가 필요
+    databases = '__all__'
+
+    def generate(self):
+        import io
+
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command(
+            'generate_dataset', users=5, feeds=40, images_per_feed=2, artifacts=2, models=3, batch_size=16, seed=7,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_generate_dataset_creates_requested_rows(self):
+        output = self.generate()
+        self.assertIn('완료', output)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Feed.objects.count(), 40)
+        self.assertGreaterEqual(FeedImage.objects.count(), 40)  # 피드마다 1장 이상
+        published = Feed.objects.filter(status='published')
+        self.assertEqual(ArtifactFeed.objects.count(), published.count())
+        for user in User.objects.all():
+            self.assertEqual(user.feed_count, published.filter(user=user).count())
+        self.assertTrue(Artifact.objects.exists())
+        self.assertFalse(Artifact.objects.filter(image_count__lt=10).exists())  # 이미지 부족 유물은 제외
+        self.assertEqual(Model3D.objects.count(), 3)
+
+    def test_benchmark_api_runs_against_generated_data(self):
+        import io
+        import json
+
+        from django.core.management import call_command
+
+        self.generate()
+        User.objects.create_user(username='bench_admin', email='bench_admin@example.com', password='pw', is_staff=True)
+        out = io.StringIO()
+        call_command('benchmark_api', requests=2, concurrency=2, json=True, stdout=out)
+        results = {row['endpoint']: row for row in json.loads(out.getvalue())}
+        self.assertTrue({'feed-list', 'feed-detail', 'artifact-detail', 'model3d-list'} <= set(results))
+        for row in results.values():
+            self.assertEqual((row['requests'], row['errors']), (2, 0), row['endpoint'])
+            self.assertIsNotNone(row['p50_ms'])
+
+        out = io.StringIO()
+        call_command('benchmark_api', requests=1, concurrency=1, endpoints=['feed-list'], stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('endpoint'))
+        self.assertTrue(lines[2].startswith('feed-list'))
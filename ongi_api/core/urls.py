@@ -0,0 +1,16 @@
+from django.urls import path
+from .views import (
+    metrics_view,
+    prometheus_metrics_view,
+    event_stream_view,
+    sync_view,
+    home_view,
+)
+
+urlpatterns = [
+    path('metrics/', metrics_view, name='metrics'),  # 라우트별 메트릭 조회 (JSON)
+    path('metrics/prometheus/', prometheus_metrics_view, name='metrics-prometheus'),  # Prometheus 텍스트 형식
+    path('events/', event_stream_view, name='event-stream'),  # 3D 모델 상태/새 유물 실시간 이벤트 (SSE)
+    path('sync/', sync_view, name='sync'),  # 모바일 델타 동기화 (변경분 + 삭제 목록)
+    path('home/', home_view, name='home'),  # 홈 화면 섹션 묶음 (사용자, 3D 모델, 인기 유물, 최근 피드)
+]
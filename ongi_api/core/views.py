@@ -0,0 +1,163 @@
+import re
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from .events import get_broker
+from .home import DEFAULT_HOME_LIMIT, MAX_HOME_LIMIT, SECTIONS, build_home
+from .metrics import registry
+from .pagination import parse_page_size
+from .sync import DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT, SyncExpired, collect_changes
+
+
+# 구독 가능한 토픽: 새 유물, 유물별(유물 및 그 3D 모델), 3D 모델별
+TOPIC_PATTERN = re.compile(r'^(artifacts|artifact:[0-9a-f-]{36}|model3d:[0-9a-f-]{36})$')
+MAX_TOPICS = 20
+
+
+class EventStreamRenderer(BaseRenderer):
+    """text/event-stream 요청이 406 으로 거절되지 않도록 하는 렌더러 (응답은 스트림으로 직접 생성)"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """라우트별 요청 메트릭 조회 및 초기화 (관리자 전용)"""
+    if request.method == 'DELETE':
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    return Response({'routes': registry.snapshot(), 'gauges': registry.gauges()})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def prometheus_metrics_view(request):
+    """Prometheus 스크레이프용 텍스트 메트릭 (관리자 전용)"""
+    return HttpResponse(registry.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def _event_stream(subscription, heartbeat, max_seconds):
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield f'retry: {heartbeat * 1000}\n\n'
+        while True:
+            event = subscription.get(timeout=heartbeat)
+            yield event.encode() if event else ': ping\n\n'
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        subscription.close()
+
+
+async def _async_event_stream(subscription, heartbeat, max_seconds):
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield f'retry: {heartbeat * 1000}\n\n'
+        while True:
+            event = await subscription.aget(timeout=heartbeat)
+            yield event.encode() if event else ': ping\n\n'
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        subscription.close()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def event_stream_view(request):
+    """
+    Server-Sent Events 구독 (?topics=artifacts,artifact:<id>,model3d:<id>)
+    완료되지 않은 3D 모델/거부된 유물 이벤트는 관리자에게만 전달한다
+    연결은 EVENTS_STREAM_MAX_SECONDS 후 끊기며, 클라이언트는 Last-Event-ID 로 이어 받는다
+    """
+    topics = [topic for topic in request.query_params.get('topics', '').split(',') if topic]
+    if not topics or len(topics) > MAX_TOPICS or not all(TOPIC_PATTERN.match(topic) for topic in topics):
+        return Response({"detail": "유효하지 않은 토픽입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    subscription = get_broker().subscribe(topics, last_event_id, staff=request.user.is_staff)
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT_SECONDS', 15)
+    max_seconds = getattr(settings, 'EVENTS_STREAM_MAX_SECONDS', 300)
+    # ASGI 에서는 이벤트 루프에서 대기하고, WSGI 에서는 연결당 워커 스레드 하나를 사용
+    stream = _async_event_stream if isinstance(request._request, ASGIRequest) else _event_stream
+    response = StreamingHttpResponse(stream(subscription, heartbeat, max_seconds), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 해제
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_view(request):
+    """
+    델타 동기화 (?since=<next_token>&limit=)
+    since 이후 바뀐 피드/피드 이미지/유물/3D 모델과 삭제된 id 목록을 반환한다
+    has_more 가 false 가 될 때까지 next_token 으로 이어서 요청한다
+    """
+    try:
+        since = int(request.query_params.get('since') or 0)
+        limit = parse_page_size(request.query_params.get('limit'), DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT)
+        if since < 0:
+            raise ValueError
+    except ValueError:
+        return Response({"detail": "유효하지 않은 since/limit 값입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        changes, deleted, next_token, has_more = collect_changes(since, limit, request.user)
+    except SyncExpired as e:
+        return Response(
+            {
+                "detail": "동기화 기록이 만료되었습니다. 전체 목록을 다시 받아야 합니다.",
+                "reset": True,
+                "next_token": str(e.reset_token),  # 전체 목록을 받은 뒤 이 토큰부터 동기화
+            },
+            status=status.HTTP_410_GONE,
+        )
+
+    return Response({
+        'changes': changes,
+        'deleted': deleted,
+        'next_token': str(next_token),
+        'has_more': has_more,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_view(request):
+    """
+    홈 화면 묶음 조회 (?sections=user,models,artifacts,feeds&limit=)
+    섹션을 동시에 조회하며, 실패하거나 제한 시간을 넘긴 섹션은 null 과 errors 의 이유('error'/'timeout'/'busy')로 표시한다
+    """
+    names = [name for name in (request.query_params.get('sections') or ','.join(SECTIONS)).split(',') if name]
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown or not names:
+        return Response(
+            {"detail": f"알 수 없는 섹션입니다: {', '.join(unknown)}" if unknown else "sections 가 비어 있습니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        limit = parse_page_size(request.query_params.get('limit'), DEFAULT_HOME_LIMIT, MAX_HOME_LIMIT)
+    except ValueError:
+        return Response({"detail": "limit 은 1 이상의 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    data, errors = build_home(request.user, list(dict.fromkeys(names)), limit)
+    return Response({**data, 'errors': errors})
@@ -0,0 +1,272 @@
+"""
+크기를 미리 알 수 있는 스트리밍 ZIP
+- 사진/GLB 는 이미 압축되어 있으므로 무압축(stored)으로 담는다
+- 파일 크기만으로 전체 배치를 계산하므로 Content-Length 와 Range(이어받기)를 지원한다
+- CRC 는 데이터 뒤의 data descriptor 와 중앙 디렉터리에 기록하며, 스트리밍하면서 계산해 캐시한다
+- 4GB 를 넘는 항목/오프셋은 ZIP64 확장 필드를 사용한다
+"""
+import hashlib
+import os
+import struct
+import time
+import zlib
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+
+CHUNK_SIZE = 256 * 1024
+ZIP64_LIMIT = 0xFFFFFFFF
+FLAGS = 0x0008 | 0x0800  # data descriptor 사용, 파일 이름 UTF-8
+CRC_CACHE_TIMEOUT = 7 * 24 * 3600
+
+
+class ZipEntry:
+    """아카이브에 담을 파일 (로컬 경로 기준)"""
+
+    def __init__(self, name, path):
+        stat = os.stat(path)
+        self.name = name
+        self.path = path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.crc = None
+
+    @property
+    def zip64(self):
+        return self.size >= ZIP64_LIMIT
+
+    @property
+    def cache_key(self):
+        digest = hashlib.sha1(f'{self.path}:{self.size}:{self.mtime}'.encode()).hexdigest()
+        return f'zipstream:crc:{digest}'
+
+    def dos_time(self):
+        t = time.localtime(self.mtime)
+        year = max(t.tm_year, 1980)
+        return (
+            (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+        )
+
+    def ensure_crc(self):
+        """CRC (캐시에 없으면 파일을 읽어 계산)"""
+        if self.crc is None:
+            self.crc = cache.get(self.cache_key)
+        if self.crc is None:
+            crc = 0
+            with open(self.path, 'rb') as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+                    crc = zlib.crc32(chunk, crc)
+            self.set_crc(crc)
+        return self.crc
+
+    def set_crc(self, crc):
+        self.crc = crc
+        cache.set(self.cache_key, crc, CRC_CACHE_TIMEOUT)
+
+
+class ZipStream:
+    """
+    항목 목록으로 ZIP 바이트 배치를 계산하고, 임의 구간을 스트리밍으로 생성
+    메모리는 청크 하나와 항목 메타데이터만 사용하고 임시 파일을 만들지 않는다
+    """
+
+    def __init__(self, entries):
+        self.entries = _unique_names(entries)
+        self.segments = []  # (시작 오프셋, 길이, 생성 함수(구간 시작, 구간 끝) -> bytes 반복자)
+        self._offsets = {}
+        offset = 0
+        for entry in self.entries:
+            self._offsets[id(entry)] = offset
+            header = self._local_header(entry)
+            offset = self._add(offset, len(header), _static(header))
+            offset = self._add(offset, entry.size, self._file_data(entry))
+            offset = self._add(offset, 24 if entry.zip64 else 16, self._descriptor(entry))
+        self.central_directory_offset = offset
+        central_directory_size = sum(len(self._central_header(entry, crc=0)) for entry in self.entries)
+        offset = self._add(offset, central_directory_size, self._central_directory())
+        end = self._end_records(offset - central_directory_size, central_directory_size, offset)
+        self.size = self._add(offset, len(end), _static(end))
+
+    def _add(self, offset, length, producer):
+        if length:
+            self.segments.append((offset, length, producer))
+        return offset + length
+
+    @property
+    def etag(self):
+        """항목 구성이 같으면 같은 값 (If-Range 검증용)"""
+        digest = hashlib.sha1()
+        for entry in self.entries:
+            digest.update(f'{entry.name}\0{entry.size}\0{entry.mtime}\n'.encode())
+        return f'"{digest.hexdigest()}"'
+
+    def iter_range(self, start=0, end=None):
+        """[start, end] 구간 바이트 (end 포함, 생략 시 끝까지)"""
+        end = self.size - 1 if end is None else end
+        for offset, length, producer in self.segments:
+            if offset + length <= start:
+                continue
+            if offset > end:
+                break
+            for chunk in producer(max(start - offset, 0), min(end - offset, length - 1)):
+                yield chunk
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def _local_header(self, entry):
+        name = entry.name.encode()
+        dos_time, dos_date = entry.dos_time()
+        extra = b''
+        size = entry.size
+        if entry.zip64:
+            extra = struct.pack('<HHQQ', 0x0001, 16, entry.size, entry.size)
+            size = ZIP64_LIMIT
+        return struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 45 if entry.zip64 else 20, FLAGS, 0, dos_time, dos_date,
+            0, size, size, len(name), len(extra),
+        ) + name + extra
+
+    def _file_data(self, entry):
+        def produce(start, end):
+            # 처음부터 끝까지 보내는 경우에만 보내면서 CRC 계산
+            whole = start == 0 and end == entry.size - 1 and entry.crc is None
+            crc = 0
+            with open(entry.path, 'rb') as file:
+                file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = file.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise OSError(f'파일 크기가 변경되었습니다: {entry.name}')
+                    if whole:
+                        crc = zlib.crc32(chunk, crc)
+                    remaining -= len(chunk)
+                    yield chunk
+            if whole:
+                entry.set_crc(crc)
+        return produce
+
+    def _descriptor(self, entry):
+        def produce(start, end):
+            crc = entry.ensure_crc()
+            if entry.zip64:
+                data = struct.pack('<IIQQ', 0x08074b50, crc, entry.size, entry.size)
+            else:
+                data = struct.pack('<IIII', 0x08074b50, crc, entry.size, entry.size)
+            yield data[start:end + 1]
+        return produce
+
+    def _central_header(self, entry, crc):
+        name = entry.name.encode()
+        dos_time, dos_date = entry.dos_time()
+        offset = self._offsets[id(entry)]
+        size, header_offset, extra_fields = entry.size, offset, []
+        if entry.zip64:
+            extra_fields += [entry.size, entry.size]
+            size = ZIP64_LIMIT
+        if offset >= ZIP64_LIMIT:
+            extra_fields.append(offset)
+            header_offset = ZIP64_LIMIT
+        extra = struct.pack(f'<HH{len(extra_fields)}Q', 0x0001, 8 * len(extra_fields), *extra_fields) if extra_fields else b''
+        version = 45 if extra else 20
+        return struct.pack(
+            '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, FLAGS, 0, dos_time, dos_date,
+            crc, size, size, len(name), len(extra), 0, 0, 0, 0o100644 << 16, header_offset,
+        ) + name + extra
+
+    def _central_directory(self):
+        def produce(start, end):
+            # 구간 밖 항목은 CRC 가 필요 없으므로 길이만 계산해 건너뜀
+            position = 0
+            for entry in self.entries:
+                length = len(self._central_header(entry, crc=0))
+                if position + length > start and position <= end:
+                    header = self._central_header(entry, entry.ensure_crc())
+                    yield header[max(start - position, 0):end - position + 1]
+                position += length
+        return produce
+
+    def _end_records(self, cd_offset, cd_size, zip64_offset):
+        count = len(self.entries)
+        records = b''
+        if count >= 0xFFFF or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            records += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset)
+            records += struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1)
+            count, cd_size, cd_offset = min(count, 0xFFFF), min(cd_size, ZIP64_LIMIT), min(cd_offset, ZIP64_LIMIT)
+        return records + struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0)
+
+
+def _static(data):
+    def produce(start, end):
+        yield data[start:end + 1]
+    return produce
+
+
+def _unique_names(entries):
+    """같은 이름이 있으면 '이름 (2).확장자' 로 바꿈"""
+    seen = set()
+    for entry in entries:
+        stem, ext = os.path.splitext(entry.name)
+        name, index = entry.name, 2
+        while name in seen:
+            name = f'{stem} ({index}){ext}'
+            index += 1
+        entry.name = name
+        seen.add(name)
+    return entries
+
+
+def parse_range(header, size):
+    """
+    'bytes=a-b' 단일 구간 -> (start, end), 헤더가 없으면 None
+    만족할 수 없는 구간이면 ValueError
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        raise ValueError(header)
+    first, _, last = spec.strip().partition('-')
+    if not first:
+        length = int(last)
+        if length <= 0:
+            raise ValueError(header)
+        start, end = max(size - length, 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def zip_response(request, stream, filename):
+    """Range/If-Range 를 처리하는 스트리밍 응답"""
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'ETag': stream.etag,
+        'Content-Disposition': content_disposition_header(True, filename),
+    }
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range == stream.etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), stream.size)
+        except ValueError:
+            return HttpResponse(status=416, headers={**headers, 'Content-Range': f'bytes */{stream.size}'})
+
+    if byte_range is None:
+        response = StreamingHttpResponse(stream.iter_range(), content_type='application/zip', headers=headers)
+        response['Content-Length'] = stream.size
+        return response
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        stream.iter_range(start, end), status=206, content_type='application/zip', headers=headers,
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{stream.size}'
+    response['Content-Length'] = end - start + 1
+    return response
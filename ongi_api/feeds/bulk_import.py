@@ -0,0 +1,126 @@
+import csv
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+
+from core.geo import exif_gps
+from core.media_layout import feed_image_path, versioned_name
+from .thumbnails import THUMBNAIL_DIR, THUMBNAIL_SIZES, ensure_thumbnail
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.heic', '.tif', '.tiff')
+
+
+class ImportItem:
+    """가져올 사진 하나 (feed_key 가 같은 사진들이 한 피드가 된다)"""
+    __slots__ = ('source', 'relative', 'artifact_name', 'feed_key')
+
+    def __init__(self, source, relative, artifact_name, feed_key=None):
+        self.source = source
+        self.relative = relative  # 재실행 시 이미 가져온 사진을 찾는 키
+        self.artifact_name = artifact_name
+        self.feed_key = feed_key or artifact_name
+
+
+def scan_directory(root, images_per_feed=None):
+    """
+    <root>/<유물 이름>/.../사진 구조를 읽어 ImportItem 목록 생성
+    images_per_feed 를 주면 유물별 사진을 그 수만큼씩 나눠 여러 피드로 만든다
+    """
+    items = []
+    for entry in sorted(os.scandir(root), key=lambda entry: entry.name):
+        if not entry.is_dir() or entry.name.startswith('.'):
+            continue
+        photos = []
+        for directory, dirs, files in os.walk(entry.path):
+            dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+            photos += [
+                os.path.join(directory, name) for name in sorted(files)
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('.')
+            ]
+        for index, path in enumerate(photos):
+            feed_key = entry.name
+            if images_per_feed:
+                feed_key = f'{entry.name}#{index // images_per_feed}'
+            items.append(ImportItem(path, os.path.relpath(path, root), entry.name, feed_key))
+    return items
+
+
+def read_manifest(path):
+    """
+    CSV 목록 (path, artifact_name[, feed_key]) 읽기
+    path 가 상대 경로면 목록 파일 위치 기준
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        for row in csv.DictReader(file):
+            source = os.path.join(base, row['path'])
+            items.append(ImportItem(source, row['path'], row['artifact_name'].strip(), (row.get('feed_key') or '').strip()))
+    return items
+
+
+def destination_name(feed_id, order, source):
+    """업로드 API(_save_image)와 같은 저장 경로 규칙 (내용 해시는 복사하면서 붙인다)"""
+    return feed_image_path(feed_id, f'image_{order}_{os.path.basename(source)}')
+
+
+def process_image(source, destination, make_thumbnails=True):
+    """
+    작업 프로세스에서 실행: 복사하면서 해시 계산, 이미지 검증, EXIF/크기 추출, 썸네일 생성
+    DB 에는 접근하지 않고 결과 dict 만 돌려준다
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(source) as image:
+            image.verify()  # 잘린 파일/이미지가 아닌 파일 거르기
+        with Image.open(source) as image:
+            width, height = image.size
+            if image.getexif().get(0x0112) in (5, 6, 7, 8):  # 90도 회전
+                width, height = height, width
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError) as e:
+        return {'source': source, 'error': f'이미지 검증 실패: {e}'}
+
+    os.makedirs(os.path.dirname(os.path.join(settings.MEDIA_ROOT, destination)), exist_ok=True)
+    digest, size = hashlib.sha256(), 0
+    temp_path = os.path.join(settings.MEDIA_ROOT, f'{destination}.{uuid.uuid4().hex}.tmp')
+    try:
+        with open(source, 'rb') as src, open(temp_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        # 스토리지와 같이 내용 해시를 붙인 이름으로 저장
+        destination = versioned_name(destination, digest.hexdigest())
+        target = os.path.join(settings.MEDIA_ROOT, destination)
+        os.replace(temp_path, target)
+    except OSError as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return {'source': source, 'error': f'복사 실패: {e}'}
+
+    if make_thumbnails:
+        for thumbnail_size in THUMBNAIL_SIZES:
+            try:
+                ensure_thumbnail(destination, thumbnail_size)
+            except OSError:
+                pass  # 썸네일은 첫 요청 시 다시 만들 수 있음
+
+    gps = exif_gps(target)
+    metadata = {'sha256': digest.hexdigest(), 'width': width, 'height': height, 'bytes': size}
+    if gps:
+        metadata['gps'] = gps
+    return {'source': source, 'destination': destination, 'metadata': metadata}
+
+
+
+def discard(destination):
+    """등록하지 않기로 한 사진(중복 등)의 복사본과 썸네일 삭제"""
+    for path in [destination, *(f'{THUMBNAIL_DIR}/{size}/{destination}' for size in THUMBNAIL_SIZES)]:
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, path))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,64 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.geo import exif_gps
+from feeds.models import Feed, FeedImage
+from feeds.thumbnails import media_relative_path
+from artifacts.models import Artifact
+
+
+class Command(BaseCommand):
+    help = '기존 피드 이미지의 EXIF GPS 로 이미지 메타데이터, 피드/유물 위치를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        images = (
+            FeedImage.objects
+            .filter(metadata__isnull=True)
+            .only('id', 'image_url', 'feed_id')
+            .order_by('feed_id', 'order')
+            .iterator(chunk_size=batch_size)
+        )
+
+        updated_images, feed_locations, batch = 0, {}, []
+        for image in images:
+            relative_path = media_relative_path(image.image_url)
+            path = os.path.join(settings.MEDIA_ROOT, relative_path) if relative_path else None
+            gps = exif_gps(path) if path and os.path.exists(path) else None
+            if gps is None:
+                continue
+            image.metadata = {'gps': gps}
+            batch.append(image)
+            feed_locations.setdefault(image.feed_id, gps)
+            if len(batch) >= batch_size:
+                FeedImage.objects.bulk_update(batch, ['metadata'])
+                updated_images += len(batch)
+                batch = []
+        if batch:
+            FeedImage.objects.bulk_update(batch, ['metadata'])
+            updated_images += len(batch)
+
+        # 위치가 없는 피드만 첫 GPS 좌표로 설정
+        feeds = []
+        for feed in Feed.objects.filter(id__in=list(feed_locations), latitude__isnull=True).only('id'):
+            gps = feed_locations[feed.id]
+            feed.set_location(gps['lat'], gps['lng'])
+            feeds.append(feed)
+        Feed.objects.bulk_update(feeds, ['latitude', 'longitude', 'geohash'], batch_size=batch_size)
+
+        # 위치가 바뀐 피드와 연결된 유물 중심 좌표 갱신
+        artifacts = Artifact.objects.filter(artifact_feeds__feed_id__in=[feed.id for feed in feeds]).distinct()
+        artifact_count = 0
+        for artifact in artifacts.iterator(chunk_size=batch_size):
+            artifact.update_location()
+            artifact.save(update_fields=['latitude', 'longitude', 'geohash'])
+            artifact_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'이미지 {updated_images}장, 피드 {len(feeds)}개, 유물 {artifact_count}개 위치 갱신'
+        ))
@@ -0,0 +1,163 @@
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from artifacts.models import check_and_create_artifact
+from core.sync import record_changes
+from feeds.bulk_import import destination_name, discard, process_image, read_manifest, scan_directory
+from feeds.models import Feed, FeedImage
+from feeds.signals import refresh_user_feed_count
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        '박물관 사진 디렉터리(<유물 이름>/사진) 또는 CSV 목록을 피드로 일괄 등록합니다. '
+        '다시 실행하면 이미 등록된 사진은 건너뜁니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='사진 루트 디렉터리 또는 CSV 목록 (path, artifact_name[, feed_key])')
+        parser.add_argument('--user', required=True, help='피드 작성자 username')
+        parser.add_argument('--label', help='가져오기 식별자 (재실행 시 같은 값, 기본: source 절대 경로)')
+        parser.add_argument('--status', choices=[choice for choice, _ in Feed.STATUS_CHOICES], default='published')
+        parser.add_argument('--images-per-feed', type=int, help='디렉터리 모드에서 한 피드에 담을 최대 사진 수')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='해시/검증/썸네일 작업 프로세스 수')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 DB 에 넣을 사진 수')
+        parser.add_argument('--no-thumbnails', action='store_true', help='썸네일을 미리 만들지 않음')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError('작성자를 찾을 수 없습니다.')
+        source = os.path.abspath(options['source'])
+        if os.path.isdir(source):
+            items = scan_directory(source, options['images_per_feed'])
+        elif os.path.isfile(source):
+            items = read_manifest(source)
+        else:
+            raise CommandError(f'경로가 없습니다: {source}')
+        label = options['label'] or source
+
+        # 이전 실행에서 등록된 사진/피드 (재개용)
+        imported, feed_ids, next_order, seen_hashes = set(), {}, {}, set()
+        existing = FeedImage.objects.filter(feed__user=user, metadata__import__label=label)
+        for feed_id, order, metadata in existing.values_list('feed_id', 'order', 'metadata').iterator():
+            imported.add(metadata['import']['source'])
+            feed_ids[metadata['import']['key']] = feed_id
+            next_order[feed_id] = max(next_order.get(feed_id, 0), order + 1)
+            seen_hashes.add(metadata.get('sha256'))
+        existing_feeds = set(feed_ids.values())
+
+        pending = []
+        for item in items:
+            if item.relative in imported:
+                continue
+            feed_id = feed_ids.setdefault(item.feed_key, uuid.uuid4())
+            order = next_order.get(feed_id, 0)
+            next_order[feed_id] = order + 1
+            pending.append((item, feed_id, order, destination_name(feed_id, order, item.source)))
+        self.stdout.write(f'전체 {len(items)}장 중 이미 등록 {len(items) - len(pending)}장, 처리 대상 {len(pending)}장')
+        if not pending:
+            return
+
+        self.user, self.label, self.status = user, label, options['status']
+        self.created_feeds, self.feed_locations = set(existing_feeds), {}
+        self.stats = {'imported': 0, 'bytes': 0, 'duplicates': 0, 'errors': 0}
+        self.started = time.monotonic()
+        errors, batch = [], []
+
+        # 작업 프로세스는 DB 를 쓰지 않으므로 fork 전에 연결을 닫아 공유되지 않게 함
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            results = executor.map(
+                process_image,
+                [item.source for item, *_ in pending],
+                [destination for *_, destination in pending],
+                [not options['no_thumbnails']] * len(pending),
+                chunksize=max(1, min(32, len(pending) // (options['workers'] * 4) or 1)),
+            )
+            for (item, feed_id, order, destination), result in zip(pending, results):
+                if 'error' in result:
+                    errors.append(f'{item.relative}: {result["error"]}')
+                    self.stats['errors'] += 1
+                    continue
+                if result['metadata']['sha256'] in seen_hashes:
+                    discard(result['destination'])
+                    self.stats['duplicates'] += 1
+                    continue
+                seen_hashes.add(result['metadata']['sha256'])
+                batch.append((item, feed_id, order, result))
+                if len(batch) >= options['batch_size']:
+                    self._flush(batch, len(pending))
+                    batch = []
+        if batch:
+            self._flush(batch, len(pending))
+
+        self._finish({item.artifact_name for item, *_ in pending})
+        for error in errors[:20]:
+            self.stderr.write(error)
+        if len(errors) > 20:
+            self.stderr.write(f'... 외 {len(errors) - 20}건')
+
+    def _flush(self, batch, total):
+        """한 배치의 피드/이미지를 하나의 트랜잭션으로 저장"""
+        feeds, images = [], []
+        for item, feed_id, order, result in batch:
+            metadata = {**result['metadata'], 'import': {'label': self.label, 'source': item.relative, 'key': item.feed_key}}
+            if feed_id not in self.created_feeds:
+                self.created_feeds.add(feed_id)
+                feeds.append(Feed(id=feed_id, user=self.user, artifact_name=item.artifact_name, status=self.status))
+            if 'gps' in metadata:
+                self.feed_locations.setdefault(feed_id, metadata['gps'])
+            images.append(FeedImage(
+                feed_id=feed_id, image_url=f'{settings.MEDIA_URL}{result["destination"]}', order=order, metadata=metadata,
+                content_hash=metadata['sha256'],
+            ))
+            self.stats['bytes'] += metadata['bytes']
+
+        for feed in feeds:
+            gps = self.feed_locations.get(feed.id)
+            if gps:
+                feed.set_location(gps['lat'], gps['lng'])
+        with transaction.atomic():
+            Feed.objects.bulk_create(feeds)
+            FeedImage.objects.bulk_create(images)
+            record_changes('feeds', [feed.id for feed in feeds])
+            record_changes('feed_images', [image.id for image in images])
+
+        self.stats['imported'] += len(images)
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        done = self.stats['imported'] + self.stats['duplicates'] + self.stats['errors']
+        self.stdout.write(
+            f'{done}/{total}장 ({self.stats["imported"] / elapsed:.1f}장/s, '
+            f'{self.stats["bytes"] / elapsed / 1024 / 1024:.1f}MB/s)'
+        )
+
+    def _finish(self, artifact_names):
+        """일괄 등록 후 한 번만: 위치가 없던 기존 피드 위치, 작성자 집계, 유물 생성/연결"""
+        feeds = []
+        for feed in Feed.objects.filter(id__in=list(self.feed_locations), latitude__isnull=True).only('id'):
+            gps = self.feed_locations[feed.id]
+            feed.set_location(gps['lat'], gps['lng'])
+            feeds.append(feed)
+        Feed.objects.bulk_update(feeds, ['latitude', 'longitude', 'geohash'], batch_size=500)
+
+        refresh_user_feed_count(self.user.id)
+        artifacts = 0
+        if self.status == 'published':
+            for name in sorted(artifact_names):
+                if check_and_create_artifact(name) is not None:
+                    artifacts += 1
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'등록 {self.stats["imported"]}장, 중복 {self.stats["duplicates"]}장, 실패 {self.stats["errors"]}장, '
+            f'유물 {artifacts}개 갱신 - {elapsed:.1f}초 ({self.stats["imported"] / max(elapsed, 1e-6):.1f}장/s)'
+        ))
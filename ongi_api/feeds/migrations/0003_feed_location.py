@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0002_remove_feed_content_remove_feed_title_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='feed',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
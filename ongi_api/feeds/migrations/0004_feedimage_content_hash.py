@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+def fill_from_metadata(apps, schema_editor):
+    """일괄 가져오기로 등록된 이미지는 metadata 에 이미 해시가 있음"""
+    FeedImage = apps.get_model('feeds', 'FeedImage')
+    images = FeedImage.objects.filter(metadata__has_key='sha256').only('id', 'metadata')
+    batch = []
+    for image in images.iterator(chunk_size=2000):
+        image.content_hash = image.metadata['sha256']
+        batch.append(image)
+        if len(batch) >= 2000:
+            FeedImage.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        FeedImage.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0003_feed_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedimage',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.RunPython(fill_from_metadata, migrations.RunPython.noop),
+    ]
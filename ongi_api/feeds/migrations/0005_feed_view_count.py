@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0004_feedimage_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
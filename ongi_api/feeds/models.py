@@ -1,6 +1,7 @@
 from django.db import models
 import uuid
 from users.models import User  # User 모델 import
+from core.geo import geohash_encode
 
 
 class Feed(models.Model):
@@ -19,20 +20,31 @@ class Feed(models.Model):
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='published')
     
+    # 이미지 EXIF GPS 에서 추출한 촬영 위치
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
+    
+    view_count = models.PositiveIntegerField(default=0)  # 작성자 외 사용자의 상세 조회 수
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.artifact_name} by {self.user.username}"
 
-    def save(self, *args, **kwargs):
-        # 피드가 저장될 때 user의 feed_count 증가 (새로 생성된 경우에만)
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new and self.status == 'published':
-            self.user.feed_count += 1
-            self.user.update_rank()  # 랭크 업데이트
+    def set_location(self, latitude, longitude):
+        """좌표와 geohash 설정 (저장은 호출자가 수행)"""
+        self.latitude = latitude
+        self.longitude = longitude
+        self.geohash = geohash_encode(latitude, longitude)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 상태 변경 감지용 (feed_count/리더보드 갱신은 feeds.signals 에서 처리)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
 
     class Meta:
         db_table = 'feeds'
@@ -48,6 +60,7 @@ class FeedImage(models.Model):
     image_url = models.TextField()
     order = models.IntegerField(default=0)  # 이미지 순서
     metadata = models.JSONField(null=True, blank=True)  # EXIF 정보 등 메타데이터
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)  # 파일 SHA-256 (업로드 중복 확인)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -1,21 +1,34 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import Feed, FeedImage
 from users.models import User
+from core.media_layout import feed_image_path
+from core.serializers import DynamicFieldsMixin, FragmentListSerializer
+from .tiles import dzi_url
 
-class FeedImageSerializer(serializers.ModelSerializer):
+class FeedImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """피드 이미지 시리얼라이저"""
+    dzi_url = serializers.SerializerMethodField()  # 딥줌 뷰어용 타일 디스크립터
+    
     class Meta:
         model = FeedImage
-        fields = ['id', 'image_url', 'order', 'metadata', 'created_at']
+        fields = ['id', 'image_url', 'dzi_url', 'order', 'metadata', 'created_at']
         read_only_fields = ['id', 'created_at']
+        fragment_cache = True
+        list_serializer_class = FragmentListSerializer
+    
+    def get_dzi_url(self, obj):
+        return dzi_url(obj.image_url)
 
-class UserMinimalSerializer(serializers.ModelSerializer):
+class UserMinimalSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """유저 정보의 최소 버전 시리얼라이저 (피드 작성자 정보용)"""
     class Meta:
         model = User
         fields = ['id', 'username', 'profile_image', 'rank']
+        fragment_cache = True  # feed_count/rank 일괄 갱신 시 feeds.signals 에서 무효화
+        list_serializer_class = FragmentListSerializer
 
-class FeedSerializer(serializers.ModelSerializer):
+class FeedSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = FeedImageSerializer(many=True, read_only=True)
     user = UserMinimalSerializer(read_only=True)
     
@@ -23,9 +36,15 @@ class FeedSerializer(serializers.ModelSerializer):
         model = Feed
         fields = [
             'id', 'user', 'artifact_name', 
-            'status', 'images', 'created_at', 'updated_at'
+            'status', 'images', 'latitude', 'longitude', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'user', 'latitude', 'longitude', 'created_at', 'updated_at']
+        eager_loading = {
+            'user': lambda queryset, serializer: queryset.select_related('user'),
+            'images': lambda queryset, serializer: queryset.prefetch_related('images'),
+        }
+        fragment_cache = True  # 작성자/이미지는 각자의 조각으로 조립
+        list_serializer_class = FragmentListSerializer
 
 class FeedCreateSerializer(serializers.ModelSerializer):
     """피드 생성 시리얼라이저"""
@@ -58,23 +77,11 @@ class FeedCreateSerializer(serializers.ModelSerializer):
     
     def _save_image(self, image_file, feed_id, order):
         from django.conf import settings
-        import os
-        
-        # 저장 경로 생성
-        upload_dir = os.path.join(settings.MEDIA_ROOT, 'feeds', str(feed_id))
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # 파일명 생성
-        filename = f"image_{order}_{image_file.name}"
-        filepath = os.path.join(upload_dir, filename)
         
-        # 파일 저장
-        with open(filepath, 'wb+') as destination:
-            for chunk in image_file.chunks():
-                destination.write(chunk)
+        # feeds/<샤드>/<피드 ID>/ 에 내용 해시가 붙은 이름으로 저장
+        relative_path = default_storage.save(feed_image_path(feed_id, f"image_{order}_{image_file.name}"), image_file)
         
         # URL 생성
-        relative_path = os.path.join('feeds', str(feed_id), filename)
         url = f"{settings.MEDIA_URL}{relative_path}"
         
         return url
\ No newline at end of file
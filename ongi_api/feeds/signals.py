@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User, rank_for_feed_count
+from users.leaderboard import get_leaderboard
+from core import fragments
+from .models import Feed
+
+
+def refresh_user_feed_count(user_id):
+    """게시된 피드 수로 사용자 feed_count/rank 와 리더보드 갱신"""
+    feed_count = Feed.objects.filter(user_id=user_id, status='published').count()
+    updated = User.objects.filter(id=user_id).update(feed_count=feed_count, rank=rank_for_feed_count(feed_count))
+    if updated:
+        # 롤백되면 리더보드가 DB 와 어긋나지 않도록 커밋 후 반영
+        transaction.on_commit(lambda: get_leaderboard().update(user_id, feed_count))
+        fragments.bump(User, [user_id])  # update() 는 시그널이 없으므로 직접 무효화
+
+
+@receiver(post_save, sender=Feed)
+def feed_saved(sender, instance, created, **kwargs):
+    # 생성되었거나 게시 상태가 바뀐 경우에만 (게시/숨김/삭제 처리)
+    if created or instance.status != getattr(instance, '_loaded_status', None):
+        refresh_user_feed_count(instance.user_id)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Feed)
+def feed_deleted(sender, instance, **kwargs):
+    if instance.status == 'published':
+        refresh_user_feed_count(instance.user_id)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    get_leaderboard().remove(instance.id)
@@ -1,3 +1,185 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+
+from users.models import User, CustomToken
+from feeds.models import Feed, FeedImage
+
+
+class DeepZoomTileTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        os.makedirs(os.path.join(self.media_root, 'feeds', 'f1'))
+        from PIL import Image
+        Image.new('RGB', (1000, 600), (120, 80, 40)).save(os.path.join(self.media_root, 'feeds', 'f1', 'a.jpg'))
+
+    def test_only_requested_level_is_generated(self):
+        from feeds.tiles import TILE_SIZE, ensure_tile, level_size, max_level
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            self.assertEqual(max_level(1000, 600), 10)
+            self.assertEqual(level_size(1000, 600, 9), (500, 300))
+            response = self.client.get('/api/feeds/tiles/feeds/f1/a.jpg/image_files/10/1_0.jpg')
+            self.assertEqual(response.status_code, 200)
+            levels = os.listdir(os.path.join(self.media_root, 'tiles', 'feeds', 'f1', 'a.jpg', 'image_files'))
+            self.assertEqual(levels, ['10'])
+            # 가운데 타일은 양쪽 겹침 포함
+            from PIL import Image
+            with Image.open(ensure_tile('feeds/f1/a.jpg', 10, 1, 1)) as tile:
+                self.assertEqual(tile.size, (TILE_SIZE + 2, TILE_SIZE + 2))
+            self.assertEqual(self.client.get('/api/feeds/tiles/feeds/f1/a.jpg/image_files/10/9_0.jpg').status_code, 404)
+            self.assertEqual(self.client.get('/api/feeds/tiles/tiles/x/image.dzi').status_code, 404)
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_versioned_thumbnails_are_immutable(self):
+        from PIL import Image
+        from django.core.files.storage import default_storage
+        from django.core.files.base import ContentFile
+        import io
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), (10, 20, 30)).save(buffer, format='JPEG')
+        with override_settings(MEDIA_ROOT=self.media_root):
+            name = default_storage.save('feeds/ab/cd/x/photo.jpg', ContentFile(buffer.getvalue()))
+            response = self.client.get(f'/api/feeds/thumbnails/150/{name}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+
+class UploadDedupTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.user = User.objects.create_user(username='dedup', email='dedup@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=self.user).key}'
+        self.first = Feed.objects.create(user=self.user, artifact_name='분청사기', status='published')
+        self.second = Feed.objects.create(user=self.user, artifact_name='분청사기', status='published')
+
+    def test_hash_reference_links_stored_image(self):
+        import hashlib
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        data = os.urandom(4096)
+        digest = hashlib.sha256(data).hexdigest()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            check = self.client.post('/api/feeds/upload-check/', {'hashes': [digest]}, content_type='application/json')
+            self.assertEqual(check.json(), {'existing': [], 'missing': [digest]})
+            response = self.client.post(
+                f'/api/feeds/{self.second.id}/upload-images/', {'image_hashes': [digest]},
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['missing'], [digest])
+
+            self.client.post(
+                f'/api/feeds/{self.first.id}/upload-images/', {'images': [SimpleUploadedFile('a.jpg', data)]},
+            )
+            check = self.client.post('/api/feeds/upload-check/', {'hashes': [digest.upper()]}, content_type='application/json')
+            self.assertEqual(check.json()['existing'], [digest])
+            response = self.client.post(
+                f'/api/feeds/{self.second.id}/upload-images/', {'image_hashes': [digest]},
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertTrue(response.json()[0]['reused'])
+
+        first_image, second_image = FeedImage.objects.get(feed=self.first), FeedImage.objects.get(feed=self.second)
+        self.assertEqual(second_image.image_url, first_image.image_url)
+        self.assertEqual(second_image.content_hash, digest)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'feeds'))), 1)
+
+        # 다른 사용자의 이미지는 참조할 수 없음
+        other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {CustomToken.objects.create(user=other).key}'
+        with override_settings(MEDIA_ROOT=self.media_root):
+            check = self.client.post('/api/feeds/upload-check/', {'hashes': [digest]}, content_type='application/json')
+        self.assertEqual(check.json()['existing'], [])
+
+
+class ImportPhotosTests(TestCase):
+    def setUp(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest import mock
+
+        self.source = tempfile.mkdtemp()
+        self.media_root = tempfile.mkdtemp()
+        for path in (self.source, self.media_root):
+            self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        self.user = User.objects.create_user(username='museum', email='museum@example.com', password='pw')
+        # 작업 프로세스 대신 스레드로 실행 (override_settings 의 MEDIA_ROOT 를 그대로 사용)
+        patcher = mock.patch('feeds.management.commands.import_photos.ProcessPoolExecutor', ThreadPoolExecutor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def photo(self, relative, color):
+        from PIL import Image
+
+        path = os.path.join(self.source, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.new('RGB', (40, 30), color).save(path)
+        return path
+
+    def run_import(self, *args):
+        import io
+        from django.core.management import call_command
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            call_command(
+                'import_photos', *args, '--user', 'museum', '--workers', '2', '--no-thumbnails',
+                stdout=io.StringIO(), stderr=io.StringIO(),
+            )
+
+    def test_scan_directory_and_manifest(self):
+        from feeds.bulk_import import read_manifest, scan_directory
+
+        for name in ('백자/1.jpg', '백자/sub/2.png', '백자/.hidden.jpg', '청자/a.jpg', '.cache/x.jpg'):
+            self.photo(name, (1, 2, 3))
+        open(os.path.join(self.source, '백자', 'notes.txt'), 'w').close()
+        items = scan_directory(self.source, images_per_feed=1)
+        self.assertEqual(
+            [(item.relative, item.artifact_name, item.feed_key) for item in items],
+            [('백자/1.jpg', '백자', '백자#0'), ('백자/sub/2.png', '백자', '백자#1'), ('청자/a.jpg', '청자', '청자#0')],
+        )
+
+        manifest = os.path.join(self.source, 'list.csv')
+        with open(manifest, 'w', encoding='utf-8') as file:
+            file.write('path,artifact_name,feed_key\n백자/1.jpg, 백자 ,\n청자/a.jpg,청자,전시\n')
+        items = read_manifest(manifest)
+        self.assertEqual(items[0].source, os.path.join(self.source, '백자/1.jpg'))
+        self.assertEqual([(item.artifact_name, item.feed_key) for item in items], [('백자', '백자'), ('청자', '전시')])
+
+    def test_import_resume_and_duplicates(self):
+        from core.models import ChangeLog
+
+        self.photo('백자/1.jpg', (200, 0, 0))
+        self.photo('백자/2.jpg', (0, 200, 0))
+        shutil.copy(self.photo('청자/a.png', (0, 0, 200)), os.path.join(self.source, '청자', 'b.png'))  # 같은 내용
+        self.run_import(self.source)
+
+        feeds = {feed.artifact_name: feed for feed in Feed.objects.filter(user=self.user)}
+        self.assertEqual(set(feeds), {'백자', '청자'})
+        self.assertEqual(feeds['백자'].images.count(), 2)
+        self.assertEqual(list(feeds['청자'].images.values_list('metadata__import__source', flat=True)), ['청자/a.png'])
+        stored = [name for _, _, files in os.walk(self.media_root) for name in files]
+        self.assertEqual(len(stored), 3)  # 중복 사진 복사본은 삭제
+        self.assertEqual(ChangeLog.objects.filter(entity='feeds').count(), 2)
+        self.assertEqual(ChangeLog.objects.filter(entity='feed_images').count(), 3)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.feed_count, 2)
+
+        # 재실행: 이미 가져온 사진은 건너뛰고 새 사진만 기존 피드 뒤에 추가
+        self.photo('백자/3.jpg', (0, 100, 100))
+        self.run_import(self.source)
+        self.assertEqual(FeedImage.objects.filter(feed__user=self.user).count(), 4)
+        self.assertEqual(list(feeds['백자'].images.order_by('order').values_list('order', flat=True)), [0, 1, 2])
+        self.assertEqual(ChangeLog.objects.filter(entity='feeds').count(), 2)
+        self.assertEqual(ChangeLog.objects.filter(entity='feed_images').count(), 4)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.feed_count, 2)
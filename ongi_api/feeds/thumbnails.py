@@ -0,0 +1,52 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils._os import safe_join
+
+
+# 허용하는 썸네일 긴 변 크기(px)
+THUMBNAIL_SIZES = (150, 300, 600)
+THUMBNAIL_DIR = 'thumbnails'
+
+
+def media_relative_path(image_url):
+    """MEDIA_URL 로 시작하는 이미지 URL 을 MEDIA_ROOT 기준 상대 경로로 변환"""
+    if image_url and image_url.startswith(settings.MEDIA_URL):
+        return image_url[len(settings.MEDIA_URL):]
+    return None
+
+
+def thumbnail_url(image_url, size=300):
+    """썸네일 URL 반환 (미디어 파일이 아니면 원본 URL 그대로)"""
+    relative_path = media_relative_path(image_url)
+    if relative_path is None:
+        return image_url
+    return reverse('feed-image-thumbnail', kwargs={'size': size, 'path': relative_path})
+
+
+def ensure_thumbnail(relative_path, size):
+    """
+    썸네일 파일 경로 반환 (없으면 생성)
+    원본이 없거나 이미지가 아니면 FileNotFoundError/OSError 발생
+    """
+    from PIL import Image, ImageOps
+
+    source_path = safe_join(settings.MEDIA_ROOT, relative_path)
+    target_path = safe_join(settings.MEDIA_ROOT, THUMBNAIL_DIR, str(size), relative_path)
+    if os.path.exists(target_path) and os.path.getmtime(target_path) >= os.path.getmtime(source_path):
+        return target_path
+
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    with Image.open(source_path) as image:
+        image.draft('RGB', (size, size))  # JPEG 는 디코딩 단계에서 축소
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        # 동시 요청(같은 프로세스의 스레드 포함) 시 반쯤 쓰인 파일이 노출되지 않도록 임시 파일 후 교체
+        temp_path = f'{target_path}.{uuid.uuid4().hex}.tmp'
+        image.save(temp_path, format='JPEG', quality=80, optimize=True)
+    os.replace(temp_path, target_path)
+    return target_path
@@ -0,0 +1,154 @@
+import math
+import os
+import re
+import shutil
+import uuid
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils._os import safe_join
+
+from .thumbnails import media_relative_path
+
+
+# Deep Zoom(DZI) 타일 피라미드 설정
+TILE_DIR = 'tiles'
+TILE_SIZE = 254  # 겹침 포함 256px
+TILE_OVERLAP = 1
+TILE_FORMAT = 'jpg'
+TILE_QUALITY = 85
+DESCRIPTOR_NAME = 'image.dzi'
+LEVELS_DIR = 'image_files'  # OpenSeadragon 규칙: <dzi 이름>_files/<레벨>/<열>_<행>.jpg
+
+
+def dzi_url(image_url):
+    """DZI 디스크립터 URL (미디어 파일이 아니면 None)"""
+    relative_path = media_relative_path(image_url)
+    if relative_path is None:
+        return None
+    return reverse('feed-image-dzi', kwargs={'path': relative_path})
+
+
+def max_level(width, height):
+    """1x1 부터 원본 크기까지의 최고 레벨 번호"""
+    return math.ceil(math.log2(max(width, height, 1)))
+
+
+def level_size(width, height, level):
+    scale = 2 ** (max_level(width, height) - level)
+    return math.ceil(width / scale), math.ceil(height / scale)
+
+
+def tile_box(level_width, level_height, col, row):
+    """레벨 이미지에서 타일이 차지하는 영역 (겹침 포함), 범위를 벗어나면 None"""
+    left, top = col * TILE_SIZE, row * TILE_SIZE
+    if left >= level_width or top >= level_height:
+        return None
+    return (
+        max(left - TILE_OVERLAP, 0),
+        max(top - TILE_OVERLAP, 0),
+        min(left + TILE_SIZE + TILE_OVERLAP, level_width),
+        min(top + TILE_SIZE + TILE_OVERLAP, level_height),
+    )
+
+
+def _pyramid_dir(relative_path):
+    return safe_join(settings.MEDIA_ROOT, TILE_DIR, relative_path)
+
+
+def _source_size(source_path):
+    """EXIF 회전을 반영한 원본 크기 (헤더만 읽음)"""
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in (5, 6, 7, 8):  # 90도 회전
+            width, height = height, width
+    return width, height
+
+
+def ensure_descriptor(relative_path):
+    """
+    DZI 디스크립터 경로 반환 (없거나 원본보다 오래되면 새로 만들고 이전 타일 삭제)
+    타일은 요청된 레벨만 ensure_tile 에서 만든다
+    """
+    source_path = safe_join(settings.MEDIA_ROOT, relative_path)
+    pyramid_dir = _pyramid_dir(relative_path)
+    descriptor_path = os.path.join(pyramid_dir, DESCRIPTOR_NAME)
+    if os.path.exists(descriptor_path) and os.path.getmtime(descriptor_path) >= os.path.getmtime(source_path):
+        return descriptor_path
+
+    width, height = _source_size(source_path)
+    shutil.rmtree(pyramid_dir, ignore_errors=True)
+    os.makedirs(pyramid_dir, exist_ok=True)
+    temp_path = f'{descriptor_path}.{uuid.uuid4().hex}.tmp'
+    with open(temp_path, 'w') as file:
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{TILE_SIZE}" '
+            f'Overlap="{TILE_OVERLAP}" Format="{TILE_FORMAT}">'
+            f'<Size Width="{width}" Height="{height}"/></Image>\n'
+        )
+    os.replace(temp_path, descriptor_path)
+    return descriptor_path
+
+
+def read_descriptor_size(descriptor_path):
+    """디스크립터의 (width, height)"""
+    with open(descriptor_path) as file:
+        match = re.search(r'Width="(\d+)" Height="(\d+)"', file.read())
+    return int(match.group(1)), int(match.group(2))
+
+
+def ensure_tile(relative_path, level, col, row):
+    """
+    타일 파일 경로 반환 (해당 레벨이 없으면 레벨 전체를 한 번에 생성)
+    원본이 없거나 범위를 벗어난 타일이면 FileNotFoundError
+    """
+    descriptor_path = ensure_descriptor(relative_path)
+    width, height = read_descriptor_size(descriptor_path)
+    if not 0 <= level <= max_level(width, height):
+        raise FileNotFoundError(level)
+    level_width, level_height = level_size(width, height, level)
+    if tile_box(level_width, level_height, col, row) is None:
+        raise FileNotFoundError((col, row))
+
+    level_dir = os.path.join(_pyramid_dir(relative_path), LEVELS_DIR, str(level))
+    tile_path = os.path.join(level_dir, f'{col}_{row}.{TILE_FORMAT}')
+    if not os.path.exists(tile_path):
+        _build_level(safe_join(settings.MEDIA_ROOT, relative_path), level_dir, level_width, level_height)
+    return tile_path
+
+
+def _build_level(source_path, level_dir, level_width, level_height):
+    """
+    원본을 레벨 크기로 줄여 타일로 자른다
+    임시 폴더에 만든 뒤 교체해, 동시 요청이 반쯤 만들어진 레벨을 보지 않게 한다
+    """
+    from PIL import Image, ImageOps
+
+    temp_dir = f'{level_dir}.{uuid.uuid4().hex}.tmp'
+    os.makedirs(temp_dir)
+    try:
+        with Image.open(source_path) as image:
+            rotated = image.getexif().get(0x0112) in (5, 6, 7, 8)
+            # JPEG 는 디코딩 단계에서 축소 (회전 전 기준 크기)
+            image.draft('RGB', (level_height, level_width) if rotated else (level_width, level_height))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            if image.size != (level_width, level_height):
+                image = image.resize((level_width, level_height), Image.LANCZOS)
+            for col in range(math.ceil(level_width / TILE_SIZE)):
+                for row in range(math.ceil(level_height / TILE_SIZE)):
+                    tile = image.crop(tile_box(level_width, level_height, col, row))
+                    tile.save(os.path.join(temp_dir, f'{col}_{row}.{TILE_FORMAT}'), format='JPEG', quality=TILE_QUALITY)
+        try:
+            os.rename(temp_dir, level_dir)
+        except OSError:
+            if not os.path.isdir(level_dir):
+                raise
+            shutil.rmtree(temp_dir, ignore_errors=True)  # 다른 요청이 먼저 만듦
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
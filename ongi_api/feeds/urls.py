@@ -5,7 +5,11 @@ from .views import (
     feed_update_view,
     feed_delete_view,
     my_feeds_view,
-    upload_feed_images
+    upload_image_check,
+    upload_feed_images,
+    feed_image_thumbnail_view,
+    feed_image_dzi_view,
+    feed_image_tile_view,
 )
 
 urlpatterns = [
@@ -14,5 +18,9 @@ urlpatterns = [
     path('<uuid:feed_id>/update/', feed_update_view, name='feed-update'),  # 피드 업데이트
     path('<uuid:feed_id>/delete/', feed_delete_view, name='feed-delete'),  # 피드 삭제
     path('my-feeds/', my_feeds_view, name='my-feeds'),  # 자신의 피드 목록 조회
+    path('upload-check/', upload_image_check, name='upload-image-check'),  # 업로드 전 이미지 중복 확인
     path('<uuid:feed_id>/upload-images/', upload_feed_images, name='upload-feed-images'),  # 피드 이미지 업로드
+    path('thumbnails/<int:size>/<path:path>', feed_image_thumbnail_view, name='feed-image-thumbnail'),  # 피드 이미지 썸네일
+    path('tiles/<path:path>/image.dzi', feed_image_dzi_view, name='feed-image-dzi'),  # 딥줌 디스크립터
+    path('tiles/<path:path>/image_files/<int:level>/<int:col>_<int:row>.jpg', feed_image_tile_view, name='feed-image-tile'),  # 딥줌 타일
 ]
\ No newline at end of file
@@ -1,12 +1,30 @@
+import hashlib
+import os
+import re
+
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db.models import F
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Feed, FeedImage
 from .serializers import FeedSerializer, FeedImageSerializer
+from .thumbnails import THUMBNAIL_SIZES, ensure_thumbnail, media_relative_path
+from .tiles import ensure_descriptor, ensure_tile
 from artifacts.models import check_and_create_artifact
+from core.geo import exif_gps
+from core.media_layout import IMMUTABLE_CACHE_CONTROL, feed_image_path, is_versioned
+from core.serializers import shaped
+
+# 업로드 중복 확인
+HASH_PATTERN = re.compile(r'[0-9a-f]{64}')
+MAX_HASHES = 100
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -19,7 +37,7 @@ def feed_list_create_view(request):
         else:
             feeds = Feed.objects.filter(status='published').order_by('-created_at')
         
-        serializer = FeedSerializer(feeds, many=True)
+        serializer = shaped(FeedSerializer, request, feeds, many=True)
         return Response(serializer.data)
     
     elif request.method == 'POST':
@@ -47,12 +65,12 @@ def feed_detail_view(request, feed_id):
         return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
     
     # 자신의 피드가 아닌 경우 조회수 증가
-    if request.user.id != feed.user.id:
-        feed.view_count = F('view_count') + 1
-        feed.save()
-        feed.refresh_from_db()  # F() 표현식 사용 후 최신 값 가져오기
+    # save() 는 updated_at 과 동기화 변경 기록/조각 캐시까지 갱신하므로 조회수 컬럼만 update
+    if request.user.id != feed.user_id:
+        Feed.objects.filter(id=feed.id).update(view_count=F('view_count') + 1)
     
-    serializer = FeedSerializer(feed)
+    serializer = shaped(FeedSerializer, request)
+    serializer.instance = feed
     return Response(serializer.data)
 
 @api_view(['PUT', 'PATCH'])
@@ -89,23 +107,69 @@ def feed_delete_view(request, feed_id):
 def my_feeds_view(request):
     """자신의 피드 목록 조회"""
     feeds = Feed.objects.filter(user=request.user).order_by('-created_at')
-    serializer = FeedSerializer(feeds, many=True)
+    serializer = shaped(FeedSerializer, request, feeds, many=True)
     return Response(serializer.data)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_image_check(request):
+    """
+    업로드 전 중복 확인: 올릴 이미지들의 SHA-256 중 서버에 이미 있는 것 조회
+    이미 있는 이미지는 파일 대신 해시만 image_hashes 로 보내면 된다
+    """
+    hashes = request.data.get('hashes')
+    if not isinstance(hashes, list) or not hashes:
+        return Response({"detail": "hashes 목록이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(hashes) > MAX_HASHES:
+        return Response({"detail": f"hashes 는 최대 {MAX_HASHES}개까지 가능합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    hashes = [_normalize_hash(value) for value in hashes]
+    if None in hashes:
+        return Response({"detail": "올바르지 않은 해시가 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    stored = _stored_images(request.user, hashes)
+    return Response({
+        'existing': [value for value in dict.fromkeys(hashes) if value in stored],
+        'missing': [value for value in dict.fromkeys(hashes) if value not in stored],
+    })
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def upload_feed_images(request, feed_id):
-    """피드에 이미지 업로드"""
+    """
+    피드에 이미지 업로드
+    images: 이미지 파일, image_hashes: 이미 올린 적 있는 이미지의 SHA-256 (파일 전송 생략)
+    image_hashes 를 보내면 그 순서대로 붙이고, 목록에 없는 파일은 뒤에 붙인다
+    """
     feed = get_object_or_404(Feed, id=feed_id)
     
     # 피드 작성자만 이미지 업로드 가능
     if request.user != feed.user:
         return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
     
-    # 이미지 파일 리스트 확인
+    # 이미지 파일/해시 리스트 확인
     images = request.FILES.getlist('images')
-    if not images:
+    if hasattr(request.data, 'getlist'):
+        hashes = request.data.getlist('image_hashes')
+    else:
+        hashes = request.data.get('image_hashes') or []
+    hashes = [_normalize_hash(value) for value in hashes]
+    if not images and not hashes:
         return Response({"detail": "이미지 파일이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    if None in hashes:
+        return Response({"detail": "올바르지 않은 해시가 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # 올린 파일의 해시를 계산해 요청 순서에 배치 (같은 내용의 파일은 한 번만 저장)
+    uploads = {}
+    for image_file in images:
+        uploads.setdefault(_content_hash(image_file), image_file)
+    ordered = list(dict.fromkeys(hashes + list(uploads)))
+    stored = _stored_images(request.user, [value for value in ordered if value not in uploads])
+    missing = [value for value in ordered if value not in uploads and value not in stored]
+    if missing:
+        return Response(
+            {"detail": "서버에 없는 이미지입니다. 파일을 함께 보내주세요.", "missing": missing},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     
     # 현재 피드의 이미지 수 확인하여 순서 지정
     current_max_order = FeedImage.objects.filter(feed=feed).order_by('-order').first()
@@ -113,47 +177,135 @@ def upload_feed_images(request, feed_id):
     
     # 이미지 저장 및 FeedImage 객체 생성
     image_data = []
-    for i, image_file in enumerate(images):
-        # 이미지 파일 저장 로직 (실제 구현 필요)
-        image_url = _save_image(image_file, feed.id, start_order + i)
+    feed_location = None
+    for i, content_hash in enumerate(ordered):
+        if content_hash in uploads:
+            image_file = uploads[content_hash]
+            # EXIF GPS 추출 (위치 기반 조회용)
+            gps = exif_gps(image_file)
+            image_url = _save_image(image_file, feed.id, start_order + i)
+            metadata = {'gps': gps} if gps else None
+        else:
+            # 저장된 파일을 그대로 참조 (바이트 재전송/재저장 없음)
+            source = stored[content_hash]
+            image_url = source.image_url
+            metadata = {key: value for key, value in (source.metadata or {}).items() if key != 'import'} or None
+            gps = (metadata or {}).get('gps')
+        if gps and feed_location is None:
+            feed_location = gps
         
         # FeedImage 객체 생성
         feed_image = FeedImage.objects.create(
             feed=feed,
             image_url=image_url,
-            order=start_order + i
+            order=start_order + i,
+            metadata=metadata,
+            content_hash=content_hash,
         )
         
         image_data.append({
             'id': feed_image.id,
             'image_url': feed_image.image_url,
-            'order': feed_image.order
+            'order': feed_image.order,
+            'reused': content_hash not in uploads,
         })
     
+    # 피드 위치가 없으면 첫 GPS 좌표로 설정
+    if feed_location and feed.latitude is None:
+        feed.set_location(feed_location['lat'], feed_location['lng'])
+        feed.save(update_fields=['latitude', 'longitude', 'geohash', 'updated_at'])
+    
     # 이미지가 업로드된 후 유물 자동 생성 검사
     check_and_create_artifact(feed.artifact_name)
     
     return Response(image_data, status=status.HTTP_201_CREATED)
 
-def _save_image(image_file, feed_id, order):
-    from django.conf import settings
-    import os
+def _normalize_hash(value):
+    """SHA-256 16진수 문자열 (형식이 아니면 None)"""
+    value = str(value).strip().lower()
+    return value if HASH_PATTERN.fullmatch(value) else None
+
+def _content_hash(image_file):
+    digest = hashlib.sha256()
+    for chunk in image_file.chunks():
+        digest.update(chunk)
+    image_file.seek(0)
+    return digest.hexdigest()
+
+def _stored_images(user, hashes):
+    """
+    {해시: 저장된 FeedImage} (파일이 실제로 남아 있는 것만)
+    다른 사용자의 사진 존재 여부가 드러나지 않도록 본인이 올린 이미지에서만 찾는다
+    """
+    stored = {}
+    images = FeedImage.objects.filter(feed__user=user, content_hash__in=set(hashes)).order_by('created_at')
+    for image in images:
+        if image.content_hash in stored:
+            continue
+        relative_path = media_relative_path(image.image_url)
+        try:
+            exists = relative_path is not None and os.path.isfile(safe_join(settings.MEDIA_ROOT, relative_path))
+        except SuspiciousFileOperation:
+            exists = False
+        if exists:
+            stored[image.content_hash] = image
+    return stored
+
+@api_view(['GET'])
+def feed_image_thumbnail_view(request, size, path):
+    """피드 이미지 썸네일 조회 (첫 요청 시 생성 후 디스크에 캐시)"""
+    if size not in THUMBNAIL_SIZES or not path.startswith('feeds/'):
+        raise Http404
     
-    # 저장 경로 생성
-    upload_dir = os.path.join(settings.MEDIA_ROOT, 'feeds', str(feed_id))
-    os.makedirs(upload_dir, exist_ok=True)
+    try:
+        thumbnail_path = ensure_thumbnail(path, size)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
     
-    # 파일명 생성
-    filename = f"image_{order}_{image_file.name}"
-    filepath = os.path.join(upload_dir, filename)
+    response = FileResponse(open(thumbnail_path, 'rb'), content_type='image/jpeg')
+    response['Cache-Control'] = _media_cache_control(path)
+    return response
+
+def _media_cache_control(path):
+    # 내용 해시가 붙은 원본에서 만든 파일은 내용이 바뀌지 않음
+    return IMMUTABLE_CACHE_CONTROL if is_versioned(path) else 'public, max-age=86400'
+
+def _tile_source(path):
+    # 피드 이미지만 타일로 제공 (썸네일/타일 폴더 자체는 제외)
+    if not path.startswith('feeds/'):
+        raise Http404
+
+@api_view(['GET'])
+def feed_image_dzi_view(request, path):
+    """피드 이미지 Deep Zoom 디스크립터 (첫 요청 시 생성)"""
+    _tile_source(path)
+    try:
+        descriptor_path = ensure_descriptor(path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
     
-    # 파일 저장
-    with open(filepath, 'wb+') as destination:
-        for chunk in image_file.chunks():
-            destination.write(chunk)
+    response = FileResponse(open(descriptor_path, 'rb'), content_type='application/xml')
+    response['Cache-Control'] = _media_cache_control(path)
+    return response
+
+@api_view(['GET'])
+def feed_image_tile_view(request, path, level, col, row):
+    """피드 이미지 타일 조회 (요청된 레벨만 생성 후 디스크에 캐시)"""
+    _tile_source(path)
+    try:
+        tile_path = ensure_tile(path, level, col, row)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    
+    response = FileResponse(open(tile_path, 'rb'), content_type='image/jpeg')
+    response['Cache-Control'] = _media_cache_control(path)
+    return response
+
+def _save_image(image_file, feed_id, order):
+    from django.conf import settings
     
-    # URL 경로 생성 시 슬래시 정규화 (여기가 수정 부분)
-    relative_path = os.path.join('feeds', str(feed_id), filename).replace('\\', '/')
+    # feeds/<샤드>/<피드 ID>/ 에 내용 해시가 붙은 이름으로 저장
+    relative_path = default_storage.save(feed_image_path(feed_id, f"image_{order}_{image_file.name}"), image_file)
     url = f"{settings.MEDIA_URL}{relative_path}"
     
     return url
\ No newline at end of file
@@ -1,20 +1,45 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Model3D, SourceImage
+from .models import Model3D, Model3DVariant, ReconstructionStage, SourceImage
 
 class SourceImageInline(admin.TabularInline):
     model = SourceImage
     extra = 1  # 기본적으로 보여줄 빈 폼 개수
     fields = ('image_url', 'order')
 
+class Model3DVariantInline(admin.TabularInline):
+    model = Model3DVariant
+    extra = 0
+    fields = ('encoding', 'file', 'file_size', 'original_size', 'compression_ratio', 'created_at')
+    readonly_fields = fields  # compress_models 명령으로만 생성
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+class ReconstructionStageInline(admin.TabularInline):
+    model = ReconstructionStage
+    extra = 0
+    fields = ('name', 'status', 'attempts', 'started_at', 'duration_display', 'peak_memory_mb', 'error')
+    readonly_fields = fields  # reconstruct_model 명령이 기록
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def duration_display(self, obj):
+        if obj.duration is None:
+            return "-"
+        minutes, seconds = divmod(int(obj.duration), 60)
+        return f"{minutes}분 {seconds}초" if minutes else f"{obj.duration:.1f}초"
+    duration_display.short_description = '소요 시간'
+
 @admin.register(Model3D)
 class Model3DAdmin(admin.ModelAdmin):
-    list_display = ('id', 'artifact_link', 'file_format', 'status', 'created_at')
+    list_display = ('id', 'artifact_link', 'file_format', 'status', 'progress_display', 'created_at')
     list_filter = ('status', 'file_format')
     search_fields = ('artifact__name', 'description')
     readonly_fields = ('id', 'created_at', 'updated_at')
-    inlines = [SourceImageInline]
+    inlines = [SourceImageInline, Model3DVariantInline, ReconstructionStageInline]
     
     fieldsets = (
         ('기본 정보', {
@@ -24,7 +49,7 @@ class Model3DAdmin(admin.ModelAdmin):
             'fields': ('model_url', 'thumbnail_url', 'file_format')
         }),
         ('상태 정보', {
-            'fields': ('status', 'poly_count', 'file_size', 'processing_time')
+            'fields': ('status', 'progress', 'current_stage', 'error_message', 'poly_count', 'file_size', 'processing_time')
         }),
         ('Meshroom 정보', {
             'fields': ('meshroom_settings',),
@@ -44,6 +69,13 @@ class Model3DAdmin(admin.ModelAdmin):
         return "-"
     artifact_link.short_description = '유물'
 
+    def progress_display(self, obj):
+        """진행률과 현재 재구성 단계"""
+        if obj.status == 'processing' and obj.current_stage:
+            return f"{obj.progress}% ({obj.current_stage})"
+        return f"{obj.progress}%"
+    progress_display.short_description = '진행률'
+
 @admin.register(SourceImage)
 class SourceImageAdmin(admin.ModelAdmin):
     list_display = ('id', 'model_link', 'order', 'created_at')
@@ -0,0 +1,90 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.core.files import File
+
+from .models import Model3DVariant
+
+
+class CompressionError(Exception):
+    pass
+
+
+# 인코딩별 필요한 외부 도구
+ENCODER_TOOLS = {
+    'meshopt': 'gltfpack',  # meshoptimizer
+    'draco': 'gltf-transform',  # glTF-Transform CLI
+}
+
+
+def available_encodings():
+    """현재 서버에 설치된 도구로 만들 수 있는 인코딩 목록"""
+    return [encoding for encoding, tool in ENCODER_TOOLS.items() if shutil.which(tool)]
+
+
+def _run(command, timeout):
+    try:
+        subprocess.run(command, check=True, capture_output=True, timeout=timeout)
+    except FileNotFoundError:
+        raise CompressionError(f'{command[0]} 를 찾을 수 없습니다.')
+    except subprocess.TimeoutExpired:
+        raise CompressionError(f'{command[0]} 실행 시간 초과')
+    except subprocess.CalledProcessError as e:
+        raise CompressionError(e.stderr.decode(errors='replace')[-500:])
+
+
+def _encode(encoding, src, dst, timeout):
+    if encoding == 'meshopt':
+        # 정점 양자화 + meshopt 압축(-cc), 텍스처 KTX2(BasisU) 변환(-tc)
+        _run(['gltfpack', '-i', src, '-o', dst, '-cc', '-tc'], timeout)
+    else:
+        # Draco 지오메트리 압축 후 텍스처 ETC1S(KTX2) 변환
+        intermediate = f'{dst}.draco.glb'
+        _run(['gltf-transform', 'draco', src, intermediate], timeout)
+        _run(['gltf-transform', 'etc1s', intermediate, dst], timeout)
+
+
+def compress_model(model, encoding, timeout=600):
+    """
+    모델 파일을 지정 인코딩으로 재압축해 원본과 같은 폴더에 저장하고 Model3DVariant 반환
+    원본보다 크면 저장하지 않고 None 반환
+    """
+    if encoding not in ENCODER_TOOLS:
+        raise CompressionError(f'지원하지 않는 인코딩입니다: {encoding}')
+    if not model.model_url:
+        raise CompressionError('모델 파일이 없습니다.')
+
+    storage = model.model_url.storage
+    original_size = model.model_url.size
+    stem, _ = os.path.splitext(os.path.basename(model.model_url.name))
+    target_name = f'{os.path.dirname(model.model_url.name)}/{stem}.{encoding}.glb'
+
+    with tempfile.TemporaryDirectory() as workdir:
+        src = os.path.join(workdir, 'source.glb')
+        dst = os.path.join(workdir, f'output.{encoding}.glb')
+        with model.model_url.open('rb') as source, open(src, 'wb') as copy:
+            shutil.copyfileobj(source, copy)
+        _encode(encoding, src, dst, timeout)
+
+        compressed_size = os.path.getsize(dst)
+        if compressed_size >= original_size:
+            return None
+
+        variant = Model3DVariant.objects.filter(model=model, encoding=encoding).first()
+        if variant is not None:
+            variant.file.delete(save=False)
+        else:
+            variant = Model3DVariant(model=model, encoding=encoding)
+
+        with open(dst, 'rb') as output:
+            if storage.exists(target_name):
+                storage.delete(target_name)
+            variant.file.name = storage.save(target_name, File(output))
+
+    variant.file_size = compressed_size // 1024
+    variant.original_size = original_size // 1024
+    variant.compression_ratio = round(compressed_size / original_size, 4)
+    variant.save()
+    return variant
@@ -0,0 +1,267 @@
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+# 캐시 형식이나 외부 도구가 바뀌면 올려서 기존 항목을 무효화
+CACHE_VERSION = 1
+
+# 단계별 결과에 영향을 주는 meshroom_settings 키 (나머지 키가 바뀌어도 캐시 재사용)
+STAGE_SETTINGS = {
+    'features': ('describerTypes', 'describerPreset', 'describerQuality', 'contrastFiltering', 'gridFiltering'),
+    'matching': ('photometricMatchingMethod', 'geometricEstimator', 'geometricFilterType',
+                 'distanceRatio', 'maxIteration', 'guidedMatching', 'crossMatching', 'maxMatches'),
+}
+PER_IMAGE_STAGES = ('features',)
+PER_PAIR_STAGES = ('matching',)
+
+
+def file_sha256(path_or_file, chunk_size=1024 * 1024):
+    """파일 내용 SHA-256 (경로 또는 파일 객체, 청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    if hasattr(path_or_file, 'read'):
+        for chunk in iter(lambda: path_or_file.read(chunk_size), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+    with open(path_or_file, 'rb') as file:
+        return file_sha256(file, chunk_size)
+
+
+def settings_hash(stage, meshroom_settings):
+    """
+    단계 결과에 영향을 주는 설정만으로 만든 해시
+    매칭은 특징점 설정에도 의존하므로 features 설정을 함께 포함한다
+    """
+    meshroom_settings = meshroom_settings or {}
+    stages = ('features', stage) if stage != 'features' else ('features',)
+    relevant = {
+        name: {key: meshroom_settings.get(key) for key in STAGE_SETTINGS[name]}
+        for name in stages
+    }
+    relevant['version'] = CACHE_VERSION
+    relevant['tool'] = getattr(settings, 'PHOTOGRAMMETRY_TOOL_VERSION', '')
+    encoded = json.dumps(relevant, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+def image_key(image_hash, stage_settings_hash):
+    return f'{image_hash}-{stage_settings_hash}'
+
+
+def pair_key(hash_a, hash_b, stage_settings_hash):
+    """이미지 순서와 무관한 쌍 키"""
+    first, second = sorted((hash_a, hash_b))
+    return hashlib.sha256(f'{first}:{second}'.encode()).hexdigest() + f'-{stage_settings_hash}'
+
+
+class FeatureCache:
+    """
+    이미지 내용 기반 재구성 중간 결과 캐시
+    항목은 <root>/<stage>/<key 앞 2자리>/<key>/ 디렉터리이며,
+    조회할 때마다 mtime 을 갱신해 디스크 예산을 넘으면 오래 쓰이지 않은 항목부터 지운다
+    항목별 크기와 사용 순서는 메모리 색인으로 관리해 디렉터리는 처음 한 번만 스캔한다
+    """
+
+    def __init__(self, root=None, budget_bytes=None):
+        self.root = str(root or settings.PHOTOGRAMMETRY_CACHE_ROOT)
+        if budget_bytes is None:
+            budget_bytes = int(getattr(settings, 'PHOTOGRAMMETRY_CACHE_BUDGET_GB', 20) * 1024 ** 3)
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._index = None  # {경로: 크기}, 오래 쓰이지 않은 순 (처음 필요할 때 스캔)
+        self._size = 0
+
+    def _load_index(self):
+        # self._lock 을 잡은 상태에서 호출
+        if self._index is None:
+            self._index = OrderedDict((path, size) for _, size, path in sorted(self.entries()))
+            self._size = sum(self._index.values())
+
+    def _touch(self, path, size=None):
+        """색인에서 항목을 가장 최근 사용으로 옮김 (다른 프로세스가 만든 항목이면 추가)"""
+        with self._lock:
+            if self._index is None:
+                return
+            if path in self._index:
+                self._index.move_to_end(path)
+                return
+            self._index[path] = _tree_size(path) if size is None else size
+            self._size += self._index[path]
+
+    def _entry_path(self, stage, key):
+        return os.path.join(self.root, stage, key[:2], key)
+
+    def get(self, stage, key):
+        """캐시된 결과 디렉터리 경로 (없으면 None)"""
+        path = self._entry_path(stage, key)
+        try:
+            os.utime(path)  # LRU 순서 갱신 (다른 프로세스 / 재시작 후 스캔용)
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return path
+
+    def put(self, stage, key, producer):
+        """
+        producer(작업 디렉터리) 가 결과 파일을 쓰면 캐시에 원자적으로 등록하고 경로 반환
+        동시에 같은 키를 만든 경우 먼저 등록된 결과를 사용한다
+        """
+        path = self._entry_path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        os.makedirs(temp_path)
+        try:
+            producer(temp_path)
+            size = _tree_size(temp_path)
+            try:
+                os.rename(temp_path, path)
+            except OSError:
+                if not os.path.isdir(path):
+                    raise
+                shutil.rmtree(temp_path, ignore_errors=True)
+                self._touch(path)
+                return path
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+        self._touch(path, size)
+        self.evict(keep=path)  # 예산보다 큰 결과라도 방금 만든 항목은 돌려줄 수 있게 남김
+        return path
+
+    def get_or_compute(self, stage, key, producer):
+        """(결과 경로, 캐시 적중 여부)"""
+        path = self.get(stage, key)
+        if path is not None:
+            return path, True
+        return self.put(stage, key, producer), False
+
+    def entries(self):
+        """(mtime, 크기, 경로) 목록"""
+        result = []
+        for stage_dir in _scandir_dirs(self.root):
+            for shard in _scandir_dirs(stage_dir.path):
+                for entry in _scandir_dirs(shard.path):
+                    if entry.name.endswith('.tmp'):
+                        continue
+                    result.append((entry.stat().st_mtime, _tree_size(entry.path), entry.path))
+        return result
+
+    def size(self):
+        with self._lock:
+            self._load_index()
+            return self._size
+
+    def evict(self, budget_bytes=None, keep=None):
+        """
+        예산을 넘으면 가장 오래 전에 쓰인 항목부터 삭제. 반환: (삭제 수, 해제 바이트)
+        keep 경로는 삭제하지 않는다 (keep 만 남으면 예산을 넘어도 중단)
+        """
+        budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+        removed = freed = 0
+        with self._lock:
+            self._load_index()
+            while self._size > budget_bytes and self._index:
+                path = next(iter(self._index))
+                if path == keep:
+                    if len(self._index) == 1:
+                        break
+                    self._index.move_to_end(path)
+                    continue
+                size = self._index.pop(path)
+                shutil.rmtree(path, ignore_errors=True)
+                self._size -= size
+                removed += 1
+                freed += size
+        return removed, freed
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._index = OrderedDict()
+            self._size = 0
+
+
+def _scandir_dirs(path):
+    try:
+        with os.scandir(path) as entries:
+            return [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+
+
+def _tree_size(path):
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return total
+
+
+class IncrementalPlan:
+    """
+    재구성 재실행 시 다시 계산해야 하는 이미지/쌍 목록
+    이미 캐시된 단계 결과는 cached 에, 새로 계산할 대상은 pending 에 담긴다
+    """
+
+    def __init__(self, model, cache=None, pairs=None):
+        self.model = model
+        self.cache = cache or get_feature_cache()
+        self.images = list(model.source_images.all())
+        self.hashes = {image.id: source_image_hash(image) for image in self.images}
+        self.settings = model.meshroom_settings or {}
+        # 매칭 쌍: 지정하지 않으면 모든 조합 (exhaustive matching)
+        self.pairs = pairs if pairs is not None else list(itertools.combinations(self.images, 2))
+
+    def image_key(self, stage, image):
+        return image_key(self.hashes[image.id], settings_hash(stage, self.settings))
+
+    def pair_key(self, stage, image_a, image_b):
+        return pair_key(self.hashes[image_a.id], self.hashes[image_b.id], settings_hash(stage, self.settings))
+
+    def pending_images(self, stage='features'):
+        return [image for image in self.images if self.cache.get(stage, self.image_key(stage, image)) is None]
+
+    def pending_pairs(self, stage='matching'):
+        return [pair for pair in self.pairs if self.cache.get(stage, self.pair_key(stage, *pair)) is None]
+
+    def summary(self):
+        return {
+            'images': len(self.images),
+            'pending_images': {stage: len(self.pending_images(stage)) for stage in PER_IMAGE_STAGES},
+            'pairs': len(self.pairs),
+            'pending_pairs': {stage: len(self.pending_pairs(stage)) for stage in PER_PAIR_STAGES},
+        }
+
+
+def source_image_hash(image):
+    """SourceImage 내용 해시 (한 번 계산하면 DB 에 저장)"""
+    if not image.content_hash:
+        with image.image_url.open('rb') as file:
+            image.content_hash = file_sha256(file)
+        image.save(update_fields=['content_hash'])
+    return image.content_hash
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_feature_cache():
+    """설정에 맞는 캐시 인스턴스 (프로세스당 하나)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FeatureCache()
+    return _cache
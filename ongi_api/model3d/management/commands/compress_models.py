@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from model3d.compression import CompressionError, ENCODER_TOOLS, available_encodings, compress_model
+from model3d.models import Model3D
+
+
+class Command(BaseCommand):
+    help = '완료된 3D 모델 GLB 를 meshopt/Draco + KTX2 로 재압축한 전송용 파일을 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model_ids', nargs='*', help='대상 모델 ID (생략 시 변형이 없는 완료 모델 전체)')
+        parser.add_argument('--encoding', action='append', choices=list(ENCODER_TOOLS), dest='encodings')
+        parser.add_argument('--force', action='store_true', help='이미 있는 변형도 다시 생성')
+        parser.add_argument('--timeout', type=int, default=600, help='모델당 도구 실행 제한 시간(초)')
+
+    def handle(self, *args, **options):
+        installed = available_encodings()
+        encodings = options['encodings'] or installed
+        missing = [encoding for encoding in encodings if encoding not in installed]
+        if missing:
+            raise CommandError(f'도구가 설치되지 않은 인코딩: {", ".join(missing)} ({", ".join(ENCODER_TOOLS[e] for e in missing)})')
+        if not encodings:
+            raise CommandError('gltfpack 또는 gltf-transform 이 설치되어 있지 않습니다.')
+
+        models = Model3D.objects.filter(status='completed').exclude(model_url='')
+        if options['model_ids']:
+            models = models.filter(id__in=options['model_ids'])
+
+        for model in models.prefetch_related('variants').iterator(chunk_size=100):
+            existing = {variant.encoding for variant in model.variants.all()}
+            for encoding in encodings:
+                if encoding in existing and not options['force']:
+                    continue
+                try:
+                    variant = compress_model(model, encoding, timeout=options['timeout'])
+                except (CompressionError, OSError) as e:
+                    self.stderr.write(f'{model.id} [{encoding}] 실패: {e}')
+                    continue
+                if variant is None:
+                    self.stdout.write(f'{model.id} [{encoding}] 원본보다 커서 건너뜀')
+                else:
+                    self.stdout.write(
+                        f'{model.id} [{encoding}] {variant.original_size}KB -> {variant.file_size}KB '
+                        f'({variant.compression_ratio:.0%})'
+                    )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from model3d.feature_cache import get_feature_cache, IncrementalPlan
+from model3d.models import Model3D
+
+
+class Command(BaseCommand):
+    help = '사진측량 특징점/매칭 캐시 상태 조회 및 정리'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help='예산을 넘는 만큼 오래된 항목 삭제')
+        parser.add_argument('--budget-gb', type=float, help='--evict 에 사용할 예산 (기본: 설정값)')
+        parser.add_argument('--clear', action='store_true', help='캐시 전체 삭제')
+        parser.add_argument('--plan', metavar='MODEL_ID', help='모델 재실행 시 새로 계산할 이미지/쌍 수 출력')
+
+    def handle(self, *args, **options):
+        cache = get_feature_cache()
+        if options['clear']:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS('캐시를 비웠습니다.'))
+            return
+
+        if options['evict']:
+            budget = int(options['budget_gb'] * 1024 ** 3) if options['budget_gb'] is not None else None
+            removed, freed = cache.evict(budget)
+            self.stdout.write(f'{removed}개 항목 삭제 ({freed / 1024 ** 2:.1f}MB)')
+
+        if options['plan']:
+            try:
+                model = Model3D.objects.get(id=options['plan'])
+            except (Model3D.DoesNotExist, ValueError):
+                raise CommandError('모델을 찾을 수 없습니다.')
+            for key, value in IncrementalPlan(model, cache).summary().items():
+                self.stdout.write(f'{key}: {value}')
+
+        entries = cache.entries()
+        self.stdout.write(
+            f'{cache.root}: {len(entries)}개 항목, {sum(size for _, size, _ in entries) / 1024 ** 2:.1f}MB '
+            f'/ 예산 {cache.budget_bytes / 1024 ** 3:.1f}GB'
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from model3d.models import Model3D
+from model3d.pipeline import PipelineRunner
+from model3d.reconstruction import RECONSTRUCTION_STAGES
+
+
+class Command(BaseCommand):
+    help = '원본 이미지로 3D 모델을 재구성합니다. 중단된 경우 마지막으로 완료된 단계 다음부터 이어서 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model_ids', nargs='*', help='대상 모델 ID (생략 시 대기 중, 실패, 처리 중에 중단된 모델 전체)')
+        parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 실행')
+        parser.add_argument('--from-stage', choices=[stage.name for stage in RECONSTRUCTION_STAGES],
+                            help='지정 단계와 그 이후 단계만 다시 실행')
+        parser.add_argument('--workers', type=int, help='동시에 실행할 독립 단계 수 (기본: PHOTOGRAMMETRY_WORKERS)')
+        parser.add_argument('--list', action='store_true', help='실행하지 않고 단계별 상태만 출력')
+
+    def handle(self, *args, **options):
+        if options['model_ids']:
+            models = Model3D.objects.filter(id__in=options['model_ids'])
+        else:
+            # processing: 재구성 도중 프로세스가 죽어 상태가 남은 모델
+            models = Model3D.objects.filter(status__in=['pending', 'failed', 'processing'])
+        if not models.exists():
+            raise CommandError('재구성할 모델이 없습니다.')
+
+        for model in models:
+            if options['list']:
+                self._print_stages(model)
+                continue
+            if not model.source_images.exists():
+                self.stderr.write(f'{model.id}: 원본 이미지가 없어 건너뜀')
+                continue
+            runner = PipelineRunner(model, RECONSTRUCTION_STAGES, workers=options['workers'])
+            self.stdout.write(f'{model.id}: 재구성 시작')
+            if runner.run(restart=options['restart'], from_stage=options['from_stage']):
+                self.stdout.write(self.style.SUCCESS(f'{model.id}: 완료 ({model.processing_time}초)'))
+            else:
+                self.stderr.write(f'{model.id}: 실패 - {model.error_message}')
+            self._print_stages(model)
+
+    def _print_stages(self, model):
+        for stage in model.stages.all():
+            duration = f'{stage.duration:.1f}s' if stage.duration is not None else '-'
+            memory = f'{stage.peak_memory_mb}MB' if stage.peak_memory_mb is not None else '-'
+            self.stdout.write(f'  {stage.name:<24} {stage.status:<10} {duration:>10} {memory:>8}')
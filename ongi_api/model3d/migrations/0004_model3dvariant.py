@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:02
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0003_alter_model3d_model_url_alter_model3d_thumbnail_url_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Model3DVariant',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('encoding', models.CharField(choices=[('meshopt', 'Meshopt + KTX2'), ('draco', 'Draco + KTX2')], max_length=20)),
+                ('file', models.FileField(upload_to='models/')),
+                ('file_size', models.IntegerField()),
+                ('original_size', models.IntegerField()),
+                ('compression_ratio', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='model3d.model3d')),
+            ],
+            options={
+                'db_table': 'model3d_variants',
+                'unique_together': {('model', 'encoding')},
+            },
+        ),
+    ]
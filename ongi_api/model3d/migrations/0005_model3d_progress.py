@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:05
+
+from django.db import migrations, models
+
+
+def completed_progress(apps, schema_editor):
+    Model3D = apps.get_model('model3d', 'Model3D')
+    Model3D.objects.filter(status='completed').update(progress=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0004_model3dvariant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='model3d',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(completed_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0005_model3d_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourceimage',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:16
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0006_sourceimage_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='model3d',
+            name='current_stage',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='model3d',
+            name='error_message',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.CreateModel(
+            name='ReconstructionStage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50)),
+                ('order', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', '대기 중'), ('running', '실행 중'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=20)),
+                ('settings_hash', models.CharField(blank=True, default='', max_length=32)),
+                ('attempts', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, null=True)),
+                ('peak_memory_mb', models.IntegerField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stages', to='model3d.model3d')),
+            ],
+            options={
+                'db_table': 'model3d_reconstruction_stages',
+                'ordering': ['order'],
+                'unique_together': {('model', 'name')},
+            },
+        ),
+    ]
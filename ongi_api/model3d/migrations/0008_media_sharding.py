@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:31
+
+import model3d.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0007_reconstruction_stages'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='model3d',
+            name='model_url',
+            field=models.FileField(upload_to=model3d.models.model_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='model3d',
+            name='thumbnail_url',
+            field=models.ImageField(blank=True, null=True, upload_to=model3d.models.thumbnail_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='model3dvariant',
+            name='file',
+            field=models.FileField(upload_to=model3d.models.variant_upload_to),
+        ),
+        migrations.AlterField(
+            model_name='sourceimage',
+            name='image_url',
+            field=models.ImageField(upload_to=model3d.models.source_upload_to),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:55
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_completed_at(apps, schema_editor):
+    # 재구성 단계 기록이 있으면 마지막 단계 종료 시각, 없으면 마지막 수정 시각으로 채움
+    Model3D = apps.get_model('model3d', 'Model3D')
+    models = Model3D.objects.filter(status='completed').annotate(finished=Max('stages__finished_at'))
+    for model in models.iterator(chunk_size=1000):
+        Model3D.objects.filter(id=model.id).update(completed_at=model.finished or model.updated_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('model3d', '0008_media_sharding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='model3d',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
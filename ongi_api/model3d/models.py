@@ -1,6 +1,25 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 from artifacts.models import Artifact
+from core.media_layout import model_file_path
+
+
+# 모델별 폴더 models/<샤드>/<모델 ID>/ 에 저장 (변형 파일도 원본 옆)
+def model_upload_to(instance, filename):
+    return model_file_path(instance.id, filename)
+
+
+def thumbnail_upload_to(instance, filename):
+    return model_file_path(instance.id, 'thumbnails', filename)
+
+
+def source_upload_to(instance, filename):
+    return model_file_path(instance.model_id, 'sources', filename)
+
+
+def variant_upload_to(instance, filename):
+    return model_file_path(instance.model_id, filename)
 
 
 class Model3D(models.Model):
@@ -24,8 +43,8 @@ class Model3D(models.Model):
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     artifact = models.ForeignKey(Artifact, on_delete=models.CASCADE, related_name='models')
-    model_url = models.FileField(upload_to='models/')
-    thumbnail_url = models.ImageField(upload_to='models/thumbnails/', blank=True, null=True)  # 3D 모델 썸네일 이미지
+    model_url = models.FileField(upload_to=model_upload_to)
+    thumbnail_url = models.ImageField(upload_to=thumbnail_upload_to, blank=True, null=True)  # 3D 모델 썸네일 이미지
     
     file_format = models.CharField(
         max_length=10, 
@@ -37,18 +56,42 @@ class Model3D(models.Model):
     file_size = models.IntegerField(blank=True, null=True)  # 파일 크기 (KB)
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    progress = models.PositiveSmallIntegerField(default=0)  # 처리 진행률 (0~100)
     
     # 새로운 필드 추가
     description = models.TextField(blank=True, null=True)  # 모델 설명
     meshroom_settings = models.JSONField(blank=True, null=True)  # Meshroom 설정 정보 (선택적)
     
     processing_time = models.IntegerField(blank=True, null=True)  # 처리 소요 시간(초)
+    current_stage = models.CharField(max_length=50, blank=True, default='')  # 진행 중인 재구성 단계
+    error_message = models.TextField(blank=True, default='')  # 마지막 실패 원인
+    completed_at = models.DateTimeField(blank=True, null=True)  # 완료 상태가 된 시각 (재구성을 다시 하면 갱신)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"3D Model for {self.artifact.name}"
 
+    def save(self, *args, **kwargs):
+        # 완료 상태가 될 때 완료 시각 기록, 다른 상태로 바뀌면 비움 (이후 수정은 완료 시각을 바꾸지 않음)
+        completed_at = self.completed_at
+        if self.status != 'completed':
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.completed_at != completed_at:
+            kwargs['update_fields'] = {*update_fields, 'completed_at'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 상태/진행률, 모델 파일 변경 감지용 (이벤트 발행과 변형 정리는 model3d.signals 에서 처리)
+        instance._loaded_state = (instance.__dict__.get('status'), instance.__dict__.get('progress'))
+        instance._loaded_model_name = instance.__dict__.get('model_url')
+        return instance
+
     class Meta:
         db_table = 'model3d'
         verbose_name = '3D Model'
@@ -61,8 +104,9 @@ class SourceImage(models.Model):
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     model = models.ForeignKey(Model3D, on_delete=models.CASCADE, related_name='source_images')
-    image_url = models.ImageField(upload_to='models/sources/')
+    image_url = models.ImageField(upload_to=source_upload_to)
     order = models.IntegerField(default=0)  # 이미지 순서
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)  # 파일 SHA-256 (특징점 캐시 키)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -73,6 +117,33 @@ class SourceImage(models.Model):
         ordering = ['order']  # 순서대로 정렬
 
 
+class Model3DVariant(models.Model):
+    """
+    전송용으로 재인코딩한 3D 모델 파일 (원본 옆에 저장)
+    클라이언트는 지원하는 인코딩을 골라 내려받는다
+    """
+    ENCODING_CHOICES = [
+        ('meshopt', 'Meshopt + KTX2'),  # gltfpack -cc -tc
+        ('draco', 'Draco + KTX2'),  # gltf-transform draco/etc1s
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.ForeignKey(Model3D, on_delete=models.CASCADE, related_name='variants')
+    encoding = models.CharField(max_length=20, choices=ENCODING_CHOICES)
+    file = models.FileField(upload_to=variant_upload_to)
+    file_size = models.IntegerField()  # 파일 크기 (KB)
+    original_size = models.IntegerField()  # 원본 파일 크기 (KB)
+    compression_ratio = models.FloatField()  # 원본 대비 크기 비율 (0~1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.encoding} variant of {self.model}"
+
+    class Meta:
+        db_table = 'model3d_variants'
+        unique_together = ('model', 'encoding')
+
+
 # class ModelTexture(models.Model):
 #     """
 #     3D 모델에 사용되는 텍스처를 저장하는 모델
@@ -99,4 +170,38 @@ class SourceImage(models.Model):
 #         return f"{self.texture_type} texture for {self.model}"
 
 #     class Meta:
-#         db_table = 'model_textures'
\ No newline at end of file
+#         db_table = 'model_textures'
+
+
+class ReconstructionStage(models.Model):
+    """
+    재구성 파이프라인 단계별 체크포인트
+    완료된 단계는 재실행 시 건너뛰고, 실패한 단계부터 이어서 실행한다
+    """
+    STATUS_CHOICES = [
+        ('pending', '대기 중'),
+        ('running', '실행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.ForeignKey(Model3D, on_delete=models.CASCADE, related_name='stages')
+    name = models.CharField(max_length=50)
+    order = models.IntegerField(default=0)  # 표시 순서 (위상 정렬 순)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    settings_hash = models.CharField(max_length=32, blank=True, default='')  # 완료 당시 입력/설정 해시
+    attempts = models.IntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    duration = models.FloatField(blank=True, null=True)  # 소요 시간(초)
+    peak_memory_mb = models.IntegerField(blank=True, null=True)  # 외부 도구 최대 메모리(MB)
+    error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"{self.name} ({self.status}) for {self.model_id}"
+
+    class Meta:
+        db_table = 'model3d_reconstruction_stages'
+        unique_together = ('model', 'name')
+        ordering = ['order']
@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .feature_cache import source_image_hash
+from .models import Model3D, ReconstructionStage
+
+
+class StageFailed(Exception):
+    pass
+
+
+class Stage:
+    """
+    재구성 그래프의 한 단계
+    run(ctx) 는 ctx.output_dir 에 결과를 쓰고, 선행 단계 결과는 ctx.inputs[이름] 으로 읽는다
+    settings_keys: 결과에 영향을 주는 meshroom_settings 키 (바뀌면 이 단계부터 다시 실행)
+    """
+
+    def __init__(self, name, run, deps=(), weight=1, settings_keys=(), timeout=None):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.weight = weight
+        self.settings_keys = tuple(settings_keys)
+        self.timeout = timeout
+
+
+def topological_order(stages):
+    by_name = {stage.name: stage for stage in stages}
+    ordered, visiting, done = [], set(), set()
+
+    def visit(stage):
+        if stage.name in done:
+            return
+        if stage.name in visiting:
+            raise ValueError(f'순환 의존성: {stage.name}')
+        visiting.add(stage.name)
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f'{stage.name} 의 선행 단계 {dep} 가 없습니다.')
+            visit(by_name[dep])
+        visiting.discard(stage.name)
+        done.add(stage.name)
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+class StageContext:
+    """단계 실행 환경 (작업 디렉터리, 선행 결과, 외부 명령 실행 및 메모리 측정)"""
+
+    def __init__(self, model, stage, work_dir):
+        self.model = model
+        self.stage = stage
+        self.work_dir = work_dir
+        self.output_dir = os.path.join(work_dir, stage.name)
+        self.inputs = {dep: os.path.join(work_dir, dep) for dep in stage.deps}
+        self.settings = model.meshroom_settings or {}
+        self.peak_rss_kb = None
+        self.log_path = os.path.join(work_dir, 'logs', f'{stage.name}.log')
+
+    def path(self, stage_name, *parts):
+        """다른 단계(선행 단계의 선행 포함) 결과 경로"""
+        return os.path.join(self.work_dir, stage_name, *parts)
+
+    def run(self, command, timeout=None):
+        """외부 명령 실행. 자식 프로세스의 최대 RSS 를 기록하고 실패 시 StageFailed"""
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        timeout = timeout or self.stage.timeout
+        with open(self.log_path, 'ab') as log:
+            log.write(f'$ {" ".join(map(str, command))}\n'.encode())
+            log.flush()
+            try:
+                process = subprocess.Popen([str(part) for part in command], stdout=log, stderr=subprocess.STDOUT)
+            except FileNotFoundError:
+                raise StageFailed(f'{command[0]} 를 찾을 수 없습니다.')
+            deadline = time.monotonic() + timeout if timeout else None
+            while True:
+                # wait4 는 해당 자식의 자원 사용량(ru_maxrss, KB)을 돌려준다
+                pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+                if pid:
+                    break
+                if deadline and time.monotonic() > deadline:
+                    process.kill()
+                    os.wait4(process.pid, 0)
+                    raise StageFailed(f'{command[0]} 실행 시간 초과 ({timeout}초)')
+                time.sleep(0.2)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        self.peak_rss_kb = max(self.peak_rss_kb or 0, usage.ru_maxrss)
+        if process.returncode != 0:
+            raise StageFailed(f'{command[0]} 종료 코드 {process.returncode} (로그: {self.log_path})')
+
+
+def stage_fingerprint(stage, model, completed_fingerprints):
+    """단계 설정과 선행 단계 지문으로 만든 해시 (바뀌면 재실행)"""
+    meshroom_settings = model.meshroom_settings or {}
+    payload = {
+        'settings': {key: meshroom_settings.get(key) for key in stage.settings_keys},
+        'deps': [completed_fingerprints.get(dep, '') for dep in stage.deps],
+    }
+    if not stage.deps:
+        # 첫 단계는 입력 이미지 내용도 지문에 포함 (이미지가 바뀌면 전체 재실행)
+        # 해시를 여기서 계산해 두어, 나중 단계가 content_hash 를 채워도 다음 실행의 지문이 바뀌지 않게 한다
+        payload['images'] = sorted(source_image_hash(image) for image in model.source_images.all())
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+class PipelineRunner:
+    """
+    단계 그래프 실행기
+    - 각 단계가 끝날 때마다 ReconstructionStage 에 체크포인트를 저장
+    - 재실행 시 지문이 같고 결과 디렉터리가 남아 있는 완료 단계는 건너뜀
+    - 선행 단계가 모두 끝난 단계들은 workers 개까지 병렬 실행
+    """
+
+    def __init__(self, model, stages, work_dir=None, workers=None):
+        self.model = model
+        self.stages = topological_order(stages)
+        self.by_name = {stage.name: stage for stage in self.stages}
+        self.work_dir = work_dir or os.path.join(settings.PHOTOGRAMMETRY_WORK_ROOT, str(model.id))
+        self.workers = workers or getattr(settings, 'PHOTOGRAMMETRY_WORKERS', 2)
+        self.total_weight = sum(stage.weight for stage in self.stages) or 1
+
+    def _descendants(self, names):
+        result = set(names)
+        for stage in self.stages:
+            if result.intersection(stage.deps):
+                result.add(stage.name)
+        return result
+
+    def _load_records(self, restart, from_stage):
+        records = {record.name: record for record in self.model.stages.all()}
+        for order, stage in enumerate(self.stages):
+            if stage.name not in records:
+                records[stage.name] = ReconstructionStage.objects.create(model=self.model, name=stage.name, order=order)
+            elif records[stage.name].order != order:
+                records[stage.name].order = order
+                records[stage.name].save(update_fields=['order'])
+
+        invalid = set()
+        if restart:
+            invalid = set(self.by_name)
+        elif from_stage:
+            if from_stage not in self.by_name:
+                raise ValueError(f'알 수 없는 단계: {from_stage}')
+            invalid = self._descendants({from_stage})
+
+        # 실행 중에 프로세스가 죽어 running 으로 남은 단계는 결과가 불완전하므로 다시 실행
+        invalid.update(name for name in self.by_name if records[name].status == 'running')
+
+        # 지문이 바뀌었거나 결과가 사라진 완료 단계와 그 후속 단계는 다시 실행
+        fingerprints = {}
+        for stage in self.stages:
+            record = records[stage.name]
+            fingerprints[stage.name] = stage_fingerprint(stage, self.model, fingerprints)
+            if record.status != 'completed' or stage.name in invalid:
+                continue
+            if record.settings_hash != fingerprints[stage.name] or not os.path.isdir(os.path.join(self.work_dir, stage.name)):
+                invalid.add(stage.name)
+        invalid = self._descendants(invalid)
+
+        for name in invalid:
+            record = records[name]
+            if record.status != 'pending':
+                record.status = 'pending'
+                record.save(update_fields=['status'])
+            shutil.rmtree(os.path.join(self.work_dir, name), ignore_errors=True)
+        return records, fingerprints
+
+    def _update_model(self, records, **fields):
+        done_weight = sum(self.by_name[name].weight for name, record in records.items()
+                          if name in self.by_name and record.status == 'completed')
+        running = [name for name in self.by_name if records[name].status == 'running']
+        fields.setdefault('progress', min(99, int(done_weight * 100 / self.total_weight)))
+        fields.setdefault('current_stage', ', '.join(running))
+        for key, value in fields.items():
+            setattr(self.model, key, value)
+        self.model.save(update_fields=[*fields, 'updated_at'])
+
+    def _execute(self, stage):
+        """단계 하나 실행 (작업 스레드). 반환: (소요 시간, 최대 메모리 KB)"""
+        context = StageContext(self.model, stage, self.work_dir)
+        shutil.rmtree(context.output_dir, ignore_errors=True)
+        os.makedirs(context.output_dir)
+        started = time.monotonic()
+        try:
+            stage.run(context)
+        finally:
+            if self.workers > 1:
+                connection.close()  # 작업 스레드의 DB 연결 정리
+        return time.monotonic() - started, context.peak_rss_kb
+
+    def run(self, restart=False, from_stage=None):
+        """그래프 실행. 성공하면 True, 실패하면 Model3D 를 failed 로 표시하고 False"""
+        os.makedirs(self.work_dir, exist_ok=True)
+        records, fingerprints = self._load_records(restart, from_stage)
+        started = time.monotonic()
+        self._update_model(records, status='processing', error_message='')
+
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = {}
+            while True:
+                if failure is None:
+                    for stage in self.stages:
+                        record = records[stage.name]
+                        ready = all(records[dep].status == 'completed' for dep in stage.deps)
+                        if record.status in ('pending', 'failed') and ready and len(running) < self.workers:
+                            record.status = 'running'
+                            record.attempts += 1
+                            record.started_at = timezone.now()
+                            record.error = ''
+                            record.save(update_fields=['status', 'attempts', 'started_at', 'error'])
+                            if self.workers > 1:
+                                running[executor.submit(self._execute, stage)] = stage
+                            else:
+                                running[_completed_future(self._execute, stage)] = stage
+                    self._update_model(records)
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                close_old_connections()
+                for future in finished:
+                    stage = running.pop(future)
+                    record = records[stage.name]
+                    record.finished_at = timezone.now()
+                    try:
+                        record.duration, peak_rss_kb = future.result()
+                    except Exception as e:
+                        record.status = 'failed'
+                        record.duration = (record.finished_at - record.started_at).total_seconds()
+                        record.error = str(e)[:2000]
+                        failure = failure or f'{stage.name}: {e}'
+                    else:
+                        record.status = 'completed'
+                        record.settings_hash = fingerprints[stage.name]
+                        record.peak_memory_mb = round(peak_rss_kb / 1024) if peak_rss_kb else None
+                    record.save()
+
+        unfinished = [name for name in self.by_name if records[name].status != 'completed']
+        if failure is None and unfinished:
+            # 실행할 수 없는 단계가 남으면 완료로 표시하지 않음
+            failure = f'완료되지 않은 단계: {", ".join(unfinished)}'
+
+        elapsed = int(time.monotonic() - started)
+        if failure:
+            self._update_model(records, status='failed', error_message=failure[:2000], current_stage='')
+            return False
+        self._update_model(
+            records, status='completed', progress=100, current_stage='',
+            processing_time=(self.model.processing_time or 0) + elapsed,
+        )
+        return True
+
+
+def _completed_future(function, *args):
+    """workers=1 일 때 현재 스레드에서 바로 실행한 결과를 Future 로 감쌈"""
+    from concurrent.futures import Future
+
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def run_reconstruction(model_id, stages=None, **options):
+    """모델 재구성 실행 (중단된 경우 마지막으로 완료된 단계 이후부터)"""
+    from .reconstruction import RECONSTRUCTION_STAGES
+
+    model = Model3D.objects.get(id=model_id)
+    runner = PipelineRunner(model, stages or RECONSTRUCTION_STAGES, workers=options.pop('workers', None))
+    return runner.run(**options)
@@ -0,0 +1,299 @@
+"""
+AliceVision(Meshroom 기본 파이프라인) 단계 정의
+각 단계 결과는 <PHOTOGRAMMETRY_WORK_ROOT>/<모델 ID>/<단계 이름>/ 에 남아 재실행 시 체크포인트로 쓰인다
+특징점 추출/매칭은 이미지·쌍 단위 캐시(feature_cache)를 사용해 새로 추가된 이미지분만 계산한다
+"""
+import glob
+import json
+import os
+import shutil
+
+from django.conf import settings
+from django.core.files import File
+
+from .compression import CompressionError, ENCODER_TOOLS, compress_model
+from .feature_cache import STAGE_SETTINGS, get_feature_cache, image_key, pair_key, settings_hash, source_image_hash
+from .pipeline import Stage, StageFailed
+
+
+def _bin(name):
+    bin_dir = getattr(settings, 'ALICEVISION_BIN_DIR', '')
+    return os.path.join(bin_dir, name) if bin_dir else name
+
+
+def _settings_args(ctx, keys):
+    """meshroom_settings 중 지정된 키를 --키 값 인자로 변환"""
+    args = []
+    for key in keys:
+        value = ctx.settings.get(key)
+        if value is not None:
+            args += [f'--{key}', int(value) if isinstance(value, bool) else value]
+    return args
+
+
+def _camera_sfm(ctx):
+    return ctx.path('camera_init', 'cameraInit.sfm')
+
+
+def _view_images(ctx):
+    """{viewId: SourceImage} (카메라 초기화 시 파일 이름을 SourceImage ID 로 저장)"""
+    images = {str(image.id): image for image in ctx.model.source_images.all()}
+    with open(_camera_sfm(ctx)) as file:
+        views = json.load(file)['views']
+    result = {}
+    for view in views:
+        stem = os.path.splitext(os.path.basename(view['path']))[0]
+        if stem in images:
+            result[view['viewId']] = images[stem]
+    return result
+
+
+def camera_init(ctx):
+    images_dir = os.path.join(ctx.output_dir, 'images')
+    os.makedirs(images_dir)
+    for image in ctx.model.source_images.all():
+        _, ext = os.path.splitext(image.image_url.name)
+        with image.image_url.open('rb') as source, open(os.path.join(images_dir, f'{image.id}{ext.lower()}'), 'wb') as copy:
+            shutil.copyfileobj(source, copy)
+    command = [_bin('aliceVision_cameraInit'), '--imageFolder', images_dir,
+               '--output', _camera_sfm(ctx), '--allowSingleView', 1]
+    if settings.ALICEVISION_SENSOR_DB:
+        command += ['--sensorDatabase', settings.ALICEVISION_SENSOR_DB]
+    ctx.run(command)
+
+
+def feature_extraction(ctx):
+    """
+    캐시된 결과는 현재 viewId 이름으로 먼저 복사하고, 캐시에 없는 이미지만 추출
+    (새 항목 등록으로 예산 초과 삭제가 일어나도 이미 복사한 결과는 영향 없음)
+    """
+    cache = get_feature_cache()
+    stage_hash = settings_hash('features', ctx.settings)
+    views = _view_images(ctx)
+    keys = {view_id: image_key(source_image_hash(image), stage_hash) for view_id, image in views.items()}
+    pending = set()
+    for view_id, key in keys.items():
+        cached = cache.get('features', key)
+        if cached is None:
+            pending.add(view_id)
+            continue
+        for name in os.listdir(cached):
+            shutil.copy(os.path.join(cached, name), os.path.join(ctx.output_dir, view_id + name[len('view'):]))
+
+    if pending:
+        new_dir = os.path.join(ctx.output_dir, '_new')
+        with open(_camera_sfm(ctx)) as file:
+            sfm = json.load(file)
+        sfm['views'] = [view for view in sfm['views'] if view['viewId'] in pending]
+        pending_sfm = os.path.join(ctx.output_dir, '_pending.sfm')
+        with open(pending_sfm, 'w') as file:
+            json.dump(sfm, file)
+        ctx.run([_bin('aliceVision_featureExtraction'), '--input', pending_sfm, '--output', new_dir,
+                 *_settings_args(ctx, STAGE_SETTINGS['features'])])
+
+        for view_id in pending:
+            files = glob.glob(os.path.join(new_dir, f'{view_id}.*'))
+
+            def store(path, files=files, view_id=view_id):
+                for source in files:
+                    shutil.copy(source, os.path.join(path, 'view' + os.path.basename(source)[len(view_id):]))
+
+            cache.put('features', keys[view_id], store)
+            for source in files:
+                shutil.move(source, ctx.output_dir)
+        shutil.rmtree(new_dir, ignore_errors=True)
+        os.remove(pending_sfm)
+
+
+def image_matching(ctx):
+    command = [_bin('aliceVision_imageMatching'), '--input', _camera_sfm(ctx),
+               '--featuresFolders', ctx.inputs['feature_extraction'],
+               '--output', os.path.join(ctx.output_dir, 'imageMatches.txt')]
+    if settings.ALICEVISION_VOCTREE:
+        command += ['--tree', settings.ALICEVISION_VOCTREE]
+    ctx.run(command)
+
+
+def _read_pairs(path):
+    """imageMatches.txt (한 줄: 기준 viewId 와 짝 viewId 목록) -> 쌍 목록"""
+    pairs = set()
+    with open(path) as file:
+        for line in file:
+            ids = line.split()
+            for other in ids[1:]:
+                pairs.add(tuple(sorted((ids[0], other), key=int)))
+    return sorted(pairs)
+
+
+def _read_matches(paths):
+    """
+    *.matches.txt 파싱 -> {(I, J): [(describer, ['i j', ...]), ...]}
+    형식: 'I J' / 기술자 수 / 기술자마다 '종류 개수' 와 개수만큼의 'i j' 줄
+    """
+    blocks = {}
+    for path in paths:
+        with open(path) as file:
+            lines = iter(file.read().split('\n'))
+        for header in lines:
+            if not header.strip():
+                continue
+            view_a, view_b = header.split()
+            describers = []
+            for _ in range(int(next(lines))):
+                describer, count = next(lines).split()
+                describers.append((describer, [next(lines) for _ in range(int(count))]))
+            blocks[(view_a, view_b)] = describers
+    return blocks
+
+
+def _swap(describers):
+    return [(describer, [' '.join(reversed(line.split())) for line in lines]) for describer, lines in describers]
+
+
+def feature_matching(ctx):
+    """
+    캐시에 없는 쌍만 매칭하고 쌍별 결과를 캐시에 저장
+    캐시에는 이미지 해시 순서 기준으로 저장해 viewId 가 바뀌어도 재사용한다
+    캐시된 쌍은 새 항목을 등록하기 전에 읽어 둔다
+    """
+    cache = get_feature_cache()
+    stage_hash = settings_hash('matching', ctx.settings)
+    views = _view_images(ctx)
+    hashes = {view_id: source_image_hash(image) for view_id, image in views.items()}
+    pairs = [pair for pair in _read_pairs(ctx.path('image_matching', 'imageMatches.txt'))
+             if pair[0] in hashes and pair[1] in hashes]
+    keys = {pair: pair_key(hashes[pair[0]], hashes[pair[1]], stage_hash) for pair in pairs}
+    blocks, pending = {}, []
+    for pair in pairs:
+        cached = cache.get('matching', keys[pair])
+        if cached is None:
+            pending.append(pair)
+            continue
+        with open(os.path.join(cached, 'pair.json')) as file:
+            canonical = json.load(file)
+        blocks[pair] = canonical if hashes[pair[0]] <= hashes[pair[1]] else _swap(canonical)
+
+    if pending:
+        new_dir = os.path.join(ctx.output_dir, '_new')
+        pairs_path = os.path.join(ctx.output_dir, '_pending_pairs.txt')
+        with open(pairs_path, 'w') as file:
+            file.writelines(f'{view_a} {view_b}\n' for view_a, view_b in pending)
+        ctx.run([_bin('aliceVision_featureMatching'), '--input', _camera_sfm(ctx),
+                 '--featuresFolders', ctx.inputs['feature_extraction'], '--imagePairsList', pairs_path,
+                 '--output', new_dir, *_settings_args(ctx, STAGE_SETTINGS['matching'])])
+        found = _read_matches(glob.glob(os.path.join(new_dir, '*.matches.txt')))
+        for view_a, view_b in pending:
+            # 매칭이 없는 쌍도 빈 결과로 저장해 다시 계산하지 않음
+            describers = found.get((view_a, view_b)) or _swap(found.get((view_b, view_a), []))
+            blocks[(view_a, view_b)] = describers
+            canonical = describers if hashes[view_a] <= hashes[view_b] else _swap(describers)
+
+            def store(path, canonical=canonical):
+                with open(os.path.join(path, 'pair.json'), 'w') as file:
+                    json.dump(canonical, file)
+
+            cache.put('matching', keys[(view_a, view_b)], store)
+        shutil.rmtree(new_dir, ignore_errors=True)
+        os.remove(pairs_path)
+
+    with open(os.path.join(ctx.output_dir, '0.matches.txt'), 'w') as file:
+        for view_a, view_b in pairs:
+            describers = blocks[(view_a, view_b)]
+            if not any(lines for _, lines in describers):
+                continue
+            file.write(f'{view_a} {view_b}\n{len(describers)}\n')
+            for describer, lines in describers:
+                file.write(f'{describer} {len(lines)}\n')
+                file.writelines(f'{line}\n' for line in lines)
+
+
+def structure_from_motion(ctx):
+    ctx.run([_bin('aliceVision_incrementalSfM'), '--input', _camera_sfm(ctx),
+             '--featuresFolders', ctx.path('feature_extraction'), '--matchesFolders', ctx.inputs['feature_matching'],
+             '--output', os.path.join(ctx.output_dir, 'sfm.abc'),
+             '--outputViewsAndPoses', os.path.join(ctx.output_dir, 'cameras.sfm')])
+
+
+def _sfm(ctx):
+    return ctx.path('structure_from_motion', 'sfm.abc')
+
+
+def prepare_dense_scene(ctx):
+    ctx.run([_bin('aliceVision_prepareDenseScene'), '--input', _sfm(ctx), '--output', ctx.output_dir])
+
+
+def depth_map(ctx):
+    ctx.run([_bin('aliceVision_depthMapEstimation'), '--input', _sfm(ctx),
+             '--imagesFolder', ctx.inputs['prepare_dense_scene'], '--output', ctx.output_dir])
+
+
+def depth_map_filter(ctx):
+    ctx.run([_bin('aliceVision_depthMapFiltering'), '--input', _sfm(ctx),
+             '--depthMapsFolder', ctx.inputs['depth_map'], '--output', ctx.output_dir])
+
+
+def meshing(ctx):
+    ctx.run([_bin('aliceVision_meshing'), '--input', _sfm(ctx), '--depthMapsFolder', ctx.inputs['depth_map_filter'],
+             '--output', os.path.join(ctx.output_dir, 'densePointCloud.abc'),
+             '--outputMesh', os.path.join(ctx.output_dir, 'mesh.obj')])
+
+
+def mesh_filtering(ctx):
+    ctx.run([_bin('aliceVision_meshFiltering'), '--inputMesh', ctx.path('meshing', 'mesh.obj'),
+             '--outputMesh', os.path.join(ctx.output_dir, 'mesh.obj')])
+
+
+def texturing(ctx):
+    ctx.run([_bin('aliceVision_texturing'), '--input', ctx.path('meshing', 'densePointCloud.abc'),
+             '--imagesFolder', ctx.path('prepare_dense_scene'),
+             '--inputMesh', ctx.path('mesh_filtering', 'mesh.obj'), '--output', ctx.output_dir])
+
+
+def export_glb(ctx):
+    """텍스처 메시를 GLB 로 변환해 모델 파일로 저장"""
+    output = os.path.join(ctx.output_dir, 'model.glb')
+    ctx.run(['gltfpack', '-i', ctx.path('texturing', 'texturedMesh.obj'), '-o', output, '-noq'])
+    model = ctx.model
+    if model.model_url:
+        model.model_url.delete(save=False)
+    with open(output, 'rb') as file:
+        model.model_url.save(f'{model.id}.glb', File(file), save=False)
+    model.file_format = 'glb'
+    model.file_size = os.path.getsize(output) // 1024
+    model.save(update_fields=['model_url', 'file_format', 'file_size', 'updated_at'])
+
+
+def _compress(encoding):
+    def run(ctx):
+        if not shutil.which(ENCODER_TOOLS[encoding]):
+            return  # 도구가 없으면 건너뜀 (나중에 compress_models 명령으로 생성 가능)
+        try:
+            compress_model(ctx.model, encoding)
+        except CompressionError as e:
+            raise StageFailed(str(e))
+    return run
+
+
+def _timeout():
+    return getattr(settings, 'PHOTOGRAMMETRY_STAGE_TIMEOUT', None)
+
+
+# weight: 진행률 계산용 상대 소요 시간
+RECONSTRUCTION_STAGES = [
+    Stage('camera_init', camera_init, weight=1, timeout=_timeout()),
+    Stage('feature_extraction', feature_extraction, deps=['camera_init'], weight=8,
+          settings_keys=STAGE_SETTINGS['features'], timeout=_timeout()),
+    Stage('image_matching', image_matching, deps=['feature_extraction'], weight=2, timeout=_timeout()),
+    Stage('feature_matching', feature_matching, deps=['image_matching'], weight=10,
+          settings_keys=STAGE_SETTINGS['matching'], timeout=_timeout()),
+    Stage('structure_from_motion', structure_from_motion, deps=['feature_matching'], weight=10, timeout=_timeout()),
+    Stage('prepare_dense_scene', prepare_dense_scene, deps=['structure_from_motion'], weight=2, timeout=_timeout()),
+    Stage('depth_map', depth_map, deps=['prepare_dense_scene'], weight=30, timeout=_timeout()),
+    Stage('depth_map_filter', depth_map_filter, deps=['depth_map'], weight=8, timeout=_timeout()),
+    Stage('meshing', meshing, deps=['depth_map_filter'], weight=12, timeout=_timeout()),
+    Stage('mesh_filtering', mesh_filtering, deps=['meshing'], weight=2, timeout=_timeout()),
+    Stage('texturing', texturing, deps=['mesh_filtering'], weight=10, timeout=_timeout()),
+    Stage('export_glb', export_glb, deps=['texturing'], weight=2, timeout=_timeout()),
+    # 전송용 변형은 서로 독립이라 병렬 실행
+    *(Stage(f'compress_{encoding}', _compress(encoding), deps=['export_glb'], weight=2) for encoding in ENCODER_TOOLS),
+]
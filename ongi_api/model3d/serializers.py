@@ -1,16 +1,34 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
-from .models import Model3D, SourceImage
+from .models import Model3D, Model3DVariant, ReconstructionStage, SourceImage
 from artifacts.models import Artifact
 from artifacts.serializers import ArtifactSerializer
+from core.serializers import DynamicFieldsMixin, FragmentListSerializer
 
-class SourceImageSerializer(serializers.ModelSerializer):
+class SourceImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """3D 모델 원본 이미지 시리얼라이저"""
     class Meta:
         model = SourceImage
         fields = ['id', 'image_url', 'order', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class Model3DSerializer(serializers.ModelSerializer):
+class Model3DVariantSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """전송용 압축 변형 시리얼라이저"""
+    class Meta:
+        model = Model3DVariant
+        fields = ['encoding', 'file', 'file_size', 'compression_ratio']
+
+class ReconstructionStageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """재구성 단계 진행 상황 시리얼라이저"""
+    class Meta:
+        model = ReconstructionStage
+        fields = ['name', 'status', 'attempts', 'started_at', 'finished_at', 'duration', 'peak_memory_mb']
+
+def _with_artifact_detail(queryset, serializer):
+    artifacts = serializer.fields['artifact_detail'].eager_load(Artifact.objects.all())
+    return queryset.prefetch_related(Prefetch('artifact', queryset=artifacts))
+
+class Model3DSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """3D 모델 시리얼라이저"""
     artifact_name = serializers.SerializerMethodField()
     source_images = SourceImageSerializer(many=True, read_only=True)
@@ -19,10 +37,30 @@ class Model3DSerializer(serializers.ModelSerializer):
         model = Model3D
         fields = [
             'id', 'artifact', 'artifact_name', 'model_url', 'thumbnail_url',
-            'file_format', 'poly_count', 'file_size', 'status',
+            'file_format', 'poly_count', 'file_size', 'status', 'progress', 'current_stage',
             'processing_time', 'source_images', 'description', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'current_stage', 'created_at', 'updated_at']
+        expandable_fields = {
+            'artifact_detail': lambda: ArtifactSerializer(source='artifact', read_only=True),  # 연결된 유물 상세
+            'encodings': lambda: Model3DVariantSerializer(source='variants', many=True, read_only=True),  # 사용 가능한 압축 변형
+            'stages': lambda: ReconstructionStageSerializer(many=True, read_only=True),  # 재구성 단계별 진행 상황
+        }
+        eager_loading = {
+            # artifact_detail 이 있으면 그 prefetch 로 유물이 채워짐
+            'artifact_name': lambda queryset, serializer: (
+                queryset if 'artifact_detail' in serializer.fields else queryset.select_related('artifact')
+            ),
+            'source_images': lambda queryset, serializer: queryset.prefetch_related('source_images'),
+            'artifact_detail': _with_artifact_detail,
+            'encodings': lambda queryset, serializer: queryset.prefetch_related('variants'),
+            'stages': lambda queryset, serializer: queryset.prefetch_related('stages'),
+        }
+        fragment_cache = True
+        fragment_dependencies = {
+            Artifact: lambda artifact: artifact.models.values_list('id', flat=True),  # artifact_name
+        }
+        list_serializer_class = FragmentListSerializer
     
     def get_artifact_name(self, obj):
         """연결된 유물 이름 반환"""
@@ -30,16 +68,9 @@ class Model3DSerializer(serializers.ModelSerializer):
 
 class Model3DDetailSerializer(Model3DSerializer):
     """3D 모델 상세 정보 시리얼라이저"""
-    artifact_detail = serializers.SerializerMethodField()
     
     class Meta(Model3DSerializer.Meta):
-        fields = Model3DSerializer.Meta.fields + ['artifact_detail']
-    
-    def get_artifact_detail(self, obj):
-        """연결된 유물 상세 정보 반환"""
-        if not obj.artifact:
-            return None
-        return ArtifactSerializer(obj.artifact).data
+        default_expand = ['artifact_detail', 'encodings']
 
 class Model3DCreateSerializer(serializers.Serializer):
     """3D 모델 생성 요청 시리얼라이저"""
@@ -49,6 +80,7 @@ class Model3DCreateSerializer(serializers.Serializer):
 class ModelStatusUpdateSerializer(serializers.Serializer):
     """3D 모델 상태 업데이트 시리얼라이저"""
     status = serializers.ChoiceField(choices=Model3D.STATUS_CHOICES)
+    progress = serializers.IntegerField(required=False, min_value=0, max_value=100)
     processing_time = serializers.IntegerField(required=False, allow_null=True)
     poly_count = serializers.IntegerField(required=False, allow_null=True)
     file_size = serializers.IntegerField(required=False, allow_null=True)
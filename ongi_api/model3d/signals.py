@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from artifacts.trending import get_trending
+from core.events import publish_on_commit
+from .models import Model3D, Model3DVariant
+
+
+@receiver(post_save, sender=Model3D)
+def model3d_saved(sender, instance, created, **kwargs):
+    # 생성되었거나 상태/진행률이 바뀐 경우에만 구독자에게 알림
+    state = (instance.status, instance.progress)
+    previous = getattr(instance, '_loaded_state', None)
+    if instance.status == 'completed' and (created or previous is None or previous[0] != 'completed'):
+        # 3D 모델 완성은 유물 인기 점수에 반영
+        completed_at = instance.completed_at
+        transaction.on_commit(lambda: get_trending().record(instance.artifact_id, 'model', completed_at))
+    if created or state != previous:
+        publish_on_commit(
+            [f'model3d:{instance.id}', f'artifact:{instance.artifact_id}'],
+            'model3d.status',
+            {
+                'id': str(instance.id),
+                'artifact_id': str(instance.artifact_id),
+                'status': instance.status,
+                'progress': instance.progress,
+                # 상세 API 처럼 완료된 모델의 파일만 공개
+                'model_url': instance.model_url.url if instance.model_url and instance.status == 'completed' else None,
+                'updated_at': instance.updated_at,
+            },
+            # 진행 중/실패한 모델의 상태는 상세 API 처럼 관리자에게만 노출
+            staff_only=instance.status != 'completed',
+        )
+    instance._loaded_state = state
+
+
+@receiver(post_save, sender=Model3D)
+def model3d_file_changed(sender, instance, created, **kwargs):
+    # 모델 파일이 바뀌면 (내용 해시가 붙은 이름이 바뀜) 이전 파일로 만든 압축 변형 삭제
+    # 파일은 미참조 미디어 정리 대상으로 표시되고, compress_models 명령이나 재구성 단계가 다시 만든다
+    name = instance.model_url.name or ''
+    previous = getattr(instance, '_loaded_model_name', None)
+    if not created and previous is not None and previous != name:
+        Model3DVariant.objects.filter(model=instance).delete()
+    instance._loaded_model_name = name
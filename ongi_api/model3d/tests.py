@@ -1,3 +1,232 @@
+import os
+import shutil
+import tempfile
+
 from django.test import TestCase
+from django.test.utils import override_settings
+
+from artifacts.models import Artifact
+from model3d.models import Model3D
+from model3d.pipeline import PipelineRunner, Stage
+
+
+class ReconstructionPipelineTests(TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+        self.model = Model3D.objects.create(artifact=Artifact.objects.create(name='반가사유상'))
+        self.calls = []
+        self.fail_on = None
+
+    def stage(self, name, deps=()):
+        def run(ctx):
+            self.calls.append(name)
+            if name == self.fail_on:
+                raise RuntimeError('도구 오류')
+            open(os.path.join(ctx.output_dir, 'out'), 'w').close()
+        return Stage(name, run, deps=deps)
+
+    def run_pipeline(self, **options):
+        stages = [self.stage('a'), self.stage('b', ['a']), self.stage('c', ['b']), self.stage('d', ['b'])]
+        return PipelineRunner(self.model, stages, work_dir=self.work_dir, workers=1).run(**options)
+
+    def test_resume_skips_completed_stages(self):
+        self.fail_on = 'c'
+        self.assertFalse(self.run_pipeline())
+        self.model.refresh_from_db()
+        self.assertEqual(self.model.status, 'failed')
+        self.assertIn('c:', self.model.error_message)
+        self.assertEqual(self.model.stages.get(name='b').status, 'completed')
+
+        self.fail_on, self.calls = None, []
+        self.assertTrue(self.run_pipeline())
+        self.assertNotIn('a', self.calls)
+        self.assertNotIn('b', self.calls)
+        self.assertIn('c', self.calls)
+        self.model.refresh_from_db()
+        self.assertEqual((self.model.status, self.model.progress), ('completed', 100))
+        self.assertEqual(self.model.stages.get(name='c').attempts, 2)
+
+    def test_resume_after_crash_reruns_interrupted_stage(self):
+        self.fail_on = 'c'
+        self.run_pipeline()
+        # c 실행 중 프로세스가 죽은 상태 재현 (running 으로 남고 결과는 일부만 있음)
+        self.model.stages.filter(name='c').update(status='running')
+        Model3D.objects.filter(id=self.model.id).update(status='processing')
+        os.makedirs(os.path.join(self.work_dir, 'c'), exist_ok=True)
+
+        self.fail_on, self.calls = None, []
+        self.assertTrue(self.run_pipeline())
+        self.assertEqual(sorted(self.calls), ['c', 'd'])
+        self.assertEqual(set(self.model.stages.values_list('status', flat=True)), {'completed'})
+
+    def test_resume_with_source_images_skips_completed_stages(self):
+        from django.core.files.base import ContentFile
+        from model3d.feature_cache import source_image_hash
+        from model3d.models import SourceImage
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root):
+            for order in range(2):
+                image = SourceImage(model=self.model, order=order)
+                image.image_url.save(f'{order}.jpg', ContentFile(f'사진 {order}'.encode()), save=True)
+
+            def extract(ctx):
+                # feature_extraction 처럼 중간 단계에서 content_hash 를 채움
+                self.calls.append('b')
+                for image in ctx.model.source_images.all():
+                    source_image_hash(image)
+                open(os.path.join(ctx.output_dir, 'out'), 'w').close()
+
+            stages = [self.stage('a'), Stage('b', extract, deps=['a']), self.stage('c', ['b'])]
+            run = lambda: PipelineRunner(self.model, stages, work_dir=self.work_dir, workers=1).run()
+            self.assertTrue(run())
+            self.assertEqual(self.calls, ['a', 'b', 'c'])
+            self.calls = []
+            self.assertTrue(run())
+            self.assertEqual(self.calls, [])
+
+            # 이미지 내용이 바뀌면 첫 단계부터 다시 실행
+            image = self.model.source_images.get(order=0)
+            image.image_url.save('0.jpg', ContentFile('다른 사진'.encode()), save=False)
+            image.content_hash = ''
+            image.save()
+            self.assertTrue(run())
+            self.assertEqual(self.calls, ['a', 'b', 'c'])
+
+    def test_from_stage_reruns_descendants_only(self):
+        self.assertTrue(self.run_pipeline())
+        self.calls = []
+        self.assertTrue(self.run_pipeline(from_stage='b'))
+        self.assertEqual(sorted(self.calls), ['b', 'c', 'd'])
+
+    def test_missing_checkpoint_output_is_rerun(self):
+        self.assertTrue(self.run_pipeline())
+        shutil.rmtree(os.path.join(self.work_dir, 'c'))
+        self.calls = []
+        self.assertTrue(self.run_pipeline())
+        self.assertEqual(self.calls, ['c'])
+
+
+class FeatureCacheTests(TestCase):
+    def setUp(self):
+        from model3d.feature_cache import FeatureCache
+
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.cache = FeatureCache(self.root, budget_bytes=250)
+
+    def write(self, size):
+        def producer(path):
+            with open(os.path.join(path, 'data'), 'wb') as file:
+                file.write(b'x' * size)
+        return producer
+
+    def test_keys_ignore_pair_order_and_unrelated_settings(self):
+        from model3d.feature_cache import pair_key, settings_hash
+
+        self.assertEqual(pair_key('a', 'b', 's'), pair_key('b', 'a', 's'))
+        base = {'describerPreset': 'normal', 'guidedMatching': False}
+        self.assertEqual(settings_hash('features', base), settings_hash('features', {**base, 'guidedMatching': True}))
+        self.assertEqual(settings_hash('matching', base), settings_hash('matching', {**base, 'texturing': 'high'}))
+        self.assertNotEqual(settings_hash('matching', base), settings_hash('matching', {**base, 'guidedMatching': True}))
+        # 매칭 결과는 특징점 설정에도 의존
+        self.assertNotEqual(settings_hash('matching', base), settings_hash('matching', {**base, 'describerPreset': 'high'}))
+
+    def test_evicts_least_recently_used(self):
+        first = self.cache.put('features', 'aa1', self.write(100))
+        second = self.cache.put('features', 'bb2', self.write(100))
+        self.assertEqual(self.cache.get('features', 'aa1'), first)  # first 를 최근 사용으로
+        self.cache.put('features', 'cc3', self.write(100))
+        self.assertTrue(os.path.isdir(first))
+        self.assertFalse(os.path.isdir(second))
+        self.assertIsNone(self.cache.get('features', 'bb2'))
+        self.assertEqual(self.cache.size(), 200)
+
+    def test_oversized_entry_survives_its_own_put(self):
+        small = self.cache.put('features', 'aa1', self.write(100))
+        large = self.cache.put('features', 'bb2', self.write(400))
+        self.assertTrue(os.path.isfile(os.path.join(large, 'data')))
+        self.assertFalse(os.path.isdir(small))
+        self.assertEqual(self.cache.size(), 400)
+        self.assertEqual(self.cache.get('features', 'bb2'), large)
+
+    def test_index_loaded_from_existing_entries(self):
+        from model3d.feature_cache import FeatureCache
+
+        self.cache.put('features', 'aa1', self.write(100))
+        self.cache.put('matching', 'bb2', self.write(100))
+        reopened = FeatureCache(self.root, budget_bytes=150)
+        self.assertEqual(reopened.size(), 200)
+        self.assertEqual(reopened.evict(), (1, 100))
+        self.assertEqual(len(reopened.entries()), 1)
+
+    def test_plan_counts_only_uncached_images_and_pairs(self):
+        from model3d.feature_cache import IncrementalPlan
+        from model3d.models import SourceImage
+
+        model = Model3D.objects.create(artifact=Artifact.objects.create(name='청동거울'))
+        images = [
+            SourceImage.objects.create(model=model, image_url=f'sources/{index}.jpg', order=index, content_hash=f'hash{index}')
+            for index in range(3)
+        ]
+        plan = IncrementalPlan(model, self.cache)
+        self.cache.put('features', plan.image_key('features', images[0]), self.write(1))
+        self.cache.put('matching', plan.pair_key('matching', images[1], images[0]), self.write(1))
+        self.assertEqual(plan.pending_images(), images[1:])
+        self.assertEqual(plan.pending_pairs(), [(images[0], images[2]), (images[1], images[2])])
+        self.assertEqual(plan.summary(), {
+            'images': 3, 'pending_images': {'features': 2}, 'pairs': 3, 'pending_pairs': {'matching': 2},
+        })
+
+
+class ModelCompressionTests(TestCase):
+    def setUp(self):
+        from django.core.files.base import ContentFile
+
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.model = Model3D.objects.create(artifact=Artifact.objects.create(name='백자 달항아리'), status='completed')
+        self.model.model_url.save('model.glb', ContentFile(b'g' * 4096), save=True)
+
+    def compress(self, output_size, encoding='meshopt'):
+        from unittest import mock
+        from model3d.compression import compress_model
+
+        def encode(encoding, src, dst, timeout):
+            with open(dst, 'wb') as file:
+                file.write(b'c' * output_size)
+
+        with mock.patch('model3d.compression._encode', encode):
+            return compress_model(Model3D.objects.get(id=self.model.id), encoding)
+
+    def test_variant_saved_next_to_original(self):
+        variant = self.compress(1024)
+        self.assertEqual(os.path.dirname(variant.file.name), os.path.dirname(self.model.model_url.name))
+        self.assertIn('.meshopt', variant.file.name)
+        self.assertEqual((variant.file_size, variant.original_size, variant.compression_ratio), (1, 4, 0.25))
+        self.assertIsNone(self.compress(8192, 'draco'))  # 원본보다 크면 저장하지 않음
+
+    def test_unsupported_encoding_rejected(self):
+        from model3d.compression import CompressionError
+
+        with self.assertRaises(CompressionError):
+            self.compress(1024, 'basis')
+
+    def test_variants_dropped_when_model_file_changes(self):
+        from django.core.files.base import ContentFile
+
+        self.compress(1024)
+        model = Model3D.objects.get(id=self.model.id)
+        model.description = '설명만 수정'
+        model.save()
+        self.assertEqual(model.variants.count(), 1)
 
-# Create your tests here.
+        model.model_url.save('model.glb', ContentFile(b'h' * 4096), save=False)
+        model.save(update_fields=['model_url'])
+        self.assertFalse(model.variants.exists())
+        self.assertEqual(self.compress(2048).compression_ratio, 0.5)
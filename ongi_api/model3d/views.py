@@ -11,6 +11,8 @@ from .serializers import (
     ModelStatusUpdateSerializer
 )
 from artifacts.models import Artifact
+from core.batch import TooManyIds, batch_payload, parse_ids
+from core.serializers import eager_load, shaped
 
 @api_view(['GET'])
 def model3d_list_view(request):
@@ -28,19 +30,34 @@ def model3d_list_view(request):
         # 특정 상태의 모델만 조회
         models = Model3D.objects.filter(status=status_filter).order_by('-created_at')
     
-    serializer = Model3DSerializer(models, many=True)
+    serializer = shaped(Model3DSerializer, request, models, many=True)
     return Response(serializer.data)
 
+@api_view(['GET'])
+def model3d_batch_view(request):
+    """여러 3D 모델을 한 번에 조회 (?ids=<id>,<id>,...)"""
+    try:
+        ids, invalid = parse_ids(request.query_params.get('ids'))
+    except TooManyIds as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = shaped(Model3DSerializer, request, many=True)
+    models = eager_load(serializer, Model3D.objects.all()).in_bulk(ids)
+    # 완료되지 않은 모델은 관리자만 조회 가능
+    is_visible = None if request.user.is_staff else (lambda model: model.status == 'completed')
+    return Response(batch_payload(ids, invalid, models, serializer, is_visible))
+
 @api_view(['GET'])
 def model3d_detail_view(request, model_id):
     """3D 모델 상세 정보 조회"""
-    model = get_object_or_404(Model3D, id=model_id)
+    serializer = shaped(Model3DDetailSerializer, request)
+    model = get_object_or_404(eager_load(serializer, Model3D.objects.all()), id=model_id)
     
     # 완료되지 않은 모델은 관리자만 조회 가능
     if model.status != 'completed' and not request.user.is_staff:
         return Response({"detail": "접근 권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
     
-    serializer = Model3DDetailSerializer(model)
+    serializer.instance = model
     return Response(serializer.data)
 
 @api_view(['GET'])
@@ -58,7 +75,7 @@ def artifact_models_view(request, artifact_id):
     else:
         models = artifact.models.filter(status='completed').order_by('-created_at')
     
-    serializer = Model3DSerializer(models, many=True)
+    serializer = shaped(Model3DSerializer, request, models, many=True)
     return Response(serializer.data)
 
 @api_view(['POST'])
@@ -109,6 +126,11 @@ def update_model_status_view(request, model_id):
         model.status = serializer.validated_data['status']
         
         # 추가 필드 업데이트 (제공된 경우)
+        if 'progress' in serializer.validated_data:
+            model.progress = serializer.validated_data['progress']
+        elif model.status == 'completed':
+            model.progress = 100
+        
         if 'processing_time' in serializer.validated_data:
             model.processing_time = serializer.validated_data['processing_time']
         
@@ -117,6 +139,9 @@ def update_model_status_view(request, model_id):
             
         if 'file_size' in serializer.validated_data:
             model.file_size = serializer.validated_data['file_size']
+
+        if 'error_message' in serializer.validated_data:
+            model.error_message = serializer.validated_data['error_message']
         
         model.save()
         
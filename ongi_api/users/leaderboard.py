@@ -0,0 +1,295 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+
+
+class IndexableSkipList:
+    """
+    순위 조회가 가능한 스킵 리스트 (각 링크에 건너뛰는 원소 수를 저장)
+    삽입/삭제/순위/위치 조회 모두 기대 O(log n)
+    """
+    MAX_LEVEL = 32
+
+    class Node:
+        __slots__ = ('key', 'next', 'width')
+
+        def __init__(self, key, level):
+            self.key = key
+            self.next = [None] * level
+            self.width = [1] * level
+
+    def __init__(self):
+        self.head = self.Node(None, self.MAX_LEVEL)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key):
+        chain = [None] * self.MAX_LEVEL
+        steps = [0] * self.MAX_LEVEL  # 각 레벨에서 head 부터 chain[level] 까지의 위치
+        node, position = self.head, 0
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            steps[level] = position
+
+        new_level = self._random_level()
+        new_node = self.Node(key, new_level)
+        for level in range(self.MAX_LEVEL):
+            prev = chain[level]
+            if level < new_level:
+                skipped = position - steps[level]
+                new_node.next[level] = prev.next[level]
+                new_node.width[level] = prev.width[level] - skipped
+                prev.next[level] = new_node
+                prev.width[level] = skipped + 1
+            else:
+                prev.width[level] += 1
+        self.size += 1
+
+    def remove(self, key):
+        chain = [None] * self.MAX_LEVEL
+        node = self.head
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(self.MAX_LEVEL):
+            prev = chain[level]
+            if prev.next[level] is target:
+                prev.width[level] += target.width[level] - 1
+                prev.next[level] = target.next[level]
+            else:
+                prev.width[level] -= 1
+        self.size -= 1
+
+    def index(self, key):
+        """key 의 0 기반 위치"""
+        node, position = self.head, 0
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key <= key:
+                position += node.width[level]
+                node = node.next[level]
+        if node is self.head or node.key != key:
+            raise KeyError(key)
+        return position - 1
+
+    def slice(self, start, stop):
+        """start 위치부터 stop 직전까지의 key 목록"""
+        start = max(start, 0)
+        stop = min(stop, self.size)
+        if start >= stop:
+            return []
+        node, position = self.head, -1
+        for level in reversed(range(self.MAX_LEVEL)):
+            while node.next[level] is not None and position + node.width[level] < start:
+                position += node.width[level]
+                node = node.next[level]
+        keys = []
+        while node is not None and len(keys) < stop - start:
+            node = node.next[0]
+            keys.append(node.key)
+        return keys
+
+
+def leaderboard_key(user_id, feed_count):
+    """정렬 키: 피드 수 내림차순, 같으면 user_id 오름차순 (Redis 리더보드와 같은 규칙)"""
+    return (-feed_count, str(user_id))
+
+
+class InProcessLeaderboard:
+    """
+    워커 프로세스 내 스킵 리스트 리더보드 (정렬 키는 leaderboard_key)
+    다른 워커의 변경을 반영하도록 LEADERBOARD_REBUILD_SECONDS 마다 백그라운드 스레드에서 DB 로 다시 적재한다
+    (요청/시그널 경로는 재적재를 기다리지 않음, 처음 한 번만 바로 적재)
+    """
+
+    def __init__(self, rebuild_seconds=None):
+        self._lock = threading.RLock()
+        self._rebuild_seconds = rebuild_seconds
+        self._built_at = None
+        self._list = IndexableSkipList()
+        self._keys = {}
+        self._pending = None  # 재적재 중 들어온 변경 [(user_id, feed_count 또는 삭제 시 None)]
+
+    def _ensure_loaded(self):
+        if self._built_at is None:
+            self.rebuild()
+        elif (
+            self._rebuild_seconds and self._pending is None
+            and time.monotonic() - self._built_at >= self._rebuild_seconds
+        ):
+            self._pending = []
+            threading.Thread(target=self._rebuild_in_background, name='leaderboard-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        from django.db import connection
+
+        try:
+            self.rebuild()
+        finally:
+            connection.close()  # 작업 스레드의 DB 연결 정리
+
+    def rebuild(self):
+        """DB 의 피드 수로 스킵 리스트를 새로 만든 뒤 교체 (DB 조회와 삽입은 잠금 밖에서)"""
+        from .models import User
+
+        with self._lock:
+            if self._pending is None:
+                self._pending = []
+        try:
+            skip_list, keys = IndexableSkipList(), {}
+            rows = User.objects.filter(is_active=True).values_list('id', 'feed_count').iterator(chunk_size=5000)
+            for user_id, feed_count in rows:
+                key = leaderboard_key(user_id, feed_count)
+                keys[key[1]] = key
+                skip_list.insert(key)
+        except Exception:
+            with self._lock:
+                self._pending = None
+                self._built_at = time.monotonic()  # 다음 주기에 다시 시도
+            raise
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._list, self._keys = skip_list, keys
+            self._built_at = time.monotonic()
+            # 재적재 중 들어온 변경 반영 (DB 조회에 이미 포함된 값이면 그대로)
+            for user_id, feed_count in pending:
+                self._apply(user_id, feed_count)
+
+    def _apply(self, user_id, feed_count):
+        old_key = self._keys.pop(user_id, None)
+        new_key = leaderboard_key(user_id, feed_count) if feed_count is not None else None
+        if old_key == new_key:
+            self._keys[user_id] = old_key
+            return
+        if old_key is not None:
+            self._list.remove(old_key)
+        if new_key is not None:
+            self._list.insert(new_key)
+            self._keys[user_id] = new_key
+
+    def update(self, user_id, feed_count):
+        user_id = str(user_id)
+        with self._lock:
+            self._ensure_loaded()
+            if self._pending is not None:
+                self._pending.append((user_id, feed_count))
+            self._apply(user_id, feed_count)
+
+    def remove(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._ensure_loaded()
+            if self._pending is not None:
+                self._pending.append((user_id, None))
+            self._apply(user_id, None)
+
+    def top(self, limit, offset=0):
+        """[(user_id, feed_count), ...] 상위부터"""
+        with self._lock:
+            self._ensure_loaded()
+            return [(user_id, -neg) for neg, user_id in self._list.slice(offset, offset + limit)]
+
+    def position(self, user_id):
+        """0 기반 순위 (없으면 None)"""
+        with self._lock:
+            self._ensure_loaded()
+            key = self._keys.get(str(user_id))
+            return self._list.index(key) if key is not None else None
+
+    def size(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._list)
+
+    def reset(self):
+        with self._lock:
+            self._built_at = None
+
+
+class RedisLeaderboard:
+    """
+    Redis sorted set 리더보드 (워커 간 공유)
+    LEADERBOARD_REDIS_URL 설정 시 사용하며 redis 패키지가 필요하다
+    점수를 -feed_count 로 저장하고 오름차순으로 읽어, 같은 점수는 user_id 오름차순 (leaderboard_key 와 같은 순서)
+    """
+    KEY = 'ongi:leaderboard:neg_feed_count'
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded or self._redis.exists(self.KEY):
+            self._loaded = True
+            return
+        from .models import User
+
+        pipe = self._redis.pipeline(transaction=False)
+        rows = User.objects.filter(is_active=True).values_list('id', 'feed_count').iterator(chunk_size=5000)
+        for index, (user_id, feed_count) in enumerate(rows, 1):
+            pipe.zadd(self.KEY, {str(user_id): -feed_count})
+            if index % 5000 == 0:
+                pipe.execute()
+        pipe.execute()
+        self._loaded = True
+
+    def update(self, user_id, feed_count):
+        self._ensure_loaded()
+        self._redis.zadd(self.KEY, {str(user_id): -feed_count})
+
+    def remove(self, user_id):
+        self._redis.zrem(self.KEY, str(user_id))
+
+    def top(self, limit, offset=0):
+        self._ensure_loaded()
+        rows = self._redis.zrange(self.KEY, offset, offset + limit - 1, withscores=True)
+        return [(member.decode(), -int(score)) for member, score in rows]
+
+    def position(self, user_id):
+        self._ensure_loaded()
+        return self._redis.zrank(self.KEY, str(user_id))
+
+    def size(self):
+        self._ensure_loaded()
+        return self._redis.zcard(self.KEY)
+
+    def reset(self):
+        self._redis.delete(self.KEY)
+        self._loaded = False
+
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+
+def get_leaderboard():
+    """설정에 맞는 리더보드 인스턴스 (프로세스당 하나)"""
+    global _leaderboard
+    if _leaderboard is None:
+        with _leaderboard_lock:
+            if _leaderboard is None:
+                redis_url = getattr(settings, 'LEADERBOARD_REDIS_URL', None)
+                if redis_url:
+                    _leaderboard = RedisLeaderboard(redis_url)
+                else:
+                    _leaderboard = InProcessLeaderboard(getattr(settings, 'LEADERBOARD_REBUILD_SECONDS', 300))
+    return _leaderboard
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from users.models import User, rank_for_feed_count
+from users.leaderboard import get_leaderboard
+
+
+class Command(BaseCommand):
+    help = '게시된 피드 수로 전체 사용자의 feed_count/rank 를 다시 계산하고 리더보드를 재적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        users = (
+            User.objects
+            .annotate(published=Count('feeds', filter=Q(feeds__status='published')))
+            .only('id', 'feed_count', 'rank')
+            .iterator(chunk_size=batch_size)
+        )
+
+        changed, batch = 0, []
+        for user in users:
+            rank = rank_for_feed_count(user.published)
+            if user.feed_count != user.published or user.rank != rank:
+                user.feed_count, user.rank = user.published, rank
+                batch.append(user)
+            if len(batch) >= batch_size:
+                User.objects.bulk_update(batch, ['feed_count', 'rank'])
+                changed += len(batch)
+                batch = []
+        if batch:
+            User.objects.bulk_update(batch, ['feed_count', 'rank'])
+            changed += len(batch)
+
+        leaderboard = get_leaderboard()
+        leaderboard.reset()
+        self.stdout.write(self.style.SUCCESS(f'{changed}명 갱신, 리더보드 {leaderboard.size()}명 적재'))
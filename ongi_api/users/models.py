@@ -3,6 +3,25 @@ from django.contrib.auth.models import AbstractUser
 import uuid
 
 
+# (피드 수 상한, 랭크) - 상한 미만이면 해당 랭크
+RANK_THRESHOLDS = [
+    (10, 1),
+    (50, 2),
+    (100, 3),
+    (200, 4),
+    (500, 5),
+]
+MAX_RANK = 6
+
+
+def rank_for_feed_count(feed_count):
+    """피드 수에 해당하는 랭크 반환"""
+    for upper, rank in RANK_THRESHOLDS:
+        if feed_count < upper:
+            return rank
+    return MAX_RANK
+
+
 class User(AbstractUser):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(unique=True)  # 이메일
@@ -30,18 +49,7 @@ class User(AbstractUser):
 
     def update_rank(self):
         """피드 수에 따른 랭크 업데이트"""
-        if self.feed_count < 10:
-            self.rank = 1
-        elif self.feed_count < 50:
-            self.rank = 2
-        elif self.feed_count < 100:
-            self.rank = 3
-        elif self.feed_count < 200:
-            self.rank = 4
-        elif self.feed_count < 500:
-            self.rank = 5
-        else:
-            self.rank = 6
+        self.rank = rank_for_feed_count(self.feed_count)
         
         self.save()
 
@@ -1,3 +1,163 @@
+import os
+import shutil
+import tempfile
+
 from django.test import TestCase
+from django.test.utils import override_settings
+
+from users.models import User
+
+
+class ProfileImageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.user = User.objects.create_user(username='avatar', email='avatar@example.com', password='pw')
+
+    def upload_profile(self, data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/users/{self.user.id}/update-profile-image/',
+                encode_multipart(BOUNDARY, {'file': SimpleUploadedFile('me.jpg', data)}), content_type=MULTIPART_CONTENT,
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['profile_image']
+
+    def test_failed_save_keeps_previous_image(self):
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            first = self.upload_profile(b'first')
+            with mock.patch.object(User, 'save', side_effect=RuntimeError('db down')), \
+                    self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f'/api/users/{self.user.id}/update/',
+                    encode_multipart(BOUNDARY, {'file': SimpleUploadedFile('me.jpg', b'second')}),
+                    content_type=MULTIPART_CONTENT,
+                )
+        self.assertEqual(response.status_code, 500)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image, first)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, first[len('/media/'):])))
+
+    def test_profile_url_changes_with_content(self):
+        from core.media_layout import is_versioned
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            first = self.upload_profile(b'first')
+            second = self.upload_profile(b'second')
+            self.assertNotEqual(first, second)
+            self.assertTrue(is_versioned(second))
+            folder = os.path.dirname(os.path.join(self.media_root, second[len('/media/'):]))
+            self.assertEqual(os.listdir(folder), [os.path.basename(second)])  # 이전 이미지 삭제
+            self.assertEqual(self.upload_profile(b'second'), second)
+
+    def test_only_previous_image_is_deleted(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            first = self.upload_profile(b'first')
+            folder = os.path.dirname(os.path.join(self.media_root, first[len('/media/'):]))
+            other = os.path.join(folder, 'upload.tmp')  # 같은 폴더의 다른 파일 (동시 업로드 등)
+            with open(other, 'wb') as file:
+                file.write(b'other')
+            second = self.upload_profile(b'second')
+            self.assertEqual(sorted(os.listdir(folder)), sorted([os.path.basename(second), 'upload.tmp']))
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        from users import leaderboard
+
+        self.leaderboard = leaderboard.InProcessLeaderboard()
+        self.addCleanup(setattr, leaderboard, '_leaderboard', leaderboard._leaderboard)
+        leaderboard._leaderboard = self.leaderboard
+        self.users = [
+            User.objects.create_user(username=f'rank{index}', email=f'rank{index}@example.com', password='pw')
+            for index in range(5)
+        ]
+        for user, feed_count in zip(self.users, (3, 7, 3, 0, 5)):
+            User.objects.filter(id=user.id).update(feed_count=feed_count)
+
+    def expected_order(self):
+        return [str(user_id) for user_id, _ in sorted(
+            User.objects.values_list('id', 'feed_count'), key=lambda row: (-row[1], str(row[0])),
+        )]
+
+    def test_skip_list_rank_and_range(self):
+        import random
+
+        from users.leaderboard import IndexableSkipList
+
+        rng = random.Random(31)
+        skip_list, reference = IndexableSkipList(), []
+        for _ in range(600):
+            if reference and rng.random() < 0.3:
+                key = reference.pop(rng.randrange(len(reference)))
+                skip_list.remove(key)
+            else:
+                key = (rng.randrange(50), rng.random())
+                reference.append(key)
+                skip_list.insert(key)
+        reference.sort()
+        self.assertEqual(len(skip_list), len(reference))
+        self.assertEqual(skip_list.slice(0, len(reference)), reference)
+        self.assertEqual(skip_list.slice(10, 25), reference[10:25])
+        for position in rng.sample(range(len(reference)), 20):
+            self.assertEqual(skip_list.index(reference[position]), position)
+
+    def test_ties_follow_user_id(self):
+        order = self.expected_order()
+        self.assertEqual([user_id for user_id, _ in self.leaderboard.top(10)], order)
+        self.assertEqual(self.leaderboard.position(order[2]), 2)
+
+    def test_updates_during_rebuild_are_kept(self):
+        self.leaderboard.size()
+        self.leaderboard._pending = []  # 백그라운드 재적재가 DB 를 읽는 중인 상태
+        self.leaderboard.update(self.users[3].id, 100)  # DB 에는 아직 0
+        self.leaderboard.rebuild()
+        self.assertEqual(self.leaderboard.top(1), [(str(self.users[3].id), 100)])
+
+    def test_feed_changes_reach_leaderboard_only_after_commit(self):
+        from django.db import transaction
+
+        from feeds.models import Feed
+
+        self.leaderboard.size()
+        try:
+            with transaction.atomic():
+                for _ in range(8):
+                    Feed.objects.create(user=self.users[3], artifact_name='취소', status='published')
+                raise RuntimeError('rollback')
+        except RuntimeError:
+            pass
+        self.assertEqual(self.leaderboard.position(self.users[3].id), 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(8):
+                Feed.objects.create(user=self.users[3], artifact_name='게시', status='published')
+        self.assertEqual(self.leaderboard.top(1), [(str(self.users[3].id), 8)])
+
+    def test_leaderboard_endpoint(self):
+        order = self.expected_order()
+        data = self.client.get('/api/users/leaderboard/?limit=2&offset=1').json()
+        self.assertEqual(data['total'], 5)
+        self.assertEqual([entry['id'] for entry in data['results']], order[1:3])
+        self.assertEqual([entry['position'] for entry in data['results']], [2, 3])
+        self.assertEqual(data['results'][0]['feed_count'], 5)
+        self.assertEqual(self.client.get('/api/users/leaderboard/?limit=x').status_code, 400)
+
+    def test_user_position_and_neighbors(self):
+        order = self.expected_order()
+        data = self.client.get(f'/api/users/{order[0]}/leaderboard/?neighbors=1').json()
+        self.assertEqual(data['position'], 1)
+        self.assertEqual([entry['id'] for entry in data['neighbors']], order[:2])
+
+        data = self.client.get(f'/api/users/{order[2]}/leaderboard/?neighbors=1').json()
+        self.assertEqual(data['position'], 3)
+        self.assertEqual([entry['id'] for entry in data['neighbors']], order[1:4])
 
-# Create your tests here.
+        missing = '00000000-0000-0000-0000-000000000000'
+        self.assertEqual(self.client.get(f'/api/users/{missing}/leaderboard/').status_code, 404)
@@ -4,12 +4,18 @@ from .views import (
     user_login_view,
     get_user_info,
     update_user_info,
-    update_profile_image
+    update_profile_image,
+    leaderboard_view,
+    user_leaderboard_view,
+    user_batch_view,
 )
 
 urlpatterns = [
     path('create/', user_create_view, name='user-create'),  # 회원가입 API
     path('login/', user_login_view, name='user-login'),  # 로그인 API
+    path('batch/', user_batch_view, name='user-batch'),  # 여러 사용자 공개 프로필 일괄 조회
+    path('leaderboard/', leaderboard_view, name='leaderboard'),  # 피드 수 기준 상위 사용자
+    path('<uuid:user_id>/leaderboard/', user_leaderboard_view, name='user-leaderboard'),  # 사용자 순위 및 이웃
     path('<uuid:user_id>/', get_user_info, name='get_user_info'),  # 유저 정보 조회 (GET)
     path('<uuid:user_id>/update/', update_user_info, name='update_user_info'),  # 유저 정보 업데이트 (PATCH)
     path('<str:user_id>/update-profile-image/', update_profile_image, name='update_profile_image'),
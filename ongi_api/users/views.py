@@ -1,5 +1,4 @@
-import os
-import posixpath
+import uuid
 from django.contrib.auth import get_user_model
 from rest_framework.decorators import api_view, parser_classes
 from rest_framework.parsers import MultiPartParser
@@ -9,8 +8,12 @@ from .serializers import UserSerializer
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.conf import settings
+from django.db import transaction
 from .models import CustomToken
-from feeds.models import Feed
+from .leaderboard import get_leaderboard
+from feeds.serializers import UserMinimalSerializer
+from core.batch import TooManyIds, batch_payload, parse_ids
+from core.media_layout import profile_image_path
 
 User = get_user_model()
 
@@ -55,13 +58,9 @@ def user_login_view(request):
 def get_user_info(request, user_id):
     """사용자 정보 조회 API"""
     try:
+        # feed_count/rank 는 피드 게시/숨김/삭제 시 feeds.signals 에서 갱신됨
         user = User.objects.get(id=user_id)
-        
-        # 피드 수 실시간 계산 및 랭크 업데이트
-        feed_count = Feed.objects.filter(user=user, status='published').count()
-        user.feed_count = feed_count
-        user.update_rank()
-        user.save()
+        feed_count = user.feed_count
         
         response_data = {
             'username': str(user.username) if hasattr(user, 'username') else '',
@@ -95,6 +94,43 @@ def get_user_info(request, user_id):
         return Response({'error': f'Server Error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class UserBatchSerializer(UserMinimalSerializer):
+    """일괄 조회용 공개 프로필 (피드 작성자 표시용)"""
+    class Meta(UserMinimalSerializer.Meta):
+        fields = UserMinimalSerializer.Meta.fields + ['feed_count']
+
+
+@api_view(['GET'])
+def user_batch_view(request):
+    """여러 사용자의 공개 프로필을 한 번에 조회 (?ids=<id>,<id>,...)"""
+    try:
+        ids, invalid = parse_ids(request.query_params.get('ids'))
+    except TooManyIds as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    users = User.objects.filter(is_active=True).only(*UserBatchSerializer.Meta.fields).in_bulk(ids)
+    return Response(batch_payload(ids, invalid, users, UserBatchSerializer))
+
+
+def _replace_profile_image(user, image_file):
+    """
+    새 프로필 이미지를 저장해 user.profile_image 에 설정 (저장은 호출자가 트랜잭션 안에서 수행)
+    이전 이미지는 user 저장이 커밋된 뒤에 삭제하므로, 저장이 실패해도 DB 가 가리키는 파일은 남는다
+    """
+    previous = user.profile_image or ''
+    # 내용 해시가 붙은 이름으로 저장 (profile.<해시>.jpg)
+    relative_path = default_storage.save(profile_image_path(user.id), ContentFile(image_file.read()))
+
+    def delete_previous():
+        # 이 사용자가 가리키던 이전 파일만 삭제 (같은 내용이면 같은 이름이므로 유지)
+        previous_path = previous[len(settings.MEDIA_URL):] if previous.startswith(settings.MEDIA_URL) else ''
+        if previous_path and previous_path != relative_path:
+            default_storage.delete(previous_path)
+
+    transaction.on_commit(delete_previous)
+    user.profile_image = f"{settings.MEDIA_URL}{relative_path}"
+
+
 @api_view(['PATCH'])
 @parser_classes([MultiPartParser])
 def update_user_info(request, user_id):
@@ -109,25 +145,13 @@ def update_user_info(request, user_id):
             if value is not None:
                 setattr(user, field, value)
 
-        # 프로필 이미지 처리
-        if "file" in request.FILES:
-            image_file = request.FILES["file"]
-            user_folder = os.path.join(settings.MEDIA_ROOT, str(user.id), "profile")
-            file_path = os.path.join(user_folder, "profile.jpg")
-
-            # 기존 프로필 이미지 삭제
-            if os.path.exists(user_folder):
-                for file_name in os.listdir(user_folder):
-                    file_path_to_delete = os.path.join(user_folder, file_name)
-                    os.remove(file_path_to_delete)
-
-            os.makedirs(user_folder, exist_ok=True)
-            default_storage.save(file_path, ContentFile(image_file.read()))
-
-            image_url = posixpath.join(settings.MEDIA_URL, str(user.id), "profile", "profile.jpg").replace("\\", "/")
-            user.profile_image = image_url
-
-        user.save()
+        with transaction.atomic():
+            # 프로필 이미지 처리 (기존 이미지는 저장이 커밋된 뒤 삭제)
+            if "file" in request.FILES:
+                _replace_profile_image(user, request.FILES["file"])
+            user.save()
+        if request.data.get('feed_count') is not None:
+            get_leaderboard().update(user.id, int(user.feed_count))
 
         return Response({
             "message": "User info updated successfully",
@@ -155,22 +179,10 @@ def update_profile_image(request, user_id):
         user = User.objects.get(id=user_id)
         
         if "file" in request.FILES:
-            image_file = request.FILES["file"]
-            user_folder = os.path.join(settings.MEDIA_ROOT, str(user.id), "profile")
-            file_path = os.path.join(user_folder, "profile.jpg")
-            
-            # 기존 프로필 이미지 삭제
-            if os.path.exists(user_folder):
-                for file_name in os.listdir(user_folder):
-                    file_path_to_delete = os.path.join(user_folder, file_name)
-                    os.remove(file_path_to_delete)
-            
-            os.makedirs(user_folder, exist_ok=True)
-            default_storage.save(file_path, ContentFile(image_file.read()))
-            
-            image_url = posixpath.join(settings.MEDIA_URL, str(user.id), "profile", "profile.jpg").replace("\\", "/")
-            user.profile_image = image_url
-            user.save(update_fields=['profile_image'])
+            # 기존 이미지는 저장이 커밋된 뒤 삭제
+            with transaction.atomic():
+                _replace_profile_image(user, request.FILES["file"])
+                user.save(update_fields=['profile_image'])
             
             return Response({
                 "message": "Profile image updated successfully",
@@ -183,4 +195,59 @@ def update_profile_image(request, user_id):
     except User.DoesNotExist:
         return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        return Response({"error": "Server Error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({"error": "Server Error"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _leaderboard_entries(rows, start_position):
+    """리더보드 (user_id, feed_count) 목록에 사용자 정보를 붙여 반환"""
+    users = User.objects.only('id', 'username', 'profile_image', 'rank').in_bulk([user_id for user_id, _ in rows])
+    entries = []
+    for offset, (user_id, feed_count) in enumerate(rows):
+        user = users.get(uuid.UUID(str(user_id)))
+        entries.append({
+            'position': start_position + offset + 1,
+            'id': str(user_id),
+            'username': user.username if user else None,
+            'profile_image': user.profile_image if user else None,
+            'rank': user.rank if user else None,
+            'feed_count': feed_count,
+        })
+    return entries
+
+
+@api_view(['GET'])
+def leaderboard_view(request):
+    """피드 수 기준 상위 사용자 조회"""
+    try:
+        limit = min(max(int(request.query_params.get('limit', 100)), 1), 1000)
+        offset = max(int(request.query_params.get('offset', 0)), 0)
+    except ValueError:
+        return Response({"error": "limit/offset 은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    leaderboard = get_leaderboard()
+    return Response({
+        'total': leaderboard.size(),
+        'results': _leaderboard_entries(leaderboard.top(limit, offset), offset),
+    })
+
+
+@api_view(['GET'])
+def user_leaderboard_view(request, user_id):
+    """사용자의 리더보드 순위와 앞뒤 이웃 조회"""
+    try:
+        neighbors = min(max(int(request.query_params.get('neighbors', 5)), 0), 50)
+    except ValueError:
+        return Response({"error": "neighbors 는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    leaderboard = get_leaderboard()
+    position = leaderboard.position(user_id)
+    if position is None:
+        return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    start = max(position - neighbors, 0)
+    rows = leaderboard.top(position - start + neighbors + 1, start)
+    return Response({
+        'position': position + 1,
+        'total': leaderboard.size(),
+        'neighbors': _leaderboard_entries(rows, start),
+    })